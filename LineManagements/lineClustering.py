@@ -0,0 +1,330 @@
+import glob
+import json
+import random
+import time
+from typing import List
+
+import numpy as np
+
+SAMPLE_JSON_GLOB = "LineManagements/Data/*.json"
+
+
+def page_word_boxes(page) -> List[dict]:
+    """แปลง words ของ page (Azure analyzeResult) เป็น word box ที่ normalize ด้วยขนาดหน้า"""
+    page_width = page["width"]
+    page_height = page["height"]
+
+    word_boxes = []
+    for word in page["words"]:
+        # ถ้า content มี \n ให้แตกเป็นคำย่อย
+        if "\n" in word["content"]:
+            parts = [p.strip() for p in word["content"].split("\n") if p.strip()]
+        else:
+            parts = [word["content"]]
+
+        polygon = word["polygon"]
+        x_coords = polygon[::2]
+        y_coords = polygon[1::2]
+
+        # คำนวณตำแหน่ง bounding box
+        min_x = min(x_coords) / page_width
+        max_x = max(x_coords) / page_width
+        min_y = min(y_coords) / page_height
+        max_y = max(y_coords) / page_height
+
+        center_x = (min_x + max_x) / 2
+        center_y = (min_y + max_y) / 2
+        height = max_y - min_y
+
+        # เก็บคำ (หรือบรรทัดย่อยจาก \n)
+        for part in parts:
+            word_boxes.append({
+                "content": part,
+                "center_x": center_x,
+                "center_y": center_y,
+                "min_x": min_x,
+                "max_x": max_x,
+                "min_y": min_y,
+                "max_y": max_y,
+                "height": height
+            })
+    return word_boxes
+
+
+# -------------------------------
+#  วิธีเดิม: เลือกคำบนสุดเป็น seed แล้วไล่เทียบกับทุกคำที่เหลือ (O(n²) ต่อหน้า)
+# -------------------------------
+def cluster_lines_improved(word_boxes):
+    """การจัดกลุ่มบรรทัดแบบปรับปรุง"""
+    if not word_boxes:
+        return []
+
+    lines = []
+    remaining_words = word_boxes.copy()
+
+    while remaining_words:
+        # เริ่มต้นด้วยคำที่มี Y ต่ำสุด (บนสุด)
+        remaining_words.sort(key=lambda w: w["center_y"])
+        seed_word = remaining_words.pop(0)
+        current_line = [seed_word]
+
+        # หาคำที่อยู่บรรทัดเดียวกัน
+        words_to_remove = []
+        for i, word in enumerate(remaining_words):
+            if is_same_line(seed_word, word, current_line):
+                current_line.append(word)
+                words_to_remove.append(i)
+
+        # ลบคำที่ใช้แล้วออกจาก remaining_words
+        for i in sorted(words_to_remove, reverse=True):
+            remaining_words.pop(i)
+
+        # เรียงคำในบรรทัดตามแกน X
+        current_line.sort(key=lambda w: w["center_x"])
+        lines.append(current_line)
+
+    return lines
+
+
+def is_same_line(reference_word, test_word, current_line):
+    """ตรวจสอบว่าคำสองคำอยู่บรรทัดเดียวกันหรือไม่"""
+    # คำนวณค่าเฉลี่ยของบรรทัดปัจจุบัน
+    avg_y = sum(w["center_y"] for w in current_line) / len(current_line)
+    avg_height = sum(w["height"] for w in current_line) / len(current_line)
+    return _same_line(reference_word, test_word, avg_y, avg_height)
+
+
+def _same_line(reference_word, test_word, avg_y, avg_height):
+    # เช็ค vertical overlap
+    overlap_top = max(reference_word["min_y"], test_word["min_y"])
+    overlap_bottom = min(reference_word["max_y"], test_word["max_y"])
+    overlap_height = max(0, overlap_bottom - overlap_top)
+
+    min_height = min(reference_word["height"], test_word["height"])
+    overlap_ratio = overlap_height / min_height if min_height > 0 else 0
+
+    # เงื่อนไข 1: มี overlap ratio เพียงพอ
+    # เงื่อนไข 2: ระยะห่าง Y ไม่เกิน 0.4 เท่าของความสูงเฉลี่ย
+    y_distance = abs(test_word["center_y"] - avg_y)
+    return overlap_ratio > 0.4 and y_distance < (avg_height * 0.4)
+
+
+# -------------------------------
+#  Sweep line: ได้บรรทัดเดียวกับ cluster_lines_improved ใน O(n log n)
+# -------------------------------
+def cluster_lines_sweep(word_boxes):
+    """
+    จัดกลุ่มบรรทัดให้ผลเหมือน cluster_lines_improved ทุกประการ (ลำดับบรรทัด/ลำดับคำเหมือนกัน)
+      - sort ตาม center_y ครั้งเดียว (stable เหมือนการ sort ซ้ำของเดิม) seed คือคำแรกที่ยังไม่ถูกใช้
+      - คำที่จะผ่านเงื่อนไข overlap ได้ต้องมี min_y < max_y ของ seed เสมอ และคำที่เหลือทั้งหมดอยู่หลัง seed
+        จึงเก็บคำที่เหลือไว้อีกชุดเรียงตาม min_y (linked list ลบได้ O(1)) แล้วดึงเฉพาะช่วงต้นที่ overlap มาเทียบ
+      - ค่าเฉลี่ย y / ความสูงของบรรทัดใช้ผลรวมสะสม ไม่คำนวณใหม่ทุกคำ
+    """
+    cols = [[w[k] for w in word_boxes] for k in ("center_x", "center_y", "min_y", "max_y", "height")]
+    return [[word_boxes[i] for i in line] for line in _sweep_indices(*cols)]
+
+
+def cluster_lines_columnar(words) -> List[np.ndarray]:
+    """cluster_lines_sweep สำหรับ wordBoxes.PageWords คืน index ของคำในแต่ละบรรทัด (เรียงตาม center_x)"""
+    cols = [a.tolist() for a in (words.center_x, words.center_y, words.min_y, words.max_y, words.height)]
+    return [np.array(line, dtype=np.intp) for line in _sweep_indices(*cols)]
+
+
+def _sweep_indices(center_x, center_y, min_y, max_y, height) -> List[List[int]]:
+    n = len(center_y)
+    if not n:
+        return []
+
+    by_y = sorted(range(n), key=center_y.__getitem__)
+    rank = [0] * n  # ลำดับใน by_y ของแต่ละคำ
+    for r, i in enumerate(by_y):
+        rank[i] = r
+
+    # doubly linked list ของคำที่เหลือ เรียงตาม min_y (-1 = ไม่มี)
+    by_top = sorted(range(n), key=min_y.__getitem__)
+    nxt = [-1] * n
+    prv = [-1] * n
+    for a, b in zip(by_top, by_top[1:]):
+        nxt[a] = b
+        prv[b] = a
+    head = by_top[0]
+    used = [False] * n
+
+    lines = []
+    for seed in by_y:
+        if used[seed]:
+            continue
+        seed_top, seed_bottom, seed_h = min_y[seed], max_y[seed], height[seed]
+
+        # คำที่ vertical overlap กับ seed ได้ (min_y < max_y ของ seed) ตามลำดับเดียวกับของเดิม
+        candidates = []
+        i = head
+        while i != -1 and min_y[i] < seed_bottom:
+            if i != seed:
+                candidates.append(i)
+            i = nxt[i]
+        candidates.sort(key=rank.__getitem__)
+
+        # เงื่อนไขเดียวกับ is_same_line (เขียนแบบ inline ให้ค่าทศนิยมออกมาเท่ากันทุก bit)
+        line = [seed]
+        sum_y = center_y[seed]
+        sum_h = seed_h
+        for i in candidates:
+            count = len(line)
+            overlap_height = max(0, min(seed_bottom, max_y[i]) - max(seed_top, min_y[i]))
+            min_height = min(seed_h, height[i])
+            overlap_ratio = overlap_height / min_height if min_height > 0 else 0
+            if overlap_ratio > 0.4 and abs(center_y[i] - sum_y / count) < (sum_h / count * 0.4):
+                line.append(i)
+                sum_y += center_y[i]
+                sum_h += height[i]
+
+        for i in line:
+            used[i] = True
+            p, q = prv[i], nxt[i]
+            if p == -1:
+                head = q
+            else:
+                nxt[p] = q
+            if q != -1:
+                prv[q] = p
+
+        line.sort(key=center_x.__getitem__)
+        lines.append(line)
+
+    return lines
+
+
+def group_lines_by_threshold(words, line_threshold: float = 0.01) -> List[np.ndarray]:
+    """
+    วิธีของ lineManagement: ไล่คำตาม center_y ต่อบรรทัดเดิมถ้าห่างจากค่า y ของบรรทัดไม่เกิน threshold
+    (ค่า y ของบรรทัดเฉลี่ยแบบ (y + y_ใหม่) / 2) ใช้ poly_center ของ PageWords คืน index ต่อบรรทัด
+    """
+    cy = words.poly_center_y
+    cx = words.poly_center_x
+    lines = []
+    current = []
+    current_y = None
+    for i, y in zip(np.argsort(cy, kind="stable").tolist(), np.sort(cy, kind="stable").tolist()):
+        if current_y is None or abs(y - current_y) <= line_threshold:
+            current.append(i)
+            current_y = (current_y + y) / 2 if current_y is not None else y
+        else:
+            lines.append(current)
+            current = [i]
+            current_y = y
+    if current:
+        lines.append(current)
+    return [idx[np.argsort(cx[idx], kind="stable")] for idx in (np.array(l, dtype=np.intp) for l in lines)]
+
+
+def cluster_lines_with_dbscan(words):
+    """ใช้ DBSCAN clustering สำหรับจัดกลุ่มบรรทัด คืน index ของคำในแต่ละบรรทัด"""
+    if not len(words):
+        return []
+    from sklearn.cluster import DBSCAN  # ใช้เฉพาะวิธีนี้ ไม่บังคับให้ทุกคนที่ import โมดูลต้องมี sklearn
+
+    # เตรียมข้อมูลสำหรับ DBSCAN (ใช้ center_y และ height)
+    features = np.column_stack([words.center_y, words.height])
+
+    # ใช้ DBSCAN clustering
+    # eps: ระยะทางสูงสุดระหว่างจุดในกลุ่มเดียวกัน
+    # min_samples: จำนวนจุดขั้นต่ำในกลุ่ม
+    clustering = DBSCAN(eps=0.02, min_samples=1).fit(features)
+
+    # จัดกลุ่มคำตาม cluster labels (ตามลำดับที่เจอ label ครั้งแรก)
+    labels = clustering.labels_
+    _, first = np.unique(labels, return_index=True)
+    lines = []
+    for label in labels[np.sort(first)]:
+        idx = np.flatnonzero(labels == label)
+        # เรียงคำในบรรทัดตามแกน X
+        lines.append(idx[np.argsort(words.center_x[idx], kind="stable")])
+
+    # เรียงบรรทัดตามแกน Y (ใช้ค่าเฉลี่ยของ center_y ในแต่ละบรรทัด)
+    lines.sort(key=lambda idx: words.center_y[idx].mean())
+
+    return lines
+
+
+# -------------------------------
+#  เทียบผลกับวิธีเดิม + benchmark
+# -------------------------------
+def make_synthetic_page(n_words: int, words_per_line: int = 25, seed: int = 0) -> List[dict]:
+    """หน้าสังเคราะห์: บรรทัดเอียง/สั่นเล็กน้อย ความสูงไม่เท่ากัน มีกล่องสูงผิดปกติปนบ้าง ลำดับคำสลับ"""
+    rng = random.Random(seed)
+    n_lines = max(1, n_words // words_per_line)
+    pitch = 0.9 / n_lines
+    boxes = []
+    for k in range(n_words):
+        line = k // words_per_line
+        col = k % words_per_line
+        h = pitch * rng.uniform(0.5, 0.8)
+        if rng.random() < 0.005:
+            h *= rng.uniform(2, 4)  # ตัวอักษรใหญ่/ตราประทับ
+        cy = 0.05 + (line + 0.5) * pitch + rng.gauss(0, pitch * 0.08) + col * pitch * 0.004
+        x0 = 0.05 + col * 0.9 / words_per_line + rng.uniform(0, 0.005)
+        x1 = x0 + 0.9 / words_per_line * rng.uniform(0.5, 0.95)
+        boxes.append({
+            "content": f"w{k}",
+            "center_x": (x0 + x1) / 2,
+            "center_y": cy,
+            "min_x": x0,
+            "max_x": x1,
+            "min_y": cy - h / 2,
+            "max_y": cy + h / 2,
+            "height": h,
+        })
+    rng.shuffle(boxes)
+    return boxes
+
+
+def _same_result(a, b) -> bool:
+    return len(a) == len(b) and all(
+        len(la) == len(lb) and all(x is y for x, y in zip(la, lb)) for la, lb in zip(a, b)
+    )
+
+
+def check_against_legacy(json_glob: str = SAMPLE_JSON_GLOB, n_synthetic: int = 200) -> int:
+    """เทียบกับ cluster_lines_improved บนหน้าจากไฟล์ JSON ตัวอย่าง (ถ้ามี) และหน้าสังเคราะห์"""
+    pages = []
+    for path in sorted(glob.glob(json_glob)):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for page in data.get("analyzeResult", {}).get("pages", []):
+            pages.append((f"{path} หน้า {page.get('pageNumber', '?')}", page_word_boxes(page)))
+    n_sample = len(pages)
+    rng = random.Random(0)
+    for s in range(n_synthetic):
+        n_words = rng.randint(0, 400)
+        pages.append((f"synthetic #{s}", make_synthetic_page(n_words, rng.randint(1, 30), seed=s)))
+
+    mismatches = 0
+    for name, boxes in pages:
+        if not _same_result(cluster_lines_improved(boxes), cluster_lines_sweep(boxes)):
+            mismatches += 1
+            print(f"  ไม่ตรง: {name}")
+    print(f"🔎 เทียบกับ cluster_lines_improved: {n_sample} หน้าตัวอย่าง + {n_synthetic} หน้าสังเคราะห์, ไม่ตรง {mismatches}")
+    return mismatches
+
+
+def benchmark(sizes=(5000, 10000, 20000, 50000), legacy_max_words: int = 10000):
+    print("📊 เวลาจัดกลุ่มบรรทัดต่อหน้า (วินาที)")
+    print(f"  {'คำ':>7} {'improved (เดิม)':>16} {'sweep':>8}")
+    for n_words in sizes:
+        boxes = make_synthetic_page(n_words, seed=n_words)
+        t_old = None
+        if n_words <= legacy_max_words:
+            t0 = time.perf_counter()
+            cluster_lines_improved(boxes)
+            t_old = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        cluster_lines_sweep(boxes)
+        t_new = time.perf_counter() - t0
+        old = f"{t_old:16.3f}" if t_old is not None else f"{'-':>16}"
+        print(f"  {n_words:>7} {old} {t_new:8.3f}")
+
+
+if __name__ == "__main__":
+    check_against_legacy()
+    benchmark()
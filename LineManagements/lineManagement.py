@@ -1,91 +1,52 @@
 import json
-from pythainlp.tag import pos_tag
-from pythainlp.tokenize import word_tokenize
-
-# โหลดไฟล์ JSON
-with open("LineManagements/Data/ReportMeeting_4_58 copy.pdf.json", "r", encoding="utf-8") as f:
-    json_data = json.load(f)
-
-output_lines = []
-total_words = 0
-total_words_filtered = 0 
-style = "words"
-
-for page_idx, page in enumerate(json_data["analyzeResult"]["pages"]):
-    words = page[style]
-    page_width = page["width"]
-    page_height = page["height"]
-
-    word_boxes = []
-    for word in words:
-        polygon = word["polygon"]
-        x_coords = polygon[::2]
-        y_coords = polygon[1::2]
-
-        center_x = (sum(x_coords) / 4) / page_width
-        center_y = (sum(y_coords) / 4) / page_height
-
-        word_boxes.append({
-            "content": word["content"],
-            "center_x": center_x,
-            "center_y": center_y
-        })
-
+from pageParallel import map_pages, threshold_page
+from spatialIndex import DocumentIndex
+from thaiTagger import CACHE_PATH
+from wordBoxes import PageWords
+
+if __name__ == "__main__":
+    # โหลดไฟล์ JSON
+    with open("LineManagements/Data/ReportMeeting_4_58 copy.pdf.json", "r", encoding="utf-8") as f:
+        json_data = json.load(f)
+
+    output_lines = []
+    total_words = 0
+    total_words_filtered = 0
+    style = "words"
     line_threshold = 0.01
-    word_boxes.sort(key=lambda w: w["center_y"])
-
-    lines = []
-    current_line = []
-    current_y = None
-
-    for word in word_boxes:
-        if current_y is None or abs(word["center_y"] - current_y) <= line_threshold:
-            current_line.append(word)
-            current_y = (current_y + word["center_y"]) / 2 if current_y is not None else word["center_y"]
-        else:
-            lines.append(sorted(current_line, key=lambda w: w["center_x"]))
-            current_line = [word]
-            current_y = word["center_y"]
-
-    if current_line:
-        lines.append(sorted(current_line, key=lambda w: w["center_x"]))
-
-    for line in lines:
-        line_text = ""
-        for i, word in enumerate(line):
-            line_text += word["content"]
-            if i < len(line) - 1:
-                next_word = line[i + 1]
-                space = next_word["center_x"] - word["center_x"]
-                if space > 0.06:
-                    line_text += "_"
-
-        tokens = word_tokenize(line_text.replace("_", " "), keep_whitespace=False)
-        tags = pos_tag(tokens, engine="perceptron", corpus="orchid")
-
-        filtered_tokens = [word for word, tag in tags if tag not in ["NPRP", "NTTL"]]
-
-        word_count = len(tokens)
-        word_count_filtered = len(filtered_tokens)
-
-        total_words += word_count
-        total_words_filtered += word_count_filtered
-
-        output_lines.append(
-            f"{line_text}"
-            # f"POS: {tags}\n"
-            # f"หลังคัดกรอง: {filtered_tokens} (คำ: {word_count_filtered})\n"
-        )
-
-        print(f"{line_text} (คำทั้งหมด: {word_count}, หลังคัดกรอง: {word_count_filtered})")
-        print("POS:", tags)
-        print("หลังคัดกรอง:", filtered_tokens)
-
-print(f"\nจำนวนคำทั้งหมดก่อนคัดกรอง: {total_words}")
-print(f"จำนวนคำทั้งหมดหลังคัดกรอง: {total_words_filtered}")
-
-with open("LineManagements/Data/report_Output.txt", "w", encoding="utf-8") as out_file:
-    for line in output_lines:
-        out_file.write(line + "\n")
 
-print("✅ บันทึกไฟล์เรียบร้อย: Data/output_21.txt")
+    # แต่ละหน้าไม่ขึ้นต่อกัน: จัดบรรทัด + ตัดคำ + POS กระจายไปหลาย process ผลกลับมาตามลำดับหน้า
+    # ผลตัดคำ cache ไว้ที่ CACHE_PATH รันซ้ำแล้วบรรทัดที่เคยเจอไม่ต้องตัดคำใหม่
+    # คำในตาราง (tableLineManagement) ไม่นำมาจัดบรรทัด ไม่ให้นับซ้ำ ถ้าต้องการทั้งบรรทัดและตารางในไฟล์เดียวใช้ pageLayout
+    index = DocumentIndex(json_data)
+    tasks = (
+        (page_idx, PageWords.from_page(page, split_newlines=False, style=style), line_threshold,
+         index.regions("tables", page["pageNumber"])[0])
+        for page_idx, page in enumerate(json_data["analyzeResult"]["pages"])
+    )
+    for page_result in map_pages(threshold_page, tasks, cache_path=CACHE_PATH):
+        total_words += page_result.total_words
+        total_words_filtered += page_result.total_words_filtered
+
+        for line in page_result.line_results:
+            word_count = len(line.tags)
+            word_count_filtered = len(line.filtered_tokens)
+
+            output_lines.append(
+                f"{line.text}"
+                # f"POS: {line.tags}\n"
+                # f"หลังคัดกรอง: {line.filtered_tokens} (คำ: {word_count_filtered})\n"
+            )
+
+            print(f"{line.text} (คำทั้งหมด: {word_count}, หลังคัดกรอง: {word_count_filtered})")
+            print("POS:", line.tags)
+            print("หลังคัดกรอง:", line.filtered_tokens)
+
+    print(f"\nจำนวนคำทั้งหมดก่อนคัดกรอง: {total_words}")
+    print(f"จำนวนคำทั้งหมดหลังคัดกรอง: {total_words_filtered}")
+
+    with open("LineManagements/Data/report_Output.txt", "w", encoding="utf-8") as out_file:
+        for line in output_lines:
+            out_file.write(line + "\n")
+
+    print("✅ บันทึกไฟล์เรียบร้อย: Data/output_21.txt")
@@ -0,0 +1,237 @@
+import os
+import time
+from functools import partial
+from multiprocessing import Pool
+from typing import Iterable, List, NamedTuple, Optional
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import PolyCollection
+from matplotlib.figure import Figure
+
+from spatialIndex import DocumentIndex
+from thaiFont import get_thai_font, thai_font_path, use_font_path
+from wordBoxes import PageWords
+
+FIGSIZE = (8, 11)
+DPI = 100
+FONTSIZE = 6
+MIN_TEXT_PX = 8.0  # text="auto": ใส่ข้อความเฉพาะกล่องที่สูงบนภาพอย่างน้อยเท่านี้ (pixel) กล่องเล็กกว่านี้อ่านไม่ออกอยู่แล้ว
+TEXT_MODES = ("none", "auto", "all")
+
+
+class OverlayPage(NamedTuple):
+    """กล่องทั้งหน้าที่จะวาด (ส่งข้าม process ได้ มีแค่ array / str)"""
+    page_number: int
+    width: float
+    height: float
+    polygons: np.ndarray              # (n, 2k) [x1, y1, ..., xk, yk] พิกัดของหน้า แกน y ชี้ลง
+    labels: Optional[np.ndarray]      # ข้อความต่อกล่อง หรือ None
+    title: str = ""
+
+
+# -------------------------------
+#  แปลง analyzeResult -> OverlayPage
+# -------------------------------
+def word_overlay_page(page, style: str = "words", index: DocumentIndex = None) -> OverlayPage:
+    """
+    กล่องของ words (หรือ lines) ในหน้าเดียวของ analyzeResult
+    ถ้าให้ index (DocumentIndex ของเอกสารเดียวกัน) ตัดคำที่อยู่ในตารางออก เหลือเฉพาะเนื้อความ
+    """
+    words = PageWords.from_page(page, split_newlines=False, style=style)
+    if index is not None:
+        words = words.take(~index.table_word_mask(words, page["pageNumber"]))
+    return OverlayPage(page["pageNumber"], page["width"], page["height"], words.polygons, words.content,
+                       f"Word Bounding Boxes - Page {page['pageNumber']}")
+
+
+def word_overlay_pages(json_data, style: str = "words", exclude_tables: bool = False) -> List[OverlayPage]:
+    index = DocumentIndex(json_data) if exclude_tables else None
+    return [word_overlay_page(page, style, index) for page in json_data["analyzeResult"]["pages"]]
+
+
+def table_cell_overlay_page(index: DocumentIndex, page_number: int) -> Optional[OverlayPage]:
+    """กล่องของทุกช่องในทุกตารางของหน้านี้ (None ถ้าหน้านี้ไม่มีตาราง)"""
+    polygons, refs = index.regions("table_cells", page_number)
+    if not polygons:
+        return None
+    page = index.page(page_number)
+    width, height = (page["width"], page["height"]) if page else (800, 1100)  # fallback แบบเดิม
+    if len({len(p) for p in polygons}) != 1:
+        polygons = [_as_box(p) for p in polygons]
+    tables = index.analyze["tables"]
+    labels = np.array([tables[t]["cells"][c].get("content", "") for t, c in refs], dtype=object)
+    return OverlayPage(page_number, width, height, np.array(polygons, dtype=np.float64), labels,
+                       f"All Tables - Page {page_number} Cell Bounding Boxes")
+
+
+def table_cell_overlay_pages(json_data) -> List[OverlayPage]:
+    """ช่องตารางแยกตามหน้า (เฉพาะหน้าที่มีตาราง)"""
+    index = DocumentIndex(json_data)
+    pages = (table_cell_overlay_page(index, pnum) for pnum in index.pages_with("table_cells"))
+    return [page for page in pages if page is not None]
+
+
+def _as_box(polygon):
+    xs, ys = polygon[::2], polygon[1::2]
+    x0, x1, y0, y1 = min(xs), max(xs), min(ys), max(ys)
+    return [x0, y0, x1, y0, x1, y1, x0, y1]
+
+
+# -------------------------------
+#  วาด: PolyCollection เดียวต่อชุดกล่อง + ข้อความเฉพาะที่ต้องการ
+# -------------------------------
+def _pixels_per_unit(ax) -> float:
+    """สเกลข้อมูล -> pixel ของ axes (aspect equal ใช้ด้านที่แคบกว่า) ต้องตั้ง xlim / ylim ก่อนเรียก"""
+    fig = ax.figure
+    box = ax.get_position()
+    w_px, h_px = box.width * fig.get_figwidth() * fig.dpi, box.height * fig.get_figheight() * fig.dpi
+    x0, x1 = ax.get_xlim()
+    y0, y1 = ax.get_ylim()
+    return min(w_px / abs(x1 - x0), h_px / abs(y1 - y0))
+
+
+def draw_boxes(ax, polygons: np.ndarray, labels=None, text: str = "auto", min_text_px: float = MIN_TEXT_PX,
+               fontsize: float = FONTSIZE, font=None, **collection_kw) -> PolyCollection:
+    """
+    วาดกล่องทั้งหมดเป็น PolyCollection เดียว (artist เดียวแทน patch ละคำ)
+    ข้อความวางที่มุมแรกของกล่องแบบเดิม: text="none" ไม่วาด, "all" ทุกกล่อง,
+    "auto" เฉพาะกล่องที่สูงบนภาพ >= min_text_px, font=None ใช้ฟอนต์ไทยจาก thaiFont
+    """
+    if text not in TEXT_MODES:
+        raise ValueError(f"text ต้องเป็นหนึ่งใน {TEXT_MODES}: {text!r}")
+    n = len(polygons)
+    # หน้าว่าง (ไม่มีคำ / ทุกคำอยู่ในตาราง) reshape(0, -1, 2) หาความยาวไม่ได้ ใช้ collection ว่างแทน
+    verts = np.asarray(polygons, dtype=np.float64).reshape(n, -1, 2) if n else np.empty((0, 4, 2))
+    collection_kw.setdefault("edgecolors", "blue")
+    collection_kw.setdefault("facecolors", "none")
+    collection_kw.setdefault("linewidths", 1)
+    collection = PolyCollection(verts, closed=True, **collection_kw)
+    ax.add_collection(collection)
+
+    if labels is None or text == "none" or n == 0:
+        return collection
+    if text == "all":
+        keep = np.arange(n)
+    else:
+        heights = verts[:, :, 1].max(axis=1) - verts[:, :, 1].min(axis=1)
+        keep = np.flatnonzero(heights * _pixels_per_unit(ax) >= min_text_px)
+    labels = np.asarray(labels, dtype=object)
+    font = font or get_thai_font()
+    for i, (x, y) in zip(keep.tolist(), verts[keep, 0].tolist()):
+        ax.text(x, y, labels[i], fontproperties=font, fontsize=fontsize, verticalalignment='top')
+    return collection
+
+
+def new_figure(figsize=FIGSIZE, dpi: float = DPI, ncols: int = 1):
+    """Figure บน canvas Agg โดยตรง (ไม่ผ่าน pyplot: ไม่มี state กลาง ไม่ต้องมีหน้าจอ ไม่ต้อง close)"""
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    axes = fig.subplots(1, ncols)
+    return fig, axes
+
+
+def render_overlay(page: OverlayPage, path: str, text: str = "auto", min_text_px: float = MIN_TEXT_PX,
+                   fontsize: float = FONTSIZE, font=None, figsize=FIGSIZE, dpi: float = DPI, **collection_kw) -> str:
+    """วาดหน้าเดียวลง PNG ที่ path (แกน y กลับหัวให้ตรงกับหน้าเอกสาร)"""
+    font = font or get_thai_font()
+    fig, ax = new_figure(figsize, dpi)
+    ax.set_xlim(0, page.width)
+    ax.set_ylim(page.height, 0)
+    ax.set_aspect('equal')
+    if page.title:
+        ax.set_title(page.title, fontproperties=font)
+    draw_boxes(ax, page.polygons, page.labels, text, min_text_px, fontsize, font, **collection_kw)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    fig.savefig(path, dpi=dpi)
+    return path
+
+
+def _render_task(task, **options) -> str:
+    page, path = task
+    return render_overlay(page, path, **options)
+
+
+def render_document(pages: Iterable[OverlayPage], output_dir: str, prefix: str = "page", workers: int = None,
+                    chunksize: int = 1, **options) -> List[str]:
+    """
+    วาดทุกหน้าเป็น <output_dir>/<prefix>_<page_number>.png ใน process pool (แต่ละหน้าไม่ขึ้นต่อกัน)
+    options ส่งต่อให้ render_overlay, workers=1 วาดใน process ปัจจุบัน คืนรายชื่อไฟล์ตามลำดับหน้า
+    ฟอนต์หาใน process หลักครั้งเดียว worker รับแค่ path (ไม่ค้นหาซ้ำ) แล้วโหลดไฟล์ครั้งเดียวต่อ worker
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    tasks = ((page, os.path.join(output_dir, f"{prefix}_{page.page_number}.png")) for page in pages)
+    render = partial(_render_task, **options)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return [render(task) for task in tasks]
+    with Pool(workers, initializer=use_font_path, initargs=(thai_font_path(),)) as pool:
+        return list(pool.imap(render, tasks, chunksize))
+
+
+# -------------------------------
+#  Benchmark: patch + ax.text ต่อคำผ่าน pyplot (แบบเดิม) vs PolyCollection บนเอกสาร 100 หน้า
+# -------------------------------
+def _per_patch_render(page: OverlayPage, path: str, font=None):
+    """แบบเดิมของ boundingBoxJsonBoxAllPage: Polygon + ax.text ทีละคำ (savefig แทน plt.show)"""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from matplotlib.patches import Polygon
+
+    font = font or get_thai_font()
+    fig, ax = plt.subplots(figsize=FIGSIZE)
+    for polygon, content in zip(page.polygons.tolist(), page.labels.tolist()):
+        points = [(polygon[i], polygon[i+1]) for i in range(0, len(polygon), 2)]
+        ax.add_patch(Polygon(points, closed=True, edgecolor='blue', facecolor='none', linewidth=1))
+        text_x, text_y = points[0]
+        ax.text(text_x, text_y, content, fontproperties=font, fontsize=6, verticalalignment='top')
+    ax.set_xlim(0, page.width)
+    ax.set_ylim(page.height, 0)
+    ax.set_aspect('equal')
+    ax.set_title(page.title, fontproperties=font)
+    fig.savefig(path, dpi=DPI)
+    plt.close(fig)
+
+
+def benchmark(n_pages: int = 100, words_per_page: int = 600, workers: int = None,
+              output_dir: str = "Data/overlay_benchmark"):
+    import shutil
+    from pageParallel import make_synthetic_report
+
+    report = make_synthetic_report(n_pages, words_per_page)
+    pages = word_overlay_pages(report)
+    # หน้าว่างท้ายเอกสาร (ไม่มีคำเลย) ต้องวาดได้ทั้งแบบมีข้อความและใน pool
+    last = report["analyzeResult"]["pages"][-1]
+    blank = word_overlay_page({"pageNumber": n_pages + 1, "width": last["width"], "height": last["height"], "words": []})
+    pages.append(blank)
+    workers = workers or os.cpu_count() or 1
+    shutil.rmtree(output_dir, ignore_errors=True)
+    os.makedirs(output_dir)
+
+    # แบบเดิมช้ามาก วัดแค่ 10 หน้าแรกแล้วคิดเป็นหน้า/วินาที
+    sample = pages[:max(1, min(10, n_pages))]
+    t0 = time.perf_counter()
+    for page in sample:
+        _per_patch_render(page, os.path.join(output_dir, f"legacy_{page.page_number}.png"))
+    legacy = len(sample) / (time.perf_counter() - t0)
+
+    # เวลาส่วนใหญ่ของแบบมีข้อความอยู่ที่ ax.text รอบนั้นจึงวัดจากหน้าชุดเดียวกับแบบเดิม
+    runs = [("PolyCollection + ข้อความทุกคำ", sample + [blank], dict(text="all"), 1),
+            ("PolyCollection ไม่มีข้อความ", pages, dict(text="none"), 1),
+            (f"PolyCollection ไม่มีข้อความ, {workers} workers", pages, dict(text="none"), workers)]
+    print(f"📊 overlay {n_pages} หน้า x {words_per_page} คำ (cores: {os.cpu_count()})")
+    print(f"  {'patch + ax.text ต่อคำ (เดิม)':<36} {legacy:7.2f} หน้า/s  ({len(sample)} หน้า)")
+    results = {"legacy": legacy}
+    for label, run_pages, options, n_workers in runs:
+        t0 = time.perf_counter()
+        render_document(run_pages, output_dir, workers=n_workers, **options)
+        rate = len(run_pages) / (time.perf_counter() - t0)
+        results[label] = rate
+        print(f"  {label:<36} {rate:7.2f} หน้า/s  ({rate / legacy:5.1f}x, {len(run_pages)} หน้า)")
+    shutil.rmtree(output_dir, ignore_errors=True)
+    return results
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,106 @@
+import json
+from typing import Iterator, List, NamedTuple, Optional
+
+from pageParallel import map_pages, tag_lines, threshold_page
+from spatialIndex import DocumentIndex
+from tableGrid import TableGrid, document_tables
+from thaiTagger import CACHE_PATH
+from wordBoxes import PageWords
+
+INPUT_PATH = "LineManagements/Data/meeting_executive4_66.pdf.json"
+OUTPUT_PATH = "LineManagements/Data/report_Layout_Output.txt"
+
+
+class LayoutBlock(NamedTuple):
+    """บรรทัดเนื้อความหรือตารางหนึ่งตาราง ตามลำดับการอ่าน (บนลงล่างในหน้า)"""
+    kind: str                          # "line" หรือ "table"
+    page_number: int
+    top: float                         # ขอบบนแบบ normalize (0-1) ใช้เรียงในหน้า
+    text: str                          # ข้อความบรรทัด (kind="table": ว่าง)
+    rows: Optional[List[List[str]]]    # kind="table": ข้อความแต่ละช่อง
+    table_idx: Optional[int]
+    total_words: int
+    total_words_filtered: int
+
+
+def _table_starts(index: DocumentIndex, grids: List[TableGrid]) -> dict:
+    """
+    {page_number: [(top, grid), ...]} ตารางวางที่หน้าแรกที่ตารางปรากฏ ตำแหน่งตาม region บนสุดในหน้านั้น
+    ตารางที่ต่อข้ามหน้า (tableGrid รวมแล้ว) วางครั้งเดียวตามส่วนแรก
+    """
+    first = {}
+    for pnum in index.pages_with("tables"):
+        page = index.page(pnum)
+        height = page["height"] if page else 1.0
+        for polygon, t in zip(*index.regions("tables", pnum)):
+            if t not in first:
+                first[t] = (pnum, min(polygon[1::2]) / height)
+    starts = {}
+    for grid in grids:
+        if grid.sources[0] in first:
+            pnum, top = first[grid.sources[0]]
+            starts.setdefault(pnum, []).append((top, grid))
+    return starts
+
+
+def layout_document(json_data, line_threshold: float = 0.01, style: str = "words", workers: int = None,
+                    cache_path: str = None) -> Iterator[LayoutBlock]:
+    """
+    อ่านทั้งเอกสารรอบเดียว yield บรรทัดเนื้อความและตารางตามลำดับการอ่าน
+      - คำที่จุดกลางอยู่ใน boundingRegions ของตาราง (DocumentIndex) ไม่ถูกจัดเป็นบรรทัด
+      - ตาราง (tableGrid) รองรับ span และตารางที่ต่อข้ามหน้าออกเป็นบล็อกเดียวที่หน้าแรก
+      - บรรทัดจัดใน process pool เหมือน lineManagement (threshold_page) ตาราง + ตัดคำของช่องทำที่ process หลัก
+      - จำนวนคำ: บรรทัดนับจากคำในบรรทัด ตารางนับจากข้อความในช่อง คำในตารางจึงไม่ถูกนับซ้ำ
+    """
+    analyze = json_data["analyzeResult"]
+    index = DocumentIndex(json_data)
+    starts = _table_starts(index, document_tables(json_data))
+    pages = analyze["pages"]
+    tasks = (
+        (page_idx, PageWords.from_page(page, split_newlines=False, style=style), line_threshold,
+         index.regions("tables", page["pageNumber"])[0])
+        for page_idx, page in enumerate(pages)
+    )
+    for result in map_pages(threshold_page, tasks, workers=workers, cache_path=cache_path):
+        pnum = pages[result.page_idx]["pageNumber"]
+        # PageWords สร้างใหม่ใน process หลักเพื่อหาตำแหน่งบรรทัด (ถูกกว่าส่งกลับจาก worker)
+        words = PageWords.from_page(pages[result.page_idx], split_newlines=False, style=style)
+        blocks = [
+            LayoutBlock("line", pnum, float(words.min_y[line].min()), r.text, None, None,
+                        len(r.tags), len(r.filtered_tokens))
+            for line, r in zip(result.lines, result.line_results)
+        ]
+        for top, grid in starts.get(pnum, []):
+            tagged = tag_lines([cell.content for cell in grid.cells])
+            blocks.append(LayoutBlock("table", pnum, top, "", grid.rows, grid.table_id,
+                                      sum(len(r.tags) for r in tagged),
+                                      sum(len(r.filtered_tokens) for r in tagged)))
+        blocks.sort(key=lambda b: b.top)
+        yield from blocks
+
+
+def write_layout(blocks, path: str = OUTPUT_PATH):
+    """บรรทัดละบรรทัด ตารางคั่นด้วยหัว ===== Table n ===== แล้วตามด้วยแถวแบบ tab (รูปแบบเดียวกับ report_Table_Output)"""
+    with open(path, "w", encoding="utf-8") as out_file:
+        for block in blocks:
+            if block.kind == "line":
+                out_file.write(block.text + "\n")
+            else:
+                out_file.write(f"===== Table {block.table_idx + 1} =====\n")
+                for row in block.rows:
+                    out_file.write("\t".join(row) + "\n")
+
+
+if __name__ == "__main__":
+    with open(INPUT_PATH, "r", encoding="utf-8") as f:
+        json_data = json.load(f)
+
+    blocks = list(layout_document(json_data, cache_path=CACHE_PATH))
+    n_lines = sum(b.kind == "line" for b in blocks)
+    n_tables = len(blocks) - n_lines
+    print(f"บรรทัดเนื้อความ {n_lines}, ตาราง {n_tables}")
+    print(f"จำนวนคำทั้งหมดก่อนคัดกรอง: {sum(b.total_words for b in blocks)}")
+    print(f"จำนวนคำทั้งหมดหลังคัดกรอง: {sum(b.total_words_filtered for b in blocks)}")
+
+    write_layout(blocks)
+    print(f"✅ บันทึกไฟล์เรียบร้อย: {OUTPUT_PATH}")
@@ -0,0 +1,201 @@
+import os
+import random
+import time
+from multiprocessing import Pool
+from typing import Iterable, Iterator, List, NamedTuple
+
+import numpy as np
+
+from lineClustering import cluster_lines_columnar, cluster_lines_with_dbscan, group_lines_by_threshold
+from spatialIndex import PageIndex
+from thaiTagger import ThaiTagger
+from wordBoxes import PageWords, make_synthetic_analyze_result
+
+POS_EXCLUDE = {"NPRP", "NTTL"}  # ไม่นับชื่อเฉพาะ / คำนำหน้าชื่อ
+SPACE_GAP = 0.06                # center_x ห่างกันเกินนี้ใส่ '_' คั่น
+EXPECTED_LINES = 8              # errorLineManagement เลือกวิธีที่ได้จำนวนบรรทัดใกล้ค่านี้
+LINE_ALGORITHM_VERSION = 1      # เพิ่มเมื่อผลจัดบรรทัดเปลี่ยน (cache ผลประเมินของ WER/ocrEvaluation ใช้เป็น key)
+
+_tagger: ThaiTagger = None
+
+
+def _load_models(cache_path: str = None):
+    """
+    import pythainlp และโหลด dictionary / perceptron model ครั้งเดียวต่อ process
+    ใช้เป็น initializer ของ Pool จึงโหลดครั้งเดียวต่อ worker ไม่ใช่ทุกหน้า
+    แต่ละ process มี ThaiTagger (LRU) ของตัวเอง เริ่มจาก cache ที่ save ไว้รอบก่อนถ้ามี cache_path
+    """
+    global _tagger
+    if _tagger is None:
+        _tagger = ThaiTagger()
+        _tagger.warm_up()
+    if cache_path and _tagger.cache_path != cache_path:
+        _tagger.cache_path = cache_path
+        _tagger.load()
+
+
+class LineResult(NamedTuple):
+    text: str
+    tags: list
+    filtered_tokens: List[str]
+
+
+class PageResult(NamedTuple):
+    page_idx: int
+    lines: List[np.ndarray]   # index ของคำในแต่ละบรรทัด (ใช้ต่อกับ PageWords ของหน้านั้น)
+    line_results: List[LineResult]
+    method: str
+    total_words: int
+    total_words_filtered: int
+    cache_entries: list  # ผลตัดคำที่ worker คำนวณใหม่ ส่งกลับให้ process หลักรวมเข้า cache
+
+
+def line_text(words: PageWords, line: np.ndarray, centers_x: np.ndarray) -> str:
+    """ต่อคำในบรรทัด ใส่ '_' เมื่อ center_x ของคำถัดไปห่างเกิน SPACE_GAP"""
+    gaps = (np.diff(centers_x[line]) > SPACE_GAP).tolist() + [False]
+    return "".join(c + "_" if gap else c for c, gap in zip(words.content[line].tolist(), gaps))
+
+
+def tag_lines(texts: List[str]) -> List[LineResult]:
+    """ตัดคำ + POS ทั้งหน้าเป็น batch เดียว (บรรทัดซ้ำ เช่นหัวกระดาษ / บทบาท ได้จาก cache)"""
+    _load_models()
+    tagged = _tagger.tag_batch([text.replace("_", " ") for text in texts])
+    return [
+        LineResult(text, tags, [word for word, tag in tags if tag not in POS_EXCLUDE])
+        for text, tags in zip(texts, tagged)
+    ]
+
+
+def tag_line(text: str) -> LineResult:
+    return tag_lines([text])[0]
+
+
+def _finish_page(page_idx, words, lines, centers_x, method) -> PageResult:
+    results = tag_lines([line_text(words, line, centers_x) for line in lines])
+    return PageResult(
+        page_idx, lines, results, method,
+        sum(len(r.tags) for r in results),
+        sum(len(r.filtered_tokens) for r in results),
+        _tagger.take_new_entries(),
+    )
+
+
+def threshold_page(task) -> PageResult:
+    """
+    งานต่อหน้าของ lineManagement: task = (page_idx, PageWords, line_threshold[, exclude_polygons])
+    exclude_polygons: region ของตารางในหน้านี้ คำที่จุดกลางอยู่ใน region ไม่ถูกนำมาจัดบรรทัด
+    (index ใน lines ยังชี้ไปที่ words ที่ส่งมาทั้งหน้า)
+    """
+    page_idx, words, line_threshold, *rest = task
+    exclude = rest[0] if rest else None
+    if exclude:
+        keep = np.flatnonzero(~PageIndex.from_polygons(words.polygons).mask_in_polygons(exclude))
+        lines = [keep[line] for line in group_lines_by_threshold(words.take(keep), line_threshold)]
+    else:
+        lines = group_lines_by_threshold(words, line_threshold)
+    return _finish_page(page_idx, words, lines, words.poly_center_x, "threshold")
+
+
+def clustered_lines(words: PageWords):
+    """จัดบรรทัดด้วย sweep และ DBSCAN แล้วเลือกวิธีที่ได้จำนวนบรรทัดใกล้ EXPECTED_LINES -> (lines, method)"""
+    lines_improved = cluster_lines_columnar(words)
+    lines_dbscan = cluster_lines_with_dbscan(words)
+    if abs(len(lines_improved) - EXPECTED_LINES) < abs(len(lines_dbscan) - EXPECTED_LINES):
+        return lines_improved, "Improved"
+    return lines_dbscan, "DBSCAN"
+
+
+def clustered_page(task) -> PageResult:
+    """งานต่อหน้าของ errorLineManagement: task = (page_idx, PageWords) เลือกระหว่าง sweep กับ DBSCAN"""
+    page_idx, words = task
+    lines, method = clustered_lines(words)
+    return _finish_page(page_idx, words, lines, words.center_x, method)
+
+
+def reconstruct_lines(words: PageWords, method: str = "threshold", line_threshold: float = 0.01) -> List[str]:
+    """
+    ข้อความแต่ละบรรทัดของหน้า (ไม่ตัดคำ / POS) '_' ที่คั่นคำห่างกันแปลงเป็นช่องว่าง
+    method = "threshold" (lineManagement) หรือ "clustered" (errorLineManagement)
+    """
+    if method == "threshold":
+        lines, centers_x = group_lines_by_threshold(words, line_threshold), words.poly_center_x
+    elif method == "clustered":
+        lines, centers_x = clustered_lines(words)[0], words.center_x
+    else:
+        raise ValueError(f"method ต้องเป็น threshold หรือ clustered: {method!r}")
+    return [line_text(words, line, centers_x).replace("_", " ") for line in lines]
+
+
+def map_pages(page_fn, tasks: Iterable, workers: int = None, chunksize: int = 1,
+              cache_path: str = None) -> Iterator[PageResult]:
+    """
+    รัน page_fn กับทุกหน้าใน process pool แล้ว yield ผลตามลำดับหน้าเดิมเสมอ (imap)
+    workers=1 รันใน process ปัจจุบัน (ไว้ debug / เทียบผล)
+    cache_path: ไฟล์ token cache ทุก worker โหลดตอนเริ่ม ผลใหม่จากทุก worker รวมใน process หลักแล้ว save ตอนจบ
+    """
+    workers = workers or os.cpu_count() or 1
+    _load_models(cache_path)
+    if workers == 1:
+        for task in tasks:
+            yield page_fn(task)
+    else:
+        with Pool(workers, initializer=_load_models, initargs=(cache_path,)) as pool:
+            for result in pool.imap(page_fn, tasks, chunksize):
+                _tagger.merge(result.cache_entries)
+                yield result
+    if cache_path:
+        _tagger.save()
+
+
+def tagger_stats() -> str:
+    """สถิติ cache ของ process นี้ (ถ้าใช้ pool ตัวเลข hit/miss เป็นของ worker ไม่รวมที่นี่)"""
+    return _tagger.stats() if _tagger is not None else "ยังไม่ได้โหลด tagger"
+
+
+# -------------------------------
+#  Benchmark: speedup ตามจำนวน worker บนรายงานสังเคราะห์ขนาดใหญ่
+# -------------------------------
+_SAMPLE_WORDS = [
+    "ที่ประชุม", "ได้", "พิจารณา", "เรื่อง", "การ", "กำหนด", "อัตรา", "เงิน", "ส่งเข้า", "กองทุน",
+    "น้ำมัน", "เชื้อเพลิง", "มติ", "เห็นชอบ", "ตามที่", "สำนักงาน", "นโยบาย", "และ", "แผน", "พลังงาน",
+    "เสนอ", "รายงาน", "สถานการณ์", "ราคา", "ตลาดโลก", "นาย", "สมชาย", "กรรมการ", "ประธาน", "ครั้งที่",
+]
+
+
+def make_synthetic_report(n_pages: int = 200, words_per_page: int = 600, seed: int = 0):
+    json_data = make_synthetic_analyze_result(n_pages, words_per_page, seed)
+    rng = random.Random(seed)
+    for page in json_data["analyzeResult"]["pages"]:
+        for word in page["words"]:
+            word["content"] = rng.choice(_SAMPLE_WORDS)
+    return json_data
+
+
+def benchmark(n_pages: int = 200, words_per_page: int = 600, max_workers: int = None):
+    json_data = make_synthetic_report(n_pages, words_per_page)
+    pages = [PageWords.from_page(p, split_newlines=False) for p in json_data["analyzeResult"]["pages"]]
+    tasks = [(i, words, 0.01) for i, words in enumerate(pages)]
+
+    # โหลด model ก่อนจับเวลา ไม่ให้รอบ serial เสียเวลา import pythainlp อยู่ฝ่ายเดียว
+    _load_models()
+    max_workers = max_workers or os.cpu_count() or 1
+    counts = sorted({1, *[w for w in (2, 4, 8, 16, 32) if w <= max_workers], max_workers})
+    print(f"📊 {n_pages} หน้า x {words_per_page} คำ (cores: {os.cpu_count()})")
+
+    baseline = None
+    expected = None
+    for workers in counts:
+        _tagger.clear()  # เริ่มทุกรอบด้วย cache ว่าง (worker ที่ fork ออกไปจะได้ cache ของ process หลักติดไปด้วย)
+        t0 = time.perf_counter()
+        results = list(map_pages(threshold_page, tasks, workers=workers))
+        elapsed = time.perf_counter() - t0
+        texts = [r.text for page in results for r in page.line_results]
+        totals = (sum(p.total_words for p in results), sum(p.total_words_filtered for p in results))
+        if expected is None:
+            baseline, expected = elapsed, (texts, totals)
+        assert (texts, totals) == expected, "ผลไม่ตรงกับแบบ serial"
+        print(f"  workers={workers:>2}: {elapsed:7.2f} s  speedup {baseline / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -1,9 +1,10 @@
 import matplotlib.pyplot as plt
 import json
-import matplotlib.font_manager as fm
+from spatialIndex import DocumentIndex
+from thaiFont import get_thai_font
 
 # ฟอนต์ภาษาไทย
-thai_font = fm.FontProperties(fname="C:/Windows/Fonts/tahoma.ttf")
+thai_font = get_thai_font()
 
 DPI = 1
 page_to_plot = 1
@@ -14,44 +15,39 @@ with open("LineManagements/Data/ReportMeeting_4_58 copy.pdf.json", "r", encoding
 
 paragraphs = json_data["analyzeResult"]["paragraphs"]
 
-# เลือกเฉพาะ paragraph ของหน้านี้
-page_paragraphs = [
-    p for p in paragraphs
-    if any(br["pageNumber"] == page_to_plot for br in p["boundingRegions"])
-]
+# polygon ของ paragraph ในหน้านี้ (DocumentIndex แยกตามหน้าไว้แล้ว ไม่ต้องไล่ทุก paragraph)
+polygons, refs = DocumentIndex(json_data).regions("paragraphs", page_to_plot)
 
 plt.figure(figsize=(8, 11))
 
-for paragraph in page_paragraphs:
-    for br in paragraph["boundingRegions"]:
-        if br["pageNumber"] == page_to_plot:
-            polygon = br["polygon"]
-            if len(polygon) < 6 or len(polygon) % 2 != 0:
-                continue
-            
-            # แปลงเป็น list ของ (x, y)
-            points = [(polygon[i] * DPI, polygon[i+1] * DPI) for i in range(0, len(polygon), 2)]
-            
-            # ปิด loop polygon (วนกลับจุดแรก)
-            points.append(points[0])
-            
-            xs, ys = zip(*points)
-            plt.plot(xs, ys, color='black')
-            
-            # เนื้อหา paragraph
-            content = paragraph.get("content", "")
-            if len(content) > 100:
-                content = content[:100] + "..."
-            
-            # พิกัดมุมบนซ้าย
-            text_x, text_y = points[0]
-            
-            # วางข้อความ
-            plt.text(
-                text_x, text_y, content,
-                fontproperties=thai_font, fontsize=8,
-                verticalalignment='top', color='red'
-            )
+for polygon, p_idx in zip(polygons, refs):
+    paragraph = paragraphs[p_idx]
+    if len(polygon) < 6 or len(polygon) % 2 != 0:
+        continue
+    
+    # แปลงเป็น list ของ (x, y)
+    points = [(polygon[i] * DPI, polygon[i+1] * DPI) for i in range(0, len(polygon), 2)]
+    
+    # ปิด loop polygon (วนกลับจุดแรก)
+    points.append(points[0])
+    
+    xs, ys = zip(*points)
+    plt.plot(xs, ys, color='black')
+    
+    # เนื้อหา paragraph
+    content = paragraph.get("content", "")
+    if len(content) > 100:
+        content = content[:100] + "..."
+    
+    # พิกัดมุมบนซ้าย
+    text_x, text_y = points[0]
+    
+    # วางข้อความ
+    plt.text(
+        text_x, text_y, content,
+        fontproperties=thai_font, fontsize=8,
+        verticalalignment='top', color='red'
+    )
 
 # ตั้งค่ากราฟ
 plt.gca().invert_yaxis()
@@ -0,0 +1,348 @@
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+LAYERS = ("words", "lines", "paragraphs", "tables", "table_cells")
+PREDICATES = ("center", "bbox")
+
+
+def polygon_boxes(polygons) -> np.ndarray:
+    """polygon แบบ [x1, y1, ..., xk, yk] (ยาวไม่เท่ากันได้) -> array (n, 4) [min_x, min_y, max_x, max_y]"""
+    if isinstance(polygons, np.ndarray) and polygons.ndim == 2:
+        xs, ys = polygons[:, 0::2], polygons[:, 1::2]
+        return np.stack([xs.min(axis=1), ys.min(axis=1), xs.max(axis=1), ys.max(axis=1)], axis=1)
+    out = np.empty((len(polygons), 4), dtype=np.float64)
+    for i, p in enumerate(polygons):
+        xs, ys = p[::2], p[1::2]
+        out[i] = (min(xs), min(ys), max(xs), max(ys))
+    return out
+
+
+def points_in_polygon(xs: np.ndarray, ys: np.ndarray, polygon) -> np.ndarray:
+    """ray casting ทีละขอบของ polygon แต่ทำกับทุกจุดพร้อมกัน (จุดบนขอบนับตามกติกา half-open)"""
+    px = np.asarray(polygon[0::2], dtype=np.float64)
+    py = np.asarray(polygon[1::2], dtype=np.float64)
+    inside = np.zeros(len(xs), dtype=bool)
+    for i in range(len(px)):
+        x0, y0, x1, y1 = px[i - 1], py[i - 1], px[i], py[i]
+        if y0 == y1:
+            continue
+        crosses = (y0 > ys) != (y1 > ys)
+        x_at = x0 + (ys - y0) * (x1 - x0) / (y1 - y0)
+        inside ^= crosses & (xs < x_at)
+    return inside
+
+
+class PageIndex:
+    """
+    uniform grid ของกล่องในหน้าเดียว (พิกัดของหน้า) แบบ CSR: รายการกล่องเรียงตาม cell + offset ของแต่ละ cell
+      - ขนาด cell ค่าเริ่มต้น = 2 เท่าของ median ด้านยาวของกล่อง คำหนึ่งจึงอยู่ใน cell ไม่กี่ช่อง
+      - กล่องใหญ่ (ตาราง / ย่อหน้า) ลงทุก cell ที่ทับ
+    query ดูเฉพาะ cell ที่ทับพื้นที่ถาม แล้วค่อยเทียบพิกัดจริง คืน index ของกล่องเรียงจากน้อยไปมาก
+    refs: ของที่กล่องแต่ละอันชี้ไป (เช่น index ของคำ หรือ (table_idx, cell_idx)) ขนานกับ boxes
+    """
+
+    def __init__(self, boxes, refs: list = None, polygons: list = None, cell_size: float = None):
+        self.boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        self.refs = refs if refs is not None else list(range(len(self.boxes)))
+        self.polygons = polygons
+        n = len(self.boxes)
+        if cell_size is None:
+            sizes = np.maximum(self.boxes[:, 2] - self.boxes[:, 0], self.boxes[:, 3] - self.boxes[:, 1])
+            cell_size = 2 * float(np.median(sizes)) if n else 1.0
+        self.cell_size = cell_size if cell_size > 0 else 1.0
+
+        if n == 0:
+            self.origin = np.zeros(2)
+            self.shape = (1, 1)
+            self._items = np.empty(0, dtype=np.intp)
+            self._offsets = np.zeros(2, dtype=np.intp)
+            return
+        self.origin = self.boxes[:, :2].min(axis=0)
+        c0 = self._cell_of(self.boxes[:, :2])
+        c1 = self._cell_of(self.boxes[:, 2:])
+        self.shape = (int(c1[:, 0].max()) + 1, int(c1[:, 1].max()) + 1)
+
+        # แตกกล่องเป็นคู่ (กล่อง, cell) ทุก cell ที่ทับ โดยไม่วนใน Python
+        nx = c1[:, 0] - c0[:, 0] + 1
+        ny = c1[:, 1] - c0[:, 1] + 1
+        counts = nx * ny
+        box_ids = np.repeat(np.arange(n), counts)
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        cx = c0[box_ids, 0] + local % nx[box_ids]
+        cy = c0[box_ids, 1] + local // nx[box_ids]
+        cell_ids = cx * self.shape[1] + cy
+        order = np.argsort(cell_ids, kind="stable")
+        self._items = box_ids[order]
+        self._offsets = np.searchsorted(cell_ids[order], np.arange(self.shape[0] * self.shape[1] + 1))
+
+    @classmethod
+    def from_polygons(cls, polygons, refs: list = None, cell_size: float = None) -> "PageIndex":
+        return cls(polygon_boxes(polygons), refs, polygons, cell_size)
+
+    def __len__(self) -> int:
+        return len(self.boxes)
+
+    def _cell_of(self, xy: np.ndarray) -> np.ndarray:
+        return np.floor((xy - self.origin) / self.cell_size).astype(np.intp)
+
+    def _candidates(self, ix0: int, iy0: int, ix1: int, iy1: int) -> np.ndarray:
+        """กล่องใน cell ช่วง [ix0, ix1] x [iy0, iy1] (ตัดให้อยู่ในกริดแล้ว) กล่องที่ทับหลาย cell ซ้ำได้"""
+        ix0, iy0 = max(ix0, 0), max(iy0, 0)
+        ix1, iy1 = min(ix1, self.shape[0] - 1), min(iy1, self.shape[1] - 1)
+        if ix0 > ix1 or iy0 > iy1:
+            return self._items[:0]
+        # cell ที่ติดกันตามแกน y เป็นช่วงต่อเนื่องใน _items อ่านทีละแถว x
+        parts = [self._items[self._offsets[ix * self.shape[1] + iy0]:self._offsets[ix * self.shape[1] + iy1 + 1]]
+                 for ix in range(ix0, ix1 + 1)]
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def query_rect(self, x0: float, y0: float, x1: float, y1: float) -> np.ndarray:
+        """กล่องที่ทับสี่เหลี่ยม (ขอบติดกันนับว่าทับ)"""
+        (ix0, iy0), (ix1, iy1) = self._cell_of(np.array([[x0, y0], [x1, y1]]))
+        cand = self._candidates(ix0, iy0, ix1, iy1)
+        b = self.boxes[cand]
+        return np.unique(cand[(b[:, 0] <= x1) & (b[:, 2] >= x0) & (b[:, 1] <= y1) & (b[:, 3] >= y0)])
+
+    def query_point(self, x: float, y: float) -> np.ndarray:
+        return self.query_rect(x, y, x, y)
+
+    def query_polygon(self, polygon, predicate: str = "center") -> np.ndarray:
+        """
+        กล่องใน polygon [x1, y1, ..., xk, yk]
+          - "center": จุดกลางกล่องอยู่ใน polygon (ใช้ตัดสินว่าคำอยู่ในช่องตาราง / ย่อหน้า)
+          - "bbox": กล่องทับกรอบสี่เหลี่ยมของ polygon
+        """
+        if predicate not in PREDICATES:
+            raise ValueError(f"predicate ต้องเป็นหนึ่งใน {PREDICATES}: {predicate!r}")
+        xs, ys = polygon[0::2], polygon[1::2]
+        cand = self.query_rect(min(xs), min(ys), max(xs), max(ys))
+        if predicate == "bbox" or len(cand) == 0:
+            return cand
+        b = self.boxes[cand]
+        return cand[points_in_polygon((b[:, 0] + b[:, 2]) / 2, (b[:, 1] + b[:, 3]) / 2, polygon)]
+
+    def mask_in_polygons(self, polygons, predicate: str = "center") -> np.ndarray:
+        """bool ต่อกล่อง: อยู่ใน polygon ใดก็ได้ใน polygons"""
+        mask = np.zeros(len(self), dtype=bool)
+        for polygon in polygons:
+            mask[self.query_polygon(polygon, predicate)] = True
+        return mask
+
+    def _distances(self, idx: np.ndarray, x: float, y: float) -> np.ndarray:
+        b = self.boxes[idx]
+        dx = np.maximum(np.maximum(b[:, 0] - x, x - b[:, 2]), 0)
+        dy = np.maximum(np.maximum(b[:, 1] - y, y - b[:, 3]), 0)
+        return np.hypot(dx, dy)
+
+    def nearest(self, x: float, y: float, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        k กล่องที่ใกล้จุด (x, y) ที่สุด (ระยะถึงขอบกล่อง อยู่ในกล่อง = 0) คืน (index, ระยะ) เรียงใกล้ -> ไกล
+        ขยายวง cell รอบจุดทีละชั้นจนระยะที่ k ไม่เกินระยะถึงขอบพื้นที่ที่ค้นแล้ว
+        """
+        n = len(self)
+        if n == 0 or k <= 0:
+            return self._items[:0], np.empty(0)
+        k = min(k, n)
+        # จุดนอกกริด: เริ่มจาก cell ขอบที่ใกล้ที่สุด (ระยะถึงขอบติดลบ -> ขยายจนครอบทั้งกริด)
+        cx, cy = np.clip(self._cell_of(np.array([x, y])), 0, np.array(self.shape) - 1).tolist()
+        r = 0
+        while True:
+            ix0, iy0, ix1, iy1 = cx - r, cy - r, cx + r, cy + r
+            cand = np.unique(self._candidates(ix0, iy0, ix1, iy1))
+            covers_all = ix0 <= 0 and iy0 <= 0 and ix1 >= self.shape[0] - 1 and iy1 >= self.shape[1] - 1
+            if len(cand) >= k or covers_all:
+                d = self._distances(cand, x, y)
+                order = np.argsort(d, kind="stable")[:k]
+                if covers_all:
+                    return cand[order], d[order]
+                # กล่องที่ยังไม่เห็นอยู่นอกสี่เหลี่ยมที่ค้นแล้วทั้งหมด ระยะจึงไม่น้อยกว่าระยะถึงขอบสี่เหลี่ยม
+                lo = self.origin + np.array([ix0, iy0]) * self.cell_size
+                hi = self.origin + np.array([ix1 + 1, iy1 + 1]) * self.cell_size
+                bound = min(x - lo[0], hi[0] - x, y - lo[1], hi[1] - y)
+                if d[order[-1]] <= bound:
+                    return cand[order], d[order]
+            r += 1
+
+
+# -------------------------------
+#  ทั้งเอกสาร: หาตามหน้าแบบ O(1) + index ของแต่ละชั้นในแต่ละหน้า (สร้างเมื่อใช้ครั้งแรก)
+# -------------------------------
+class DocumentIndex:
+    """
+    ของใน analyzeResult แยกตามหน้าและชั้น (LAYERS)
+      - words / lines: จาก pages[*][layer], ref = index ในหน้านั้น
+      - paragraphs: ref = index ใน analyzeResult["paragraphs"]
+      - tables: ref = index ของตาราง, table_cells: ref = (table_idx, cell_idx)
+    ของที่มีหลาย boundingRegions (ตาราง / ย่อหน้าข้ามหน้า) อยู่ทุกหน้าที่มี region
+    """
+
+    def __init__(self, json_data):
+        self.analyze = json_data["analyzeResult"]
+        self.pages = {p["pageNumber"]: p for p in self.analyze.get("pages", [])}
+        self._regions: Dict[str, Dict[int, Tuple[list, list]]] = {}
+        self._indexes: Dict[Tuple[str, int], PageIndex] = {}
+
+    def page_numbers(self) -> List[int]:
+        return sorted(self.pages)
+
+    def page(self, page_number: int) -> Optional[dict]:
+        return self.pages.get(page_number)
+
+    def _group(self, layer: str) -> Dict[int, Tuple[list, list]]:
+        """{page_number: (polygons, refs)} ของชั้นนี้ ไล่ analyzeResult ครั้งเดียวต่อชั้น"""
+        if layer in self._regions:
+            return self._regions[layer]
+        if layer not in LAYERS:
+            raise ValueError(f"layer ต้องเป็นหนึ่งใน {LAYERS}: {layer!r}")
+        groups: Dict[int, Tuple[list, list]] = {}
+
+        def add(page_number, polygon, ref):
+            if polygon:
+                polys, refs = groups.setdefault(page_number, ([], []))
+                polys.append(polygon)
+                refs.append(ref)
+
+        if layer in ("words", "lines"):
+            for pnum, page in self.pages.items():
+                for i, item in enumerate(page.get(layer, [])):
+                    add(pnum, item.get("polygon"), i)
+        elif layer == "paragraphs":
+            for i, paragraph in enumerate(self.analyze.get("paragraphs", [])):
+                for br in paragraph.get("boundingRegions", []):
+                    add(br["pageNumber"], br.get("polygon"), i)
+        else:
+            for t, table in enumerate(self.analyze.get("tables", [])):
+                if layer == "tables":
+                    for br in table.get("boundingRegions", []):
+                        add(br["pageNumber"], br.get("polygon"), t)
+                else:
+                    for c, cell in enumerate(table.get("cells", [])):
+                        for br in cell.get("boundingRegions", []):
+                            add(br["pageNumber"], br.get("polygon"), (t, c))
+        self._regions[layer] = groups
+        return groups
+
+    def pages_with(self, layer: str) -> List[int]:
+        """หน้าที่มีของในชั้นนี้ (เช่นหน้าที่มีตาราง)"""
+        return sorted(self._group(layer))
+
+    def regions(self, layer: str, page_number: int) -> Tuple[list, list]:
+        """(polygons, refs) ของชั้นนี้ในหน้านี้"""
+        return self._group(layer).get(page_number, ([], []))
+
+    def index(self, layer: str, page_number: int) -> PageIndex:
+        key = (layer, page_number)
+        if key not in self._indexes:
+            polygons, refs = self.regions(layer, page_number)
+            self._indexes[key] = PageIndex.from_polygons(polygons, refs)
+        return self._indexes[key]
+
+    def table_word_mask(self, words, page_number: int, predicate: str = "center") -> np.ndarray:
+        """
+        bool ต่อคำของ PageWords (ลำดับเดียวกับ words): จุดกลางคำอยู่ในตารางใดตารางหนึ่งของหน้า
+        ใช้ region ของตารางทั้งก้อน ไม่ต้องไล่ทุกช่อง
+        """
+        polygons, _ = self.regions("tables", page_number)
+        if not polygons or len(words) == 0:
+            return np.zeros(len(words), dtype=bool)
+        return PageIndex.from_polygons(words.polygons).mask_in_polygons(polygons, predicate)
+
+
+# -------------------------------
+#  ตรวจผลเทียบการไล่ทุกกล่อง และ benchmark
+# -------------------------------
+def _brute_rect(boxes, x0, y0, x1, y1):
+    return np.flatnonzero((boxes[:, 0] <= x1) & (boxes[:, 2] >= x0) & (boxes[:, 1] <= y1) & (boxes[:, 3] >= y0))
+
+
+def _random_queries(index: PageIndex, n: int, rng: random.Random, size: float):
+    lo, hi = index.boxes[:, :2].min(axis=0), index.boxes[:, 2:].max(axis=0)
+    for _ in range(n):
+        x, y = rng.uniform(lo[0] - 1, hi[0] + 1), rng.uniform(lo[1] - 1, hi[1] + 1)
+        yield x, y, x + rng.uniform(0, size), y + rng.uniform(0, size)
+
+
+def check_against_brute_force(n_pages: int = 20, n_queries: int = 500, seed: int = 0) -> int:
+    """rect / polygon / nearest ต้องได้ผลเท่ากับการไล่ทุกกล่อง"""
+    from pageParallel import make_synthetic_report
+    from wordBoxes import PageWords
+
+    rng = random.Random(seed)
+    mismatches = 0
+    for page in make_synthetic_report(n_pages, 600, seed)["analyzeResult"]["pages"]:
+        words = PageWords.from_page(page, split_newlines=False)
+        index = PageIndex.from_polygons(words.polygons)
+        boxes = index.boxes
+        for x0, y0, x1, y1 in _random_queries(index, n_queries, rng, 3.0):
+            mismatches += not np.array_equal(index.query_rect(x0, y0, x1, y1), _brute_rect(boxes, x0, y0, x1, y1))
+            poly = [x0, y0, x1, y0 + 0.5, x1 - 0.3, y1, x0 + 0.2, y1 - 0.4]
+            centers = ((boxes[:, 0] + boxes[:, 2]) / 2, (boxes[:, 1] + boxes[:, 3]) / 2)
+            mismatches += not np.array_equal(index.query_polygon(poly), np.flatnonzero(points_in_polygon(*centers, poly)))
+            idx, d = index.nearest(x0, y0, k=5)
+            mismatches += not np.allclose(d, np.sort(index._distances(np.arange(len(index)), x0, y0))[:5])
+    print(f"ตรวจ {n_pages} หน้า x {n_queries} query -> ไม่ตรง {mismatches}")
+    return mismatches
+
+
+def benchmark(n_pages: int = 300, words_per_page: int = 600, n_queries: int = 2000, seed: int = 1):
+    from pageParallel import make_synthetic_report
+    from wordBoxes import PageWords
+
+    json_data = make_synthetic_report(n_pages, words_per_page, seed)
+    rng = random.Random(seed)
+    # ตารางสังเคราะห์ 1 ตารางต่อหน้า กินครึ่งล่างของหน้า
+    json_data["analyzeResult"]["tables"] = [
+        {"boundingRegions": [{"pageNumber": p["pageNumber"], "polygon": [0.5, 4, 8, 4, 8, 6, 0.5, 6]}], "cells": []}
+        for p in json_data["analyzeResult"]["pages"]
+    ]
+    check_against_brute_force()
+
+    t0 = time.perf_counter()
+    pages = [PageWords.from_page(p, split_newlines=False) for p in json_data["analyzeResult"]["pages"]]
+    t_load = time.perf_counter() - t0
+
+    # หาของในหน้า: ไล่ทุกตาราง (แบบ paragraphPlot / tableBoundingBox) vs DocumentIndex
+    t0 = time.perf_counter()
+    for pnum in range(1, n_pages + 1):
+        [t for t in json_data["analyzeResult"]["tables"] if any(br["pageNumber"] == pnum for br in t["boundingRegions"])]
+    t_scan_page = time.perf_counter() - t0
+    doc = DocumentIndex(json_data)
+    t0 = time.perf_counter()
+    for pnum in range(1, n_pages + 1):
+        doc.regions("tables", pnum)
+    t_index_page = time.perf_counter() - t0
+
+    # query สี่เหลี่ยม / nearest ตามจำนวนกล่องในหน้า (ความหนาแน่นคงที่ หน้าใหญ่ขึ้นตามจำนวน)
+    scaling = []
+    for n in (words_per_page, 10 * words_per_page, 100 * words_per_page):
+        side = 10 * (n / words_per_page) ** 0.5
+        xy = np.array([(rng.uniform(0, side), rng.uniform(0, side)) for _ in range(n)])
+        index = PageIndex(np.hstack([xy, xy + [[0.25, 0.2]]]))
+        queries = list(_random_queries(index, n_queries, rng, 0.5))
+        timings = []
+        for fn in (lambda q: _brute_rect(index.boxes, *q), lambda q: index.query_rect(*q),
+                   lambda q: index.nearest(q[0], q[1], 3)):
+            t0 = time.perf_counter()
+            for q in queries:
+                fn(q)
+            timings.append((time.perf_counter() - t0) / n_queries * 1e6)
+        scaling.append((n, *timings))
+
+    # คำที่อยู่ในตาราง ทั้งเอกสาร (สร้าง index ของคำในเวลาที่วัดด้วย)
+    t0 = time.perf_counter()
+    in_tables = sum(int(doc.table_word_mask(words, i + 1).sum()) for i, words in enumerate(pages))
+    t_mask = time.perf_counter() - t0
+
+    print(f"📊 {n_pages} หน้า x {words_per_page} คำ (โหลด PageWords {t_load:.2f} s)")
+    print(f"  หาตารางของทุกหน้า: ไล่ทุกตาราง {t_scan_page * 1e3:8.1f} ms, DocumentIndex {t_index_page * 1e3:8.1f} ms")
+    print("  ต่อ query (µs):   กล่อง   ไล่ทุกกล่อง   grid rect   grid nearest(k=3)")
+    for n, t_brute, t_grid, t_near in scaling:
+        print(f"               {n:9,} {t_brute:12.1f} {t_grid:11.1f} {t_near:13.1f}")
+    print(f"  คำในตารางทั้งเอกสาร: {in_tables:,} คำใน {t_mask:.3f} s")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,339 @@
+import argparse
+import csv
+import glob
+import importlib.util
+import json
+import os
+import random
+import time
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+HEADER_KINDS = {"columnHeader"}
+RECORD_FIELDS = [
+    "doc_id", "table_id", "page_number", "row_index", "column_index",
+    "row_span", "column_span", "is_header", "kind", "content",
+]
+OUTPUT_PATH = "LineManagements/Data/tables.csv"
+CONTINUE_MARGIN = 0.25  # ตารางต่อข้ามหน้า: ส่วนก่อนจบในช่วงล่างของหน้า และส่วนถัดไปเริ่มในช่วงบน (สัดส่วนความสูงหน้า)
+
+
+class GridCell(NamedTuple):
+    row: int
+    column: int
+    row_span: int
+    column_span: int
+    kind: str
+    content: str
+    page_number: Optional[int]
+
+
+class TableGrid(NamedTuple):
+    """
+    ตารางหนึ่งตาราง (อาจรวมจากหลายตารางของ analyzeResult ที่ต่อกันข้ามหน้า)
+    rows: ข้อความทุกตำแหน่งในตาราง ช่องที่ถูก span ครอบได้ข้อความของช่องต้นทาง (ถ้า fill_spans)
+    cells: เฉพาะช่องต้นทางพร้อม span / ชนิด / หน้า (ใช้ export)
+    """
+    table_id: int
+    sources: List[int]          # index ของตารางใน analyzeResult["tables"] ที่รวมมา
+    pages: List[int]
+    row_count: int
+    column_count: int
+    header_rows: int            # จำนวนแถวหัวตารางด้านบน (ช่อง kind = columnHeader)
+    top: Optional[float]        # ขอบบนในหน้าแรก / ขอบล่างในหน้าสุดท้าย แบบ normalize (None: ไม่รู้ความสูงหน้า)
+    bottom: Optional[float]
+    rows: List[List[str]]
+    cells: List[GridCell]
+
+
+# -------------------------------
+#  สร้างตารางจาก cells (รองรับ rowSpan / columnSpan)
+# -------------------------------
+def _cell_page(cell) -> Optional[int]:
+    pages = [br["pageNumber"] for br in cell.get("boundingRegions", []) if "pageNumber" in br]
+    return min(pages) if pages else None
+
+
+def _extent(table, page_heights: dict) -> Tuple[Optional[float], Optional[float]]:
+    """(ขอบบนในหน้าแรก, ขอบล่างในหน้าสุดท้าย) ของ boundingRegions แบบ normalize"""
+    regions = [br for br in table.get("boundingRegions", []) if br.get("pageNumber") in page_heights]
+    if not regions:
+        return None, None
+    first = min(regions, key=lambda br: br["pageNumber"])
+    last = max(regions, key=lambda br: br["pageNumber"])
+    return (min(first["polygon"][1::2]) / page_heights[first["pageNumber"]],
+            max(last["polygon"][1::2]) / page_heights[last["pageNumber"]])
+
+
+def build_grid(table, table_id: int = 0, source: int = 0, fill_spans: bool = True,
+               page_heights: dict = None) -> TableGrid:
+    """
+    วางทุกช่องตาม rowIndex / columnIndex ขยายตาม rowSpan / columnSpan
+    ขนาดตารางขยายเองถ้าช่องเกิน rowCount / columnCount ที่ประกาศไว้
+    page_heights: {pageNumber: height} ใช้หาตำแหน่งบน/ล่างของตารางสำหรับรวมตารางข้ามหน้า
+    """
+    cells = [
+        GridCell(c.get("rowIndex", 0), c.get("columnIndex", 0), max(c.get("rowSpan", 1), 1),
+                 max(c.get("columnSpan", 1), 1), c.get("kind", "content"), c.get("content", ""), _cell_page(c))
+        for c in table.get("cells", [])
+    ]
+    n_rows = max([table.get("rowCount", 0)] + [c.row + c.row_span for c in cells])
+    n_cols = max([table.get("columnCount", 0)] + [c.column + c.column_span for c in cells])
+
+    rows = [["" for _ in range(n_cols)] for _ in range(n_rows)]
+    for c in cells:
+        if fill_spans:
+            for r in range(c.row, c.row + c.row_span):
+                rows[r][c.column:c.column + c.column_span] = [c.content] * c.column_span
+        else:
+            rows[c.row][c.column] = c.content
+
+    header_rows = 0
+    header_cells = {c.row for c in cells if c.kind in HEADER_KINDS}
+    body_cells = {c.row for c in cells if c.kind not in HEADER_KINDS}
+    while header_rows in header_cells and header_rows not in body_cells:
+        header_rows += 1
+
+    pages = sorted({br["pageNumber"] for br in table.get("boundingRegions", [])} |
+                   {c.page_number for c in cells if c.page_number is not None})
+    top, bottom = _extent(table, page_heights or {})
+    return TableGrid(table_id, [source], pages, n_rows, n_cols, header_rows, top, bottom, rows, cells)
+
+
+# -------------------------------
+#  รวมตารางที่ต่อข้ามหน้า
+# -------------------------------
+def is_continuation(prev: TableGrid, cur: TableGrid) -> bool:
+    """
+    cur เป็นส่วนต่อของ prev เมื่อ: เริ่มหน้าถัดจากหน้าสุดท้ายของ prev, จำนวนคอลัมน์เท่ากัน,
+    prev จบใกล้ท้ายหน้าและ cur เริ่มใกล้หัวหน้า (ถ้ารู้ตำแหน่ง)
+    และ cur ไม่มีหัวตาราง หรือหัวตารางซ้ำกับของ prev (หัวพิมพ์ซ้ำทุกหน้า)
+    """
+    if not prev.pages or not cur.pages or cur.pages[0] != prev.pages[-1] + 1:
+        return False
+    if cur.column_count != prev.column_count:
+        return False
+    if prev.bottom is not None and prev.bottom < 1 - CONTINUE_MARGIN:
+        return False
+    if cur.top is not None and cur.top > CONTINUE_MARGIN:
+        return False
+    return cur.header_rows == 0 or cur.rows[:cur.header_rows] == prev.rows[:prev.header_rows]
+
+
+def _append(prev: TableGrid, cur: TableGrid) -> TableGrid:
+    """ต่อแถวของ cur ท้าย prev (ตัดหัวตารางที่ซ้ำทิ้ง) เลื่อน row ของช่องตามจำนวนแถวเดิม"""
+    skip = cur.header_rows
+    offset = prev.row_count - skip
+    cells = prev.cells + [c._replace(row=c.row + offset) for c in cur.cells if c.row >= skip]
+    return prev._replace(
+        sources=prev.sources + cur.sources,
+        pages=sorted(set(prev.pages) | set(cur.pages)),
+        row_count=prev.row_count + cur.row_count - skip,
+        bottom=cur.bottom,
+        rows=prev.rows + cur.rows[skip:],
+        cells=cells,
+    )
+
+
+def document_tables(json_data, merge: bool = True, fill_spans: bool = True) -> List[TableGrid]:
+    """ทุกตารางในเอกสารตามลำดับ ตารางที่ต่อข้ามหน้ารวมเป็นตารางเดียว (table_id นับใหม่หลังรวม)"""
+    analyze = json_data["analyzeResult"]
+    page_heights = {p["pageNumber"]: p["height"] for p in analyze.get("pages", []) if p.get("height")}
+    out: List[TableGrid] = []
+    for i, table in enumerate(analyze.get("tables", [])):
+        grid = build_grid(table, len(out), i, fill_spans, page_heights)
+        if merge and out and is_continuation(out[-1], grid):
+            out[-1] = _append(out[-1], grid)
+        else:
+            out.append(grid)
+    return out
+
+
+# -------------------------------
+#  Export แบบ long format (ช่องละแถว) ลง CSV หรือ Parquet ทีละเอกสาร
+# -------------------------------
+def table_records(doc_id: str, grid: TableGrid) -> Iterator[dict]:
+    for c in grid.cells:
+        yield {
+            "doc_id": doc_id,
+            "table_id": grid.table_id,
+            "page_number": c.page_number,
+            "row_index": c.row,
+            "column_index": c.column,
+            "row_span": c.row_span,
+            "column_span": c.column_span,
+            "is_header": c.row < grid.header_rows,
+            "kind": c.kind,
+            "content": c.content,
+        }
+
+
+class CsvTableWriter:
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._f = open(path, "w", encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(self._f, fieldnames=RECORD_FIELDS)
+        self._writer.writeheader()
+
+    def write(self, records: List[dict]):
+        self._writer.writerows(records)
+
+    def close(self):
+        self._f.close()
+
+
+class ParquetTableWriter:
+    """เขียน row group ละเอกสาร (pyarrow import เมื่อใช้เท่านั้น ไม่บังคับให้ทุกคนที่ import โมดูลต้องมี)"""
+
+    def __init__(self, path: str):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self._pa = pa
+        self._schema = pa.schema([
+            ("doc_id", pa.string()), ("table_id", pa.int32()), ("page_number", pa.int32()),
+            ("row_index", pa.int32()), ("column_index", pa.int32()), ("row_span", pa.int32()),
+            ("column_span", pa.int32()), ("is_header", pa.bool_()), ("kind", pa.string()), ("content", pa.string()),
+        ])
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write(self, records: List[dict]):
+        if records:
+            self._writer.write_table(self._pa.Table.from_pylist(records, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+
+def open_writer(path: str):
+    """เลือกตามนามสกุล: .parquet -> ParquetTableWriter (ต้องมี pyarrow), อื่น ๆ -> CSV"""
+    if path.lower().endswith(".parquet"):
+        try:
+            return ParquetTableWriter(path)
+        except ImportError as e:
+            raise ImportError(f"เขียน {path} ต้องมี pyarrow (pip install pyarrow) หรือใช้ไฟล์ .csv แทน") from e
+    return CsvTableWriter(path)
+
+
+def find_inputs(inputs: Iterable[str]) -> Iterator[str]:
+    """ไฟล์ .json ตามที่ให้มา โฟลเดอร์ไล่หา *.json ข้างใน (เรียงชื่อ)"""
+    for path in inputs:
+        if os.path.isdir(path):
+            yield from sorted(glob.glob(os.path.join(path, "**", "*.json"), recursive=True))
+        else:
+            yield path
+
+
+def doc_id_for(path: str) -> str:
+    name = os.path.basename(path)
+    return name[:-len(".pdf.json")] if name.endswith(".pdf.json") else os.path.splitext(name)[0]
+
+
+def export_tables(paths: Iterable[str], output_path: str = OUTPUT_PATH, merge: bool = True) -> Tuple[int, int, int]:
+    """
+    อ่านทีละไฟล์ (ในหน่วยความจำครั้งละเอกสารเดียว) แล้วเขียนช่องของทุกตารางต่อท้าย output
+    ไฟล์ที่ไม่มี analyzeResult ข้าม (แจ้งทางหน้าจอ) ไม่นับเป็นเอกสาร
+    export เฉพาะช่องต้นทางพร้อม row_span / column_span ไม่เติมช่องที่ถูกครอบซ้ำ
+    คืน (จำนวนเอกสาร, ตาราง, ช่อง)
+    """
+    writer = open_writer(output_path)
+    n_docs = n_tables = n_cells = 0
+    try:
+        for path in paths:
+            with open(path, "r", encoding="utf-8") as f:
+                json_data = json.load(f)
+            if not isinstance(json_data, dict) or "analyzeResult" not in json_data:
+                # json ที่ไม่ใช่ผล OCR (Document Intelligence) ในโฟลเดอร์ input
+                print(f"⏭️  ข้าม {path}: ไม่มี analyzeResult")
+                continue
+            doc_id = doc_id_for(path)
+            records = []
+            for grid in document_tables(json_data, merge):
+                records.extend(table_records(doc_id, grid))
+                n_tables += 1
+            del json_data
+            writer.write(records)
+            n_docs += 1
+            n_cells += len(records)
+    finally:
+        writer.close()
+    return n_docs, n_tables, n_cells
+
+
+# -------------------------------
+#  ตารางสังเคราะห์: span, หัวตารางซ้ำทุกหน้า, ตารางต่อข้ามหน้า
+# -------------------------------
+def make_synthetic_tables(n_tables: int = 20, seed: int = 0) -> dict:
+    """
+    analyzeResult ที่มีแต่ tables: ตารางละ 2 หน้า (หน้าที่สองพิมพ์หัวซ้ำ) หัวตารางแถวแรกมีช่อง columnSpan
+    และคอลัมน์แรกมีช่อง rowSpan ส่วนแรกยาวถึงท้ายหน้า ส่วนที่สองจบกลางหน้า (ตารางถัดไปจึงไม่ใช่ส่วนต่อ)
+    """
+    rng = random.Random(seed)
+    tables, pages = [], []
+    for t in range(n_tables):
+        for part in range(2):
+            pnum = 2 * t + part + 1
+            pages.append({"pageNumber": pnum, "width": 8.5, "height": 11, "words": []})
+            n_rows = rng.randint(3, 12)
+            bottom = 10.5 if part == 0 else 5.0
+            cells = [
+                {"kind": "columnHeader", "rowIndex": 0, "columnIndex": 0, "columnSpan": 2, "content": "รายการ"},
+                {"kind": "columnHeader", "rowIndex": 0, "columnIndex": 2, "content": "จำนวนเงิน"},
+            ]
+            r = 1
+            while r < n_rows:
+                span = min(rng.choice((1, 1, 2)), n_rows - r)
+                cells.append({"rowIndex": r, "columnIndex": 0, "rowSpan": span, "content": f"หมวด {t}-{part}-{r}"})
+                for k in range(span):
+                    cells.append({"rowIndex": r + k, "columnIndex": 1, "content": f"ข้อ {r + k}"})
+                    cells.append({"rowIndex": r + k, "columnIndex": 2, "content": f"{rng.randint(1, 999)},000"})
+                r += span
+            for cell in cells:
+                cell["boundingRegions"] = [{"pageNumber": pnum, "polygon": [1, 1, 2, 1, 2, 2, 1, 2]}]
+            tables.append({"rowCount": n_rows, "columnCount": 3, "cells": cells,
+                           "boundingRegions": [{"pageNumber": pnum, "polygon": [0.5, 0.5, 8, 0.5, 8, bottom, 0.5, bottom]}]})
+    return {"analyzeResult": {"pages": pages, "tables": tables}}
+
+
+def benchmark(n_docs: int = 200, tables_per_doc: int = 20, root: str = "LineManagements/Data/table_benchmark"):
+    import shutil
+    shutil.rmtree(root, ignore_errors=True)
+    os.makedirs(root)
+    for i in range(n_docs):
+        with open(os.path.join(root, f"doc_{i:04d}.pdf.json"), "w", encoding="utf-8") as f:
+            json.dump(make_synthetic_tables(tables_per_doc, seed=i), f, ensure_ascii=False)
+
+    grids = document_tables(make_synthetic_tables(tables_per_doc))
+    assert len(grids) == tables_per_doc, "ตารางต่อข้ามหน้าควรรวมเหลือเอกสารละ tables_per_doc ตาราง"
+    assert all(g.rows[0] == ["รายการ", "รายการ", "จำนวนเงิน"] and g.header_rows == 1 for g in grids)
+
+    formats = [".csv"]
+    if importlib.util.find_spec("pyarrow"):
+        formats.append(".parquet")
+    else:
+        print("⏭️  ไม่มี pyarrow ข้าม Parquet")
+    print(f"📊 export ตาราง {n_docs} เอกสาร x {2 * tables_per_doc} ตาราง (ก่อนรวมข้ามหน้า)")
+    for ext in formats:
+        out = os.path.join(root, "tables" + ext)
+        t0 = time.perf_counter()
+        n, n_tables, n_cells = export_tables(find_inputs([root]), out)
+        elapsed = time.perf_counter() - t0
+        print(f"  {ext:<9} {elapsed:6.2f} s  {n / elapsed:7.1f} เอกสาร/s  {n_cells / elapsed:10,.0f} ช่อง/s  "
+              f"ตาราง {n_tables:,}  ไฟล์ {os.path.getsize(out) / 1e6:.1f} MB")
+    shutil.rmtree(root, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ดึงตารางจาก analyzeResult หลายไฟล์ลง Parquet / CSV")
+    parser.add_argument("inputs", nargs="*", default=["LineManagements/Data"], help="ไฟล์ .json หรือโฟลเดอร์")
+    parser.add_argument("--output", default=OUTPUT_PATH, help="นามสกุล .parquet (ต้องมี pyarrow) หรือ .csv")
+    parser.add_argument("--no-merge", action="store_true", help="ไม่รวมตารางที่ต่อข้ามหน้า")
+    parser.add_argument("--benchmark", action="store_true")
+    args = parser.parse_args(argv)
+    if args.benchmark:
+        return benchmark()
+    n_docs, n_tables, n_cells = export_tables(find_inputs(args.inputs), args.output, not args.no_merge)
+    print(f"✅ {n_docs} เอกสาร, {n_tables} ตาราง, {n_cells} ช่อง -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
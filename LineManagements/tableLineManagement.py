@@ -1,6 +1,7 @@
 import json
-from pythainlp.tag import pos_tag
-from pythainlp.tokenize import word_tokenize
+from pageParallel import POS_EXCLUDE
+from tableGrid import document_tables
+from thaiTagger import CACHE_PATH, ThaiTagger
 
 # โหลดไฟล์ JSON
 with open("LineManagements/Data/meeting_executive4_66.pdf.json", "r", encoding="utf-8") as f:
@@ -11,30 +12,19 @@ output_tables = []
 total_words = 0
 total_words_filtered = 0
 
-for table_idx, table in enumerate(json_data["analyzeResult"]["tables"]):
-    row_count = table.get("rowCount", 0)
-    col_count = table.get("columnCount", 0)
+# cell ที่ซ้ำ (หัวตาราง / "-" / ชื่อตำแหน่ง) ตัดคำครั้งเดียว และ cache ใช้ต่อข้ามรอบการรัน
+tagger = ThaiTagger(cache_path=CACHE_PATH)
 
-    # สร้าง list ของ row
-    table_rows = [["" for _ in range(col_count)] for _ in range(row_count)]
+# ตารางตาม rowIndex / columnIndex ขยายตาม rowSpan / columnSpan ตารางที่ต่อข้ามหน้ารวมเป็นตารางเดียว (tableGrid)
+for grid in document_tables(json_data):
+    # นับคำช่องละครั้ง (ไม่นับช่องที่ถูก span ครอบ และหัวตารางที่พิมพ์ซ้ำในหน้าต่อ) ตัดคำ + POS ทั้งตารางเป็น batch เดียว
+    for tags in tagger.tag_batch(cell.content for cell in grid.cells):
+        total_words += len(tags)
+        total_words_filtered += sum(1 for word, tag in tags if tag not in POS_EXCLUDE)
 
-    for cell in table["cells"]:
-        row_idx = cell.get("rowIndex", 0)
-        col_idx = cell.get("columnIndex", 0)
-        content = cell.get("content", "")
+    output_tables.append(grid.rows)
 
-        # เก็บลงตาราง
-        table_rows[row_idx][col_idx] = content
-
-        # นับคำเหมือนเดิม
-        tokens = word_tokenize(content, keep_whitespace=False)
-        tags = pos_tag(tokens, engine="perceptron", corpus="orchid")
-        filtered_tokens = [word for word, tag in tags if tag not in ["NPRP", "NTTL"]]
-
-        total_words += len(tokens)
-        total_words_filtered += len(filtered_tokens)
-
-    output_tables.append(table_rows)
+tagger.save()
 
 # แสดงผล table
 for t_idx, table_rows in enumerate(output_tables):
@@ -44,6 +34,7 @@ for t_idx, table_rows in enumerate(output_tables):
 
 print(f"\nจำนวนคำทั้งหมดก่อนคัดกรอง: {total_words}")
 print(f"จำนวนคำทั้งหมดหลังคัดกรอง: {total_words_filtered}")
+print(f"token {tagger.stats()}")
 
 # บันทึกเป็นไฟล์ text
 with open("LineManagements/Data/report_Table_Output.txt", "w", encoding="utf-8") as out_file:
@@ -0,0 +1,72 @@
+import os
+import warnings
+from functools import lru_cache
+from typing import List, Optional
+
+from matplotlib import font_manager as fm
+
+FONT_ENV = "THAI_FONT_PATH"  # path ฟอนต์ที่ต้องการ (หลายไฟล์คั่นด้วย os.pathsep) มาก่อนทุก path ด้านล่าง
+REPO_FONT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ScrapingData", "fonts", "Sarabun-Regular.ttf")
+FONT_PATHS = [
+    REPO_FONT,
+    "C:/Windows/Fonts/tahoma.ttf",
+    "/usr/share/fonts/truetype/tlwg/Garuda.ttf",
+    "/usr/share/fonts/truetype/tlwg/Loma.ttf",
+    "/usr/share/fonts/truetype/noto/NotoSansThai-Regular.ttf",
+    "/usr/share/fonts/opentype/noto/NotoSansThai-Regular.ttf",
+    "/System/Library/Fonts/Supplemental/Tahoma.ttf",
+]
+THAI_FAMILIES = ("Sarabun", "TH Sarabun New", "Tahoma", "Garuda", "Loma", "Noto Sans Thai", "Leelawadee UI")
+
+
+def font_candidates() -> List[str]:
+    env = os.environ.get(FONT_ENV, "")
+    return [p for p in env.split(os.pathsep) if p] + FONT_PATHS
+
+
+def resolve_font_path(candidates: List[str] = None) -> Optional[str]:
+    """
+    ไฟล์ฟอนต์ไทยไฟล์แรกที่มีอยู่จริงตามลำดับ candidates (ค่าเริ่มต้น: THAI_FONT_PATH แล้วค่อย FONT_PATHS)
+    ถ้าไม่มีสักไฟล์ ลองหาจากฟอนต์ที่ matplotlib รู้จักตามชื่อ family ใน THAI_FAMILIES
+    """
+    for path in candidates if candidates is not None else font_candidates():
+        if os.path.isfile(path):
+            return os.path.abspath(path)
+    known = {f.name: f.fname for f in fm.fontManager.ttflist}
+    for family in THAI_FAMILIES:
+        if family in known:
+            return known[family]
+    return None
+
+
+@lru_cache(maxsize=1)
+def _cached_font(path: Optional[str]) -> fm.FontProperties:
+    if path is None:
+        warnings.warn(f"ไม่พบฟอนต์ภาษาไทย (ตั้ง {FONT_ENV} ได้) ใช้ฟอนต์เริ่มต้นของ matplotlib แทน")
+        return fm.FontProperties()
+    # addfont ให้ใช้ชื่อ family ได้ด้วย, get_font โหลดไฟล์ (FT2Font) เข้า cache ของ matplotlib ครั้งเดียวต่อ process
+    fm.fontManager.addfont(path)
+    fm.get_font(path)
+    return fm.FontProperties(fname=path)
+
+
+_font_path: Optional[str] = None
+_resolved = False
+
+
+def use_font_path(path: Optional[str]):
+    """กำหนดไฟล์ฟอนต์ของ process นี้โดยไม่ต้องค้นหา (ใช้เป็น initializer ของ worker ด้วย path ที่ process หลักหาได้แล้ว)"""
+    global _font_path, _resolved
+    _font_path, _resolved = path, True
+
+
+def thai_font_path() -> Optional[str]:
+    """path ฟอนต์ของ process นี้ ค้นหาครั้งแรกครั้งเดียว"""
+    if not _resolved:
+        use_font_path(resolve_font_path())
+    return _font_path
+
+
+def get_thai_font() -> fm.FontProperties:
+    """FontProperties ของฟอนต์ไทย สร้างครั้งเดียวต่อ process (worker ที่ fork มาได้ของที่ process หลักโหลดแล้วไปด้วย)"""
+    return _cached_font(thai_font_path())
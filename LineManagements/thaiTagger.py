@@ -0,0 +1,231 @@
+import json
+import os
+import random
+import time
+from collections import OrderedDict
+from typing import Iterable, List, Tuple
+
+DEFAULT_MAXSIZE = 200_000
+# แยกจาก Data (โฟลเดอร์ input ผล OCR) ไม่ให้ไปปนกับไฟล์ที่ต้องอ่าน
+CACHE_PATH = "LineManagements/Cache/token_cache.json"
+
+Tags = List[Tuple[str, str]]
+
+
+class ThaiTagger:
+    """
+    ตัดคำ (word_tokenize) + POS tag (pos_tag) แบบเป็น batch พร้อม cache
+      - ข้อความซ้ำใน batch เดียวกันทำครั้งเดียว
+      - ผลเก็บใน LRU (จำกัดจำนวน) key = (text, engine) engine รวมชื่อ tokenizer / POS engine / corpus
+      - save() / load() เก็บ cache ลงไฟล์ JSON ใช้ข้ามรอบการรันได้ (รายการของ engine อื่นในไฟล์เดียวกันถูกเก็บไว้ตามเดิม)
+    ผลที่คืนเป็น object เดียวกับที่อยู่ใน cache ห้ามแก้ไข
+    """
+
+    def __init__(self, engine: str = "newmm", pos_engine: str = "perceptron", corpus: str = "orchid",
+                 maxsize: int = DEFAULT_MAXSIZE, cache_path: str = None):
+        self.engine = engine
+        self.pos_engine = pos_engine
+        self.corpus = corpus
+        self.key_engine = f"{engine}+{pos_engine}/{corpus}"
+        self.maxsize = maxsize
+        self.cache_path = cache_path
+        self._cache: "OrderedDict[Tuple[str, str], Tags]" = OrderedDict()
+        self._new: List[Tuple[str, Tags]] = []
+        self._other_entries: list = []  # [engine, text, tags] ของ engine อื่นที่อ่านจากไฟล์ เขียนกลับตอน save
+        self.hits = 0
+        self.misses = 0
+        self._word_tokenize = None
+        self._pos_tag_sents = None
+        if cache_path:
+            self.load()
+
+    def _load_models(self):
+        if self._pos_tag_sents is not None:
+            return
+        from pythainlp.tag import pos_tag_sents
+        from pythainlp.tokenize import word_tokenize
+        self._word_tokenize, self._pos_tag_sents = word_tokenize, pos_tag_sents
+
+    def warm_up(self):
+        """โหลด dictionary / perceptron model ไว้ก่อน (เช่นใน initializer ของ worker)"""
+        self._load_models()
+        self._compute(["ที่ประชุม"])
+
+    def _compute(self, texts: List[str]) -> List[Tags]:
+        self._load_models()
+        sents = [self._word_tokenize(t, keep_whitespace=False) for t in texts]
+        return [list(tags) for tags in self._pos_tag_sents(sents, engine=self.pos_engine, corpus=self.corpus)]
+
+    def _put(self, key, tags: Tags):
+        self._cache[key] = tags
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+
+    def tag_batch(self, texts: Iterable[str]) -> List[Tags]:
+        """คืน list ของ [(word, tag), ...] ตามลำดับ texts"""
+        texts = list(texts)
+        found = {}
+        missing = []
+        for text in dict.fromkeys(texts):
+            key = (text, self.key_engine)
+            tags = self._cache.get(key)
+            if tags is None:
+                missing.append(text)
+            else:
+                self._cache.move_to_end(key)
+                found[text] = tags
+        if missing:
+            for text, tags in zip(missing, self._compute(missing)):
+                self._put((text, self.key_engine), tags)
+                self._new.append((text, tags))
+                found[text] = tags
+
+        self.misses += len(missing)
+        self.hits += len(texts) - len(missing)
+        return [found[t] for t in texts]
+
+    def tag(self, text: str) -> Tags:
+        return self.tag_batch([text])[0]
+
+    def take_new_entries(self) -> List[Tuple[str, Tags]]:
+        """ผลที่คำนวณใหม่ตั้งแต่เรียกครั้งก่อน (worker ส่งกลับให้ process หลักรวมเข้า cache ก่อน save)"""
+        entries, self._new = self._new, []
+        return entries
+
+    def merge(self, entries: Iterable[Tuple[str, Tags]]):
+        for text, tags in entries:
+            self._put((text, self.key_engine), tags)
+
+    def clear(self):
+        self._cache.clear()
+        self._new = []
+        self.hits = self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> str:
+        return (f"cache {len(self._cache):,}/{self.maxsize:,} รายการ, "
+                f"hit {self.hits:,} / miss {self.misses:,} ({self.hit_rate:.1%})")
+
+    def load(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  อ่าน token cache ไม่ได้ ({self.cache_path}): {e}")
+            return
+        self._other_entries = []
+        for entry in data.get("entries", []):
+            engine, text, tags = entry
+            if engine == self.key_engine:
+                self._put((text, engine), [tuple(t) for t in tags])
+            else:
+                self._other_entries.append(entry)
+
+    def save(self):
+        """
+        เขียน cache ทั้งหมด (เรียงจากเก่าไปใหม่ตามลำดับ LRU) แบบเขียนไฟล์ชั่วคราวแล้ว replace
+        รายการของ engine อื่นที่ load() อ่านมาเขียนกลับไว้ก่อน ไม่หายเพราะรันด้วย engine เดียว
+        """
+        if not self.cache_path:
+            return
+        os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+        tmp = self.cache_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            entries = self._other_entries + [[e, t, tags] for (t, e), tags in self._cache.items()]
+            json.dump({"entries": entries}, f, ensure_ascii=False)
+        os.replace(tmp, self.cache_path)
+
+
+# -------------------------------
+#  Benchmark: เรียกทีละข้อความ (แบบเดิม) vs ThaiTagger ตอน cache ว่าง / โหลด cache จากรอบก่อน
+# -------------------------------
+_ROLES = ["ประธานกรรมการ", "รองประธานกรรมการ", "กรรมการ", "กรรมการและเลขานุการ", "กรรมการและผู้ช่วยเลขานุการ"]
+_BOILERPLATE = [
+    "รายงานการประชุมคณะกรรมการกำกับกิจการพลังงาน", "ผู้มาประชุม", "ผู้ไม่มาประชุม", "ผู้เข้าร่วมประชุม",
+    "เริ่มประชุมเวลา 13.30 น.", "สรุปสาระสำคัญ", "มติของที่ประชุม", "ที่ประชุมรับทราบ", "ลำดับ", "รายการ", "หมายเหตุ", "-",
+]
+_BODY_WORDS = [
+    "ที่ประชุม", "ได้", "พิจารณา", "เรื่อง", "การ", "กำหนด", "อัตรา", "เงิน", "ส่งเข้า", "กองทุน",
+    "น้ำมัน", "เชื้อเพลิง", "เห็นชอบ", "ตามที่", "สำนักงาน", "นโยบาย", "และ", "แผน", "พลังงาน", "เสนอ",
+]
+
+
+def sample_strings(path_glob: str = "LineManagements/Data/*.json", n_pages: int = 100, seed: int = 0) -> List[str]:
+    """
+    ข้อความที่ต้องตัดคำจากรายงานตัวอย่าง: บรรทัดที่จัดแล้ว + content ของ cell ในตาราง
+    ถ้าไม่มีไฟล์ตัวอย่าง สร้างรายงานสังเคราะห์ที่มีหัวกระดาษ / บทบาท / cell ซ้ำแบบเอกสารจริง
+    """
+    import glob
+    texts = []
+    paths = sorted(glob.glob(path_glob))  # ไฟล์ที่ไม่มี analyzeResult ไม่มีผล
+    if paths:
+        from lineClustering import group_lines_by_threshold
+        from pageParallel import line_text
+        from wordBoxes import PageWords
+        for path in paths:
+            with open(path, "r", encoding="utf-8") as f:
+                result = json.load(f).get("analyzeResult", {})
+            for page in result.get("pages", []):
+                words = PageWords.from_page(page, split_newlines=False)
+                for line in group_lines_by_threshold(words):
+                    texts.append(line_text(words, line, words.poly_center_x).replace("_", " "))
+            for table in result.get("tables", []):
+                texts.extend(cell.get("content", "") for cell in table["cells"])
+        return texts
+
+    rng = random.Random(seed)
+    for page in range(n_pages):
+        texts.append(_BOILERPLATE[0])
+        texts.append(f"ครั้งที่ {page // 10 + 1}/2567")
+        for _ in range(rng.randint(3, 8)):
+            texts.append(f"ผู้แทนสำนักงานนโยบายและแผนพลังงาน {rng.choice(_ROLES)}")
+        for _ in range(30):
+            texts.append(" ".join(rng.choice(_BODY_WORDS) for _ in range(rng.randint(4, 14))))
+        for _ in range(40):  # cell ตาราง ส่วนใหญ่เป็นค่าซ้ำ
+            texts.append(rng.choice(_BOILERPLATE + _ROLES + [str(rng.randint(1, 20))]))
+    return texts
+
+
+def benchmark(cache_path: str = "LineManagements/Cache/token_cache_benchmark.json", batch_size: int = 64):
+    from pythainlp.tag import pos_tag
+    from pythainlp.tokenize import word_tokenize
+
+    texts = sample_strings()
+    ThaiTagger().warm_up()  # โหลด model ก่อนจับเวลาทุกแบบ
+    if os.path.exists(cache_path):
+        os.remove(cache_path)
+
+    t0 = time.perf_counter()
+    expected = [pos_tag(word_tokenize(t, keep_whitespace=False), engine="perceptron", corpus="orchid") for t in texts]
+    t_plain = time.perf_counter() - t0
+
+    def run():
+        tagger = ThaiTagger(cache_path=cache_path)
+        t0 = time.perf_counter()
+        out = []
+        for i in range(0, len(texts), batch_size):
+            out.extend(tagger.tag_batch(texts[i:i + batch_size]))
+        elapsed = time.perf_counter() - t0
+        tagger.save()
+        assert out == expected, "ผลไม่ตรงกับการเรียกทีละข้อความ"
+        return tagger, elapsed
+
+    cold, t_cold = run()
+    warm, t_warm = run()
+    os.remove(cache_path)
+
+    print(f"📊 {len(texts):,} ข้อความ ({len(set(texts)):,} ไม่ซ้ำ), batch ละ {batch_size}")
+    print(f"  ทีละข้อความ (เดิม):       {t_plain:7.2f} s")
+    print(f"  ThaiTagger cache ว่าง:     {t_cold:7.2f} s  ({t_plain / t_cold:5.1f}x)  {cold.stats()}")
+    print(f"  ThaiTagger โหลด cache:     {t_warm:7.2f} s  ({t_plain / t_warm:5.1f}x)  {warm.stats()}")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,218 @@
+import argparse
+import csv
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Optional, Tuple
+
+ENGINES = [
+    "newmm", "longest", "multi_cut", "attacut",
+    "deepcut", "mm", "nercut", "newmm-safe",
+]
+CORPUS_PATH = "Data/output_1_new.txt"
+REF_SEPARATOR = "|"  # บรรทัดใน corpus ที่มี '|' ถือเป็นการตัดคำอ้างอิง (แบบ BEST corpus)
+CSV_FIELDS = [
+    "engine", "status", "error", "lines", "chars", "load_s", "tokenize_s", "lines_per_s", "chars_per_s",
+    "peak_rss_mb", "model_rss_mb", "tokens", "boundary_precision", "boundary_recall", "boundary_f1", "line_exact",
+]
+
+
+def load_corpus(path: str, max_lines: int = None) -> Tuple[List[str], Optional[List[List[str]]]]:
+    """
+    อ่าน corpus ทีละบรรทัด (ข้ามบรรทัดว่าง)
+    ถ้าทุกบรรทัดมี REF_SEPARATOR คืน (ข้อความที่เอา '|' ออก, คำอ้างอิง) ไม่งั้นคืน (ข้อความ, None)
+    """
+    lines = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                lines.append(line)
+                if max_lines and len(lines) >= max_lines:
+                    break
+    if lines and all(REF_SEPARATOR in line for line in lines):
+        refs = [[t for t in line.split(REF_SEPARATOR) if t] for line in lines]
+        return ["".join(r) for r in refs], refs
+    return lines, None
+
+
+def make_synthetic_corpus(path: str, n_lines: int = 2000, seed: int = 0):
+    """corpus สังเคราะห์แบบมีคำอ้างอิง: ต่อคำจากรายงานประชุมโดยไม่เว้นวรรค คั่นด้วย '|'"""
+    from thaiTagger import _BODY_WORDS, _BOILERPLATE, _ROLES
+    vocab = _BODY_WORDS + [w for w in _BOILERPLATE + _ROLES if " " not in w]
+    rng = random.Random(seed)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for _ in range(n_lines):
+            f.write(REF_SEPARATOR.join(rng.choice(vocab) for _ in range(rng.randint(4, 20))) + "\n")
+
+
+def _boundaries(tokens: List[str]) -> set:
+    """ตำแหน่งตัวอักษรที่มีรอยตัดคำ (ไม่นับท้ายบรรทัด)"""
+    out, pos = set(), 0
+    for tok in tokens[:-1]:
+        pos += len(tok)
+        out.add(pos)
+    return out
+
+
+def agreement(segmented: List[List[str]], reference: List[List[str]]) -> dict:
+    """precision / recall / F1 ของรอยตัดคำเทียบกับ reference + สัดส่วนบรรทัดที่ตัดตรงกันทั้งบรรทัด"""
+    tp = n_pred = n_ref = exact = 0
+    for pred, ref in zip(segmented, reference):
+        b_pred, b_ref = _boundaries(pred), _boundaries(ref)
+        tp += len(b_pred & b_ref)
+        n_pred += len(b_pred)
+        n_ref += len(b_ref)
+        exact += pred == ref
+    precision = tp / n_pred if n_pred else 1.0
+    recall = tp / n_ref if n_ref else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {
+        "boundary_precision": round(precision, 4),
+        "boundary_recall": round(recall, 4),
+        "boundary_f1": round(f1, 4),
+        "line_exact": round(exact / len(reference), 4) if reference else None,
+    }
+
+
+def _peak_rss_mb() -> float:
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _measure(engine: str, corpus_path: str, max_lines: int, repeat: int, tokens_path: str):
+    """
+    รันใน process แยกต่อ engine ให้เวลาโหลด model / หน่วยความจำของแต่ละ engine ไม่ปนกัน
+    พิมพ์ผลเป็น JSON บรรทัดสุดท้าย และเขียนผลตัดคำลง tokens_path ให้ process หลักคิด agreement
+    """
+    texts, _ = load_corpus(corpus_path, max_lines)
+    from pythainlp.tokenize import word_tokenize
+    base_rss = _peak_rss_mb()
+    result = {"engine": engine, "lines": len(texts), "chars": sum(map(len, texts))}
+    try:
+        t0 = time.perf_counter()
+        word_tokenize("ที่ประชุมได้พิจารณา", engine=engine, keep_whitespace=False)
+        result["load_s"] = round(time.perf_counter() - t0, 4)
+    except Exception as e:  # engine ที่ไม่ได้ติดตั้ง (attacut / deepcut / nercut ...) ข้ามไป
+        result.update(status="skipped", error=f"{type(e).__name__}: {e}")
+        print(json.dumps(result, ensure_ascii=False))
+        return
+
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        segmented = [word_tokenize(t, engine=engine, keep_whitespace=False) for t in texts]
+        best = min(best, time.perf_counter() - t0)
+    peak = _peak_rss_mb()
+    result.update(
+        status="ok",
+        tokenize_s=round(best, 4),
+        lines_per_s=round(len(texts) / best, 1) if best else None,
+        chars_per_s=round(result["chars"] / best, 1) if best else None,
+        peak_rss_mb=round(peak, 1),
+        model_rss_mb=round(peak - base_rss, 1),
+        tokens=sum(map(len, segmented)),
+    )
+    with open(tokens_path, "w", encoding="utf-8") as f:
+        json.dump(segmented, f, ensure_ascii=False)
+    print(json.dumps(result, ensure_ascii=False))
+
+
+def run_benchmark(corpus_path: str, engines: List[str] = None, max_lines: int = None, repeat: int = 3,
+                  reference_engine: str = "newmm") -> List[dict]:
+    """
+    วัดทุก engine บน corpus: เวลาโหลด, throughput (บรรทัด/s, ตัวอักษร/s), peak RSS และ agreement
+    reference = คำใน corpus ถ้ามี '|' ไม่งั้นใช้ผลของ reference_engine
+    """
+    engines = engines or ENGINES
+    _, reference = load_corpus(corpus_path, max_lines)
+    here = os.path.dirname(os.path.abspath(__file__))
+    results, segmentations = [], {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for engine in engines:
+            tokens_path = os.path.join(tmp, f"{engine}.json")
+            proc = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--measure", engine, corpus_path,
+                 str(max_lines or 0), str(repeat), tokens_path],
+                capture_output=True, text=True, cwd=os.getcwd(),
+                env={**os.environ, "PYTHONPATH": here},
+            )
+            if proc.returncode != 0:
+                err = (proc.stderr.strip().splitlines() or ["unknown error"])[-1]
+                results.append({"engine": engine, "status": "error", "error": err})
+                continue
+            result = json.loads(proc.stdout.strip().splitlines()[-1])
+            if result["status"] == "ok":
+                with open(tokens_path, "r", encoding="utf-8") as f:
+                    segmentations[engine] = json.load(f)
+            results.append(result)
+
+    if reference is None:
+        reference = segmentations.get(reference_engine)
+    for result in results:
+        if reference is not None and result["engine"] in segmentations:
+            result.update(agreement(segmentations[result["engine"]], reference))
+    return results
+
+
+def write_results(results: List[dict], json_path: str = None, csv_path: str = None):
+    for path in (json_path, csv_path):
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    if csv_path:
+        with open(csv_path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(results)
+
+
+def print_results(results: List[dict]):
+    print(f"{'engine':<11} {'load s':>7} {'lines/s':>9} {'chars/s':>11} {'peak MB':>8} {'model MB':>8} {'F1':>6} {'exact':>6}")
+    for r in results:
+        if r.get("status") != "ok":
+            print(f"{r['engine']:<11} ⏭️  {r['status']}: {r.get('error', '')}")
+            continue
+        f1 = f"{r['boundary_f1']:.3f}" if "boundary_f1" in r else "-"
+        exact = f"{r['line_exact']:.3f}" if "line_exact" in r else "-"
+        print(f"{r['engine']:<11} {r['load_s']:7.3f} {r['lines_per_s']:9,.0f} {r['chars_per_s']:11,.0f} "
+              f"{r['peak_rss_mb']:8.1f} {r['model_rss_mb']:8.1f} {f1:>6} {exact:>6}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="benchmark engine ตัดคำของ pythainlp")
+    parser.add_argument("corpus", nargs="?", default=CORPUS_PATH,
+                        help="ไฟล์ข้อความทีละบรรทัด (ถ้าทุกบรรทัดคั่นคำด้วย '|' ใช้เป็น reference)")
+    parser.add_argument("--engines", default=",".join(ENGINES), help="รายชื่อ engine คั่นด้วย ','")
+    parser.add_argument("--max-lines", type=int, default=None)
+    parser.add_argument("--repeat", type=int, default=3, help="รอบที่จับเวลา (เอาค่าดีที่สุด)")
+    parser.add_argument("--reference-engine", default="newmm", help="reference เมื่อ corpus ไม่มีคำอ้างอิง")
+    parser.add_argument("--json", default="Data/tokenizer_benchmark.json")
+    parser.add_argument("--csv", default="Data/tokenizer_benchmark.csv")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.corpus):
+        print(f"⚠️  ไม่พบ {args.corpus} ใช้ corpus สังเคราะห์แทน")
+        args.corpus = "Data/synthetic_segmentation.txt"
+        make_synthetic_corpus(args.corpus)
+
+    results = run_benchmark(args.corpus, args.engines.split(","), args.max_lines, args.repeat, args.reference_engine)
+    print_results(results)
+    write_results(results, args.json, args.csv)
+    print(f"✅ บันทึกผล: {args.json}, {args.csv}")
+    return results
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 7 and sys.argv[1] == "--measure":
+        _measure(sys.argv[2], sys.argv[3], int(sys.argv[4]) or None, int(sys.argv[5]), sys.argv[6])
+    else:
+        main()
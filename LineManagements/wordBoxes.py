@@ -0,0 +1,172 @@
+import itertools
+import json
+import random
+import time
+import tracemalloc
+
+import numpy as np
+
+from lineClustering import page_word_boxes
+
+
+class PageWords:
+    """
+    คำทั้งหน้าแบบ columnar แทน list ของ dict ต่อคำ
+      - polygons: array (n, 8) พิกัดจริงของหน้า [x1, y1, ..., x4, y4]
+      - min_x / max_x / min_y / max_y / center_x / center_y / height: array (n,) normalize ด้วยขนาดหน้า (0-1)
+      - poly_center_x / poly_center_y: ค่าเฉลี่ยของ 4 มุม (แบบที่ lineManagement ใช้)
+      - content: array ของข้อความ ขนานกับคอลัมน์ด้านบน
+    คำที่ content มี \\n ถูกแตกเป็นหลายแถวที่ใช้กล่องเดียวกัน (เหมือน word box แบบ dict เดิม)
+    """
+
+    def __init__(self, content, polygons: np.ndarray, page_width: float, page_height: float):
+        self.content = np.asarray(content, dtype=object)
+        self.polygons = polygons
+        self.page_width = page_width
+        self.page_height = page_height
+
+        xs = polygons[:, 0::2]
+        ys = polygons[:, 1::2]
+        # min/max ก่อนค่อยหาร ให้ได้ค่าเท่ากับแบบ dict ทุก bit
+        self.min_x = xs.min(axis=1) / page_width
+        self.max_x = xs.max(axis=1) / page_width
+        self.min_y = ys.min(axis=1) / page_height
+        self.max_y = ys.max(axis=1) / page_height
+        self.center_x = (self.min_x + self.max_x) / 2
+        self.center_y = (self.min_y + self.max_y) / 2
+        self.height = self.max_y - self.min_y
+        # บวกเรียงทีละมุมเหมือน sum(x_coords)
+        self.poly_center_x = (((xs[:, 0] + xs[:, 1]) + xs[:, 2]) + xs[:, 3]) / 4 / page_width
+        self.poly_center_y = (((ys[:, 0] + ys[:, 1]) + ys[:, 2]) + ys[:, 3]) / 4 / page_height
+
+    def __len__(self) -> int:
+        return len(self.content)
+
+    def __reduce__(self):
+        # ส่งข้าม process เฉพาะข้อมูลตั้งต้น คอลัมน์ที่เหลือคำนวณใหม่ฝั่งรับ (pickle เล็กลงราว 2 เท่า)
+        return PageWords, (self.content, self.polygons, self.page_width, self.page_height)
+
+    @classmethod
+    def from_page(cls, page, split_newlines: bool = True, style: str = "words") -> "PageWords":
+        """สร้างจาก page ของ Azure analyzeResult (page[style][*]["polygon"] / ["content"], style = words หรือ lines)"""
+        words = page[style]
+        n = len(words)
+        polys = [w["polygon"] for w in words]
+        if all(len(p) == 8 for p in polys):
+            polygons = np.fromiter(itertools.chain.from_iterable(polys), dtype=np.float64, count=8 * n).reshape(n, 8)
+        else:
+            polygons = np.array([_as_quad(p) for p in polys], dtype=np.float64).reshape(n, 8)
+
+        contents = [w["content"] for w in words]
+        if split_newlines and any("\n" in c for c in contents):
+            # แตกคำย่อยจาก \n ให้ใช้กล่องของคำเดิม (คำที่เหลือแต่ช่องว่างหายไปเลย)
+            parts = [[p.strip() for p in c.split("\n") if p.strip()] if "\n" in c else [c] for c in contents]
+            counts = np.fromiter((len(p) for p in parts), dtype=np.intp, count=n)
+            polygons = np.repeat(polygons, counts, axis=0)
+            contents = list(itertools.chain.from_iterable(parts))
+        return cls(contents, polygons, page["width"], page["height"])
+
+    def take(self, idx) -> "PageWords":
+        """เลือกบางแถว (เช่นคำในบรรทัดเดียว) ได้ PageWords ใหม่"""
+        return PageWords(self.content[idx], self.polygons[idx], self.page_width, self.page_height)
+
+    def to_dicts(self):
+        """แปลงกลับเป็น word box แบบ dict (รูปแบบเดียวกับ lineClustering.page_word_boxes)"""
+        cols = zip(
+            self.content.tolist(), self.center_x.tolist(), self.center_y.tolist(),
+            self.min_x.tolist(), self.max_x.tolist(), self.min_y.tolist(), self.max_y.tolist(),
+            self.height.tolist(),
+        )
+        return [
+            {"content": c, "center_x": cx, "center_y": cy, "min_x": x0, "max_x": x1,
+             "min_y": y0, "max_y": y1, "height": h}
+            for c, cx, cy, x0, x1, y0, y1, h in cols
+        ]
+
+
+def _as_quad(polygon):
+    """polygon ที่ไม่ใช่ 4 มุม -> สี่เหลี่ยมครอบ (min/max ไม่เปลี่ยน)"""
+    xs, ys = polygon[::2], polygon[1::2]
+    x0, x1, y0, y1 = min(xs), max(xs), min(ys), max(ys)
+    return [x0, y0, x1, y0, x1, y1, x0, y1]
+
+
+def pages_from_analyze_result(json_data, split_newlines: bool = True):
+    return [PageWords.from_page(p, split_newlines) for p in json_data["analyzeResult"]["pages"]]
+
+
+# -------------------------------
+#  Benchmark: list ของ dict ต่อคำ vs columnar บนไฟล์ analyzeResult 300 หน้า
+# -------------------------------
+def make_synthetic_analyze_result(n_pages: int = 300, words_per_page: int = 600, seed: int = 0):
+    """analyzeResult สังเคราะห์ (หน้า A4 หน่วยนิ้วแบบ Document Intelligence)"""
+    rng = random.Random(seed)
+    width, height = 8.2639, 11.6806
+    pages = []
+    for p in range(n_pages):
+        words = []
+        for k in range(words_per_page):
+            line, col = divmod(k, 20)
+            x0 = 0.7 + col * 0.34 + rng.uniform(0, 0.02)
+            y0 = 0.8 + line * 0.33 + rng.uniform(-0.02, 0.02)
+            x1, y1 = x0 + rng.uniform(0.15, 0.32), y0 + rng.uniform(0.17, 0.22)
+            words.append({
+                "content": "ข้อความ" if rng.random() > 0.01 else "สอง\nบรรทัด",
+                "polygon": [round(v, 4) for v in (x0, y0, x1, y0, x1, y1, x0, y1)],
+                "confidence": 0.99,
+                "span": {"offset": k * 8, "length": 7},
+            })
+        pages.append({"pageNumber": p + 1, "width": width, "height": height, "unit": "inch", "words": words})
+    return {"analyzeResult": {"pages": pages}}
+
+
+def _dict_path(json_data):
+    out = []
+    for page in json_data["analyzeResult"]["pages"]:
+        boxes = page_word_boxes(page)
+        boxes.sort(key=lambda w: w["center_y"])
+        out.append(boxes)
+    return out
+
+
+def _columnar_path(json_data):
+    out = []
+    for words in pages_from_analyze_result(json_data):
+        out.append((words, np.argsort(words.center_y, kind="stable")))
+    return out
+
+
+def benchmark(path: str = None, n_pages: int = 300, words_per_page: int = 600, repeat: int = 3):
+    """ใช้ไฟล์ analyzeResult จริงถ้าให้ path มา ไม่งั้นสร้างไฟล์สังเคราะห์ n_pages หน้า"""
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            json_data = json.load(f)
+    else:
+        json_data = make_synthetic_analyze_result(n_pages, words_per_page)
+    n_pages = len(json_data["analyzeResult"]["pages"])
+    n_words = sum(len(p["words"]) for p in json_data["analyzeResult"]["pages"])
+
+    results = {}
+    for name, fn in (("dict ต่อคำ", _dict_path), ("columnar", _columnar_path)):
+        best = float("inf")
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn(json_data)
+            best = min(best, time.perf_counter() - t0)
+        tracemalloc.start()
+        kept = fn(json_data)  # เก็บผลไว้ทั้งไฟล์เพื่อวัดหน่วยความจำที่ค้างอยู่จริง
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del kept
+        results[name] = (best, current, peak)
+
+    print(f"📊 analyzeResult {n_pages} หน้า ({n_words:,} คำ) แยก word box + sort ตาม center_y")
+    for name, (t, current, peak) in results.items():
+        print(f"  {name:<12} {t:7.3f} s  ({n_words / t:12,.0f} คำ/s)  "
+              f"memory ที่ค้าง {current / 1e6:7.1f} MB, peak {peak / 1e6:7.1f} MB")
+    return results
+
+
+if __name__ == "__main__":
+    import sys
+    benchmark(sys.argv[1] if len(sys.argv) > 1 else None)
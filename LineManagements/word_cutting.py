@@ -1,13 +1,12 @@
 import pythainlp
 from pythainlp.tokenize import word_tokenize
+from tokenizerBenchmark import ENGINES
 
 input_file = "Data/output_1_new.txt"
 output_file = "Data/output_tokenize.txt"
 
-engines = [
-    "newmm", "longest", "multi_cut", "attacut",
-    "deepcut", "mm", "nercut", "newmm-safe"
-]
+# วัดความเร็ว / หน่วยความจำ / ความตรงกับ reference ใช้ tokenizerBenchmark.py
+engines = ENGINES
 
 with open(input_file, "r", encoding="utf-8") as f_in, \
      open(output_file, "w", encoding="utf-8") as f_out:
@@ -0,0 +1,200 @@
+import asyncio
+import hashlib
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import aiohttp
+import requests
+from aiohttp import web
+
+# -------------------------------
+#  ค่าเริ่มต้นของ crawler
+# -------------------------------
+PER_HOST_LIMIT = 4       # จำนวน connection พร้อมกันสูงสุดต่อ host (อย่ายิงเว็บ EPPO หนักเกิน)
+TOTAL_LIMIT = 32         # จำนวน connection รวมใน pool
+KEEPALIVE_TIMEOUT = 30   # วินาทีที่เก็บ connection ไว้ใช้ซ้ำ
+REQUEST_TIMEOUT = 30
+
+
+async def _read_and_store(resp, url, cache=None):
+    resp.raise_for_status()
+    html = await resp.text()
+    if cache:
+        cache.store(url, html, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+    return html
+
+
+async def _fetch_html(session, url, cache=None):
+    """ดึง html ของ 1 url ถ้ามี cache (httpCache.HttpCache) จะใช้/revalidate ของใน cache ก่อน"""
+    entry = cache.lookup(url) if cache else None
+    if entry and cache.is_fresh(entry):
+        html = cache.read_body(entry)
+        if html is not None:
+            return html
+        entry = None
+
+    headers = cache.conditional_headers(entry) if cache else {}
+    async with session.get(url, headers=headers) as resp:
+        if resp.status != 304 or not entry:
+            return await _read_and_store(resp, url, cache)
+        html = cache.read_body(entry)
+        if html is not None:
+            cache.mark_revalidated(url)
+            return html
+    # 304 แต่ไฟล์ body ใน cache หาย: โหลดใหม่แบบไม่มีเงื่อนไขแล้วเก็บทับรายการเดิม (แบบ HttpCache.fetch)
+    async with session.get(url) as resp:
+        return await _read_and_store(resp, url, cache)
+
+
+async def _fetch_and_parse(session, pool, url, parse, cache=None):
+    """ดึง 1 url แล้วส่ง html ไป parse ใน process pool -> (url, result, error)"""
+    try:
+        html = await _fetch_html(session, url, cache)
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(pool, parse, html)
+        return url, result, None
+    except Exception as e:
+        return url, None, e
+
+
+async def crawl_async(urls, parse, per_host_limit: int = PER_HOST_LIMIT,
+                      max_workers: int = None, timeout: float = REQUEST_TIMEOUT, cache=None):
+    """
+    ดึงทุก url พร้อมกันด้วย aiohttp session เดียว (ใช้ keep-alive connection pool ร่วมกัน)
+    จำกัด connection ต่อ host ด้วย per_host_limit และส่ง html ไป parse ใน process pool
+    ระหว่างที่หน้าอื่นยังดึงอยู่ คืน list ของ (url, result, error) ตามลำดับ urls
+    ถ้าส่ง cache มา หน้าที่ไม่เปลี่ยนจะเหลือแค่ 304 (หรือไม่ยิงเลยถ้ายังไม่หมด TTL)
+    """
+    connector = aiohttp.TCPConnector(
+        limit=max(TOTAL_LIMIT, per_host_limit),
+        limit_per_host=per_host_limit,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+    )
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+            tasks = [_fetch_and_parse(session, pool, url, parse, cache) for url in urls]
+            return await asyncio.gather(*tasks)
+
+
+def crawl(urls, parse, per_host_limit: int = PER_HOST_LIMIT,
+          max_workers: int = None, timeout: float = REQUEST_TIMEOUT, cache=None):
+    """เวอร์ชันเรียกแบบธรรมดา (ไม่ต้องมี event loop) ของ crawl_async"""
+    return asyncio.run(crawl_async(urls, parse, per_host_limit, max_workers, timeout, cache))
+
+
+# -------------------------------
+#  Stub HTTP server สำหรับทดสอบ / benchmark
+# -------------------------------
+def make_stub_page(i: int, n_agendas: int = 5) -> str:
+    """สร้างหน้า HTML ปลอมที่มีโครงสร้าง itemFullText เหมือนหน้ามติของ EPPO"""
+    parts = [
+        '<html><body><div class="itemFullText">',
+        '<p style="text-align: center">มติคณะกรรมการบริหารนโยบายพลังงาน</p>',
+        f'<p style="text-align: center">ครั้งที่ {i % 12 + 1}/2567 (ครั้งที่ {i + 1})</p>',
+        '<p style="text-align: center">วันพุธที่ 25 ธันวาคม 2567 เวลา 13.30 น.</p>',
+        '<p style="text-align: center">ณ ห้องประชุม 1</p>',
+        '<hr />',
+        '<p>ผู้มาประชุม</p>',
+        '<p>รัฐมนตรีว่าการกระทรวงพลังงาน ประธานกรรมการ</p>',
+        '<p>(นายตัวอย่าง ทดสอบ)</p>',
+        '<p>ผู้อำนวยการสำนักงานนโยบายและแผนพลังงาน กรรมการและเลขานุการ</p>',
+        '<p>(นายตัวอย่าง เลขานุการ)</p>',
+    ]
+    for a in range(1, n_agendas + 1):
+        parts += [
+            f'<p><a id="a{a}">เรื่องที่ {a} วาระทดสอบที่ {a} ของการประชุมครั้งที่ {i + 1}</a></p>',
+            '<p><span style="text-decoration: underline;">สรุปสาระสำคัญ</span></p>',
+            f'<p>สาระสำคัญของเรื่องที่ {a} ' + 'ข้อความตัวอย่าง ' * 40 + '</p>',
+            '<p><span style="text-decoration: underline;">มติของที่ประชุม</span></p>',
+            f'<p>ที่ประชุมรับทราบเรื่องที่ {a} ' + 'ข้อความตัวอย่าง ' * 20 + '</p>',
+        ]
+    parts.append('</div></body></html>')
+    return "\n".join(parts)
+
+
+def start_stub_server(pages: dict, delay: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+    """
+    เปิด aiohttp server ใน thread แยก เสิร์ฟ pages[path] (เช่น '/item/1')
+    delay = latency จำลองต่อ request (วินาที)
+    ตอบ ETag และคืน 304 เมื่อ If-None-Match ตรง (ใช้ทดสอบ httpCache)
+    คืน (base_url, stop) โดย stop() ใช้ปิด server
+    """
+    async def handler(request):
+        body = pages.get(request.path)
+        if body is None:
+            raise web.HTTPNotFound()
+        if delay:
+            await asyncio.sleep(delay)
+        etag = '"' + hashlib.sha1(body.encode("utf-8")).hexdigest() + '"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(text=body, content_type="text/html", charset="utf-8", headers={"ETag": etag})
+
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    state = {}
+
+    async def _start():
+        app = web.Application()
+        app.router.add_get("/{tail:.*}", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, host, port)
+        await site.start()
+        state["runner"] = runner
+        state["port"] = runner.addresses[0][1]
+
+    def _run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(_start())
+        started.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=_run, daemon=True)
+    thread.start()
+    started.wait()
+
+    def stop():
+        asyncio.run_coroutine_threadsafe(state["runner"].cleanup(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+
+    return f"http://{host}:{state['port']}", stop
+
+
+# -------------------------------
+#  Benchmark: loop requests.get แบบเดิม vs crawl
+# -------------------------------
+def benchmark(parse, n_pages: int = 200, delay: float = 0.05, per_host_limit: int = PER_HOST_LIMIT):
+    pages = {f"/item/{i}": make_stub_page(i) for i in range(n_pages)}
+    base_url, stop = start_stub_server(pages, delay=delay)
+    urls = [base_url + path for path in pages]
+    try:
+        t0 = time.perf_counter()
+        serial = []
+        for url in urls:
+            resp = requests.get(url, timeout=REQUEST_TIMEOUT)
+            resp.raise_for_status()
+            serial.append(parse(resp.text))
+        t_serial = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        results = crawl(urls, parse, per_host_limit=per_host_limit)
+        t_async = time.perf_counter() - t0
+    finally:
+        stop()
+
+    errors = [e for _, _, e in results if e is not None]
+    same = [r for _, r, _ in results] == serial
+    print(f"📊 {n_pages} หน้า, latency จำลอง {delay * 1000:.0f} ms, per_host_limit={per_host_limit}")
+    print(f"  serial (requests.get): {n_pages / t_serial:8.1f} pages/s ({t_serial:.2f} s)")
+    print(f"  async  (aiohttp+pool): {n_pages / t_async:8.1f} pages/s ({t_async:.2f} s)")
+    print(f"  ผลลัพธ์ตรงกัน: {same}, error: {len(errors)}")
+    return n_pages / t_serial, n_pages / t_async
+
+
+if __name__ == "__main__":
+    from urlDatabaseStoring import parse_meeting_html
+    benchmark(parse_meeting_html)
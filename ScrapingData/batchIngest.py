@@ -0,0 +1,462 @@
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+import xxhash
+
+from batchWriter import BatchWriter
+from docxDatabaseStoring import (
+    BATCH_SIZE, DB_NAME, DOC_TYPE, ORGANIZATION, REF_BLOCK_SIZE, ParsedDocxMeeting,
+    get_db, get_ref_allocator, get_writer, parse_meeting_file, store_meeting,
+)
+from mongoIndexes import PENDING_FIELD, ensure_indexes, flush_and_mark_complete
+from refAllocator import RefAllocator
+
+INPUT_DIR = "ScrapingData/Data/InputData"
+CHECKPOINT_PATH = "ScrapingData/Data/ingest_checkpoint.sqlite"
+EXTENSIONS = (".docx", ".txt")
+CHUNK_FILES = 16         # ไฟล์ต่องานหนึ่งชิ้นที่ส่งให้ worker (ลด overhead ของการส่งข้าม process)
+CHECKPOINT_EVERY = 200   # flush Mongo + commit checkpoint ทุกกี่ไฟล์
+PROGRESS_EVERY = 1000
+HASH_BLOCK = 1 << 20
+
+INGESTED, EXISTS, DUPLICATE, FAILED = "ingested", "exists", "duplicate", "failed"
+DONE_STATUSES = (INGESTED, EXISTS, DUPLICATE)
+
+
+class FileResult(NamedTuple):
+    path: str
+    size: int
+    mtime_ns: int
+    content_hash: Optional[str]
+    parsed: Optional[ParsedDocxMeeting]
+    error: Optional[str]
+
+
+# -------------------------------
+#  หาไฟล์ + อ่าน / parse ใน worker
+# -------------------------------
+def scan_files(root: str, extensions=EXTENSIONS) -> Iterator[Tuple[str, os.stat_result]]:
+    """เดินทั้ง tree แบบ generator (ไม่เก็บรายชื่อทั้งหมด) เรียงชื่อให้ลำดับเหมือนเดิมทุกรอบ ข้ามไฟล์ล็อก ~$ ของ Word"""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.startswith("~$") or not name.lower().endswith(extensions):
+                continue
+            path = os.path.abspath(os.path.join(dirpath, name))
+            try:
+                yield path, os.stat(path)
+            except OSError:
+                continue
+
+
+def file_hash(path: str) -> str:
+    h = xxhash.xxh3_128()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _parse_chunk(chunk: List[Tuple[str, int, int]]) -> List[FileResult]:
+    """รันใน worker: hash เนื้อไฟล์แล้ว parse ไฟล์ละครั้ง ไฟล์ที่พังคืน error ไม่ทำให้ทั้งก้อนล้ม"""
+    results = []
+    for path, size, mtime_ns in chunk:
+        content_hash = None
+        try:
+            content_hash = file_hash(path)
+            results.append(FileResult(path, size, mtime_ns, content_hash, parse_meeting_file(path), None))
+        except Exception as e:
+            results.append(FileResult(path, size, mtime_ns, content_hash, None, f"{type(e).__name__}: {e}"))
+    return results
+
+
+# -------------------------------
+#  Checkpoint: สถานะรายไฟล์ (SQLite) ให้รันต่อจากเดิมได้
+# -------------------------------
+class IngestCheckpoint:
+    """
+    บันทึกผลของทุกไฟล์: ขนาด, mtime, hash เนื้อไฟล์, สถานะ, meeting_ref
+      - ไฟล์ที่ขนาด + mtime เหมือนรอบก่อนและสำเร็จแล้ว -> ข้ามโดยไม่ต้องอ่านไฟล์
+      - เนื้อไฟล์ (hash) เคยลง DB แล้วจาก path อื่น -> บันทึกเป็น duplicate ไม่เขียนซ้ำ
+      - failed จะถูกลองใหม่รอบหน้า
+    แถวที่ record แล้วยังไม่ commit จนกว่าจะเรียก commit() (หลัง BatchWriter flush)
+    ถ้า process ตายกลางทาง แถวที่ยังไม่ commit หายไปด้วย รอบหน้าจึงทำไฟล์เหล่านั้นใหม่
+    """
+
+    def __init__(self, path: str = CHECKPOINT_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path)
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                content_hash TEXT,
+                status TEXT NOT NULL,
+                meeting_ref INTEGER,
+                error TEXT,
+                updated_at REAL NOT NULL
+            )"""
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS files_hash ON files(content_hash)")
+        self._db.commit()
+
+    def is_done(self, path: str, size: int, mtime_ns: int) -> bool:
+        row = self._db.execute("SELECT size, mtime_ns, status FROM files WHERE path = ?", (path,)).fetchone()
+        return row is not None and row[0] == size and row[1] == mtime_ns and row[2] in DONE_STATUSES
+
+    def find_hash(self, content_hash: str) -> Optional[Tuple[str, str, Optional[int]]]:
+        """(path, status, meeting_ref) ของไฟล์ที่เนื้อเหมือนกันและลง DB สำเร็จแล้ว (เห็นแถวที่ยังไม่ commit ด้วย)"""
+        return self._db.execute(
+            "SELECT path, status, meeting_ref FROM files WHERE content_hash = ? AND status IN (?, ?) LIMIT 1",
+            (content_hash, INGESTED, EXISTS),
+        ).fetchone()
+
+    def record(self, result: FileResult, status: str, meeting_ref: Optional[int] = None, error: str = None):
+        self._db.execute(
+            "INSERT OR REPLACE INTO files (path, size, mtime_ns, content_hash, status, meeting_ref, error, updated_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (result.path, result.size, result.mtime_ns, result.content_hash, status, meeting_ref, error, time.time()),
+        )
+
+    def commit(self):
+        self._db.commit()
+
+    def counts(self) -> dict:
+        return dict(self._db.execute("SELECT status, COUNT(*) FROM files GROUP BY status"))
+
+    def close(self):
+        self._db.commit()
+        self._db.close()
+
+
+# -------------------------------
+#  Pipeline: scan (generator) -> process pool parse -> process หลักเขียน Mongo + checkpoint
+# -------------------------------
+def _pending_chunks(root: str, checkpoint: IngestCheckpoint, stats: dict, force: bool):
+    chunk = []
+    for path, st in scan_files(root):
+        stats["scanned"] += 1
+        if not force and checkpoint.is_done(path, st.st_size, st.st_mtime_ns):
+            stats["unchanged"] += 1
+            continue
+        chunk.append((path, st.st_size, st.st_mtime_ns))
+        if len(chunk) >= CHUNK_FILES:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _store(result: FileResult, checkpoint: IngestCheckpoint, stats: dict, organization: str, documentType: str,
+           meetings, batch_writer, allocator, run_id: str, pending: list):
+    if result.error is not None:
+        checkpoint.record(result, FAILED, error=result.error)
+        stats[FAILED] += 1
+        print(f"❌ {result.path}: {result.error}")
+        return
+    prior = checkpoint.find_hash(result.content_hash)
+    if prior is not None and prior[0] == result.path:
+        # แค่ mtime เปลี่ยน เนื้อเหมือนเดิม: อัปเดตขนาด / mtime ใน checkpoint พอ
+        checkpoint.record(result, prior[1], prior[2])
+        stats["unchanged"] += 1
+        return
+    if prior is not None:
+        checkpoint.record(result, DUPLICATE, prior[2], error=f"same content as {prior[0]}")
+        stats[DUPLICATE] += 1
+        return
+    try:
+        meeting_ref = store_meeting(result.parsed, organization, documentType, meetings, batch_writer, allocator,
+                                    pending=run_id)
+    except Exception as e:
+        checkpoint.record(result, FAILED, error=f"{type(e).__name__}: {e}")
+        stats[FAILED] += 1
+        print(f"❌ {result.path}: {e}")
+        return
+    if meeting_ref is None:
+        checkpoint.record(result, EXISTS)
+        stats[EXISTS] += 1
+    else:
+        checkpoint.record(result, INGESTED, meeting_ref)
+        pending.append((result, meeting_ref))
+        stats[INGESTED] += 1
+
+
+def _commit(checkpoint: IngestCheckpoint, stats: dict, meetings, batch_writer: BatchWriter, pending: list):
+    """
+    flush ลูกของทุก meeting ที่ค้าง -> ลบ PENDING_FIELD -> commit checkpoint ตามลำดับนี้
+    ตายก่อนลบ PENDING_FIELD: รอบหน้าไฟล์ไม่อยู่ใน checkpoint ถูก parse ใหม่ และ store_meeting เขียนลูกใหม่ด้วย ref เดิม
+    ถ้า flush มี error: meeting ยังค้าง pending และไฟล์ถูกบันทึกเป็น failed ให้ลองใหม่รอบหน้า
+    """
+    if not flush_and_mark_complete(meetings, batch_writer, [ref for _, ref in pending]):
+        for result, ref in pending:
+            checkpoint.record(result, FAILED, ref, error="bulk_write ของลูกไม่สำเร็จ")
+        stats[INGESTED] -= len(pending)
+        stats[FAILED] += len(pending)
+    pending.clear()
+    checkpoint.commit()
+
+
+def ingest_directory(root: str, organization: str = ORGANIZATION, documentType: str = DOC_TYPE,
+                     checkpoint_path: str = CHECKPOINT_PATH, workers: int = None, force: bool = False,
+                     meetings=None, batch_writer: BatchWriter = None, allocator: RefAllocator = None,
+                     verbose: bool = True) -> dict:
+    """
+    นำเข้าไฟล์ .docx / .txt ทั้ง tree ใต้ root
+      - worker (process pool) hash + parse ไฟล์ ส่งกลับเป็น ParsedDocxMeeting
+      - process หลักเขียน Mongo ผ่าน BatchWriter / RefAllocator ชุดเดียว (ไม่มี connection ต่อ worker)
+      - งานที่ส่งเข้า pool ค้างได้ไม่เกิน 2 เท่าของจำนวน worker และรายชื่อไฟล์อ่านจาก generator
+        หน่วยความจำจึงไม่โตตามจำนวนไฟล์
+      - ทุก CHECKPOINT_EVERY ไฟล์: flush BatchWriter, ลบ PENDING_FIELD ของ meeting ที่ลูกลงครบ แล้วค่อย commit checkpoint
+        (meeting ใหม่ถูกเขียนทันทีพร้อม PENDING_FIELD ถ้าตายก่อน flush รอบหน้าจะเขียนลูกของ meeting นั้นใหม่)
+    ค่าเริ่มต้นของ meetings / batch_writer / allocator คือของ docxDatabaseStoring
+    คืน dict สถิติ (จำนวนแต่ละสถานะ, เวลา, ไฟล์/วินาที)
+    """
+    meetings = meetings if meetings is not None else get_db()["meetings"]
+    batch_writer = batch_writer or get_writer()
+    allocator = allocator or get_ref_allocator()
+    run_id = uuid.uuid4().hex
+    pending = []
+    workers = workers or os.cpu_count() or 1
+    checkpoint = IngestCheckpoint(checkpoint_path)
+    stats = dict.fromkeys(("scanned", "unchanged", INGESTED, EXISTS, DUPLICATE, FAILED), 0)
+    started = time.perf_counter()
+    processed = since_commit = 0
+
+    chunks = _pending_chunks(root, checkpoint, stats, force)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            in_flight = set()
+            finished = False
+            while not finished or in_flight:
+                while not finished and len(in_flight) < 2 * workers:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        finished = True
+                        break
+                    in_flight.add(pool.submit(_parse_chunk, chunk))
+                if not in_flight:
+                    continue
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for result in future.result():
+                        _store(result, checkpoint, stats, organization, documentType,
+                               meetings, batch_writer, allocator, run_id, pending)
+                        processed += 1
+                        since_commit += 1
+                        if verbose and processed % PROGRESS_EVERY == 0:
+                            elapsed = time.perf_counter() - started
+                            print(f"⏳ {processed:,} ไฟล์ {processed / elapsed:,.1f} ไฟล์/s")
+                if since_commit >= CHECKPOINT_EVERY:
+                    _commit(checkpoint, stats, meetings, batch_writer, pending)
+                    since_commit = 0
+    finally:
+        _commit(checkpoint, stats, meetings, batch_writer, pending)
+        checkpoint.close()
+
+    elapsed = time.perf_counter() - started
+    stats["elapsed_s"] = round(elapsed, 3)
+    stats["files_per_s"] = round(stats["scanned"] / elapsed, 1) if elapsed > 0 else 0.0
+    if verbose:
+        print_stats(stats)
+    return stats
+
+
+def print_stats(stats: dict):
+    print(f"📊 สแกน {stats['scanned']:,} ไฟล์ใน {stats['elapsed_s']:.2f} s ({stats['files_per_s']:,.1f} ไฟล์/s): "
+          f"ใหม่ {stats[INGESTED]:,}, มีใน DB แล้ว {stats[EXISTS]:,}, เนื้อซ้ำ {stats[DUPLICATE]:,}, "
+          f"ไม่เปลี่ยน {stats['unchanged']:,}, ผิดพลาด {stats[FAILED]:,}")
+
+
+# -------------------------------
+#  Benchmark: วนทีละไฟล์แบบเดิม vs process pool vs รันซ้ำ (checkpoint)
+# -------------------------------
+def make_synthetic_minutes(root: str, n_files: int = 2000, duplicate_every: int = 50, docx_every: int = 100,
+                           seed: int = 0):
+    """รายงานการประชุมสังเคราะห์กระจายใน 20 โฟลเดอร์ย่อย มีไฟล์เนื้อซ้ำ และ .docx ปนบางส่วน"""
+    from docx import Document
+    rng = random.Random(seed)
+    words = ["ที่ประชุม", "ได้", "พิจารณา", "อัตรา", "เงิน", "ส่งเข้า", "กองทุน", "น้ำมัน", "เชื้อเพลิง", "ราคา"]
+    previous = None
+    for i in range(n_files):
+        folder = os.path.join(root, f"{2550 + i % 20}")
+        os.makedirs(folder, exist_ok=True)
+        if previous is not None and i % duplicate_every == duplicate_every - 1:
+            lines = previous
+        else:
+            lines = [
+                "รายงานการประชุมคณะกรรมการบริหารนโยบายพลังงาน",
+                f"ครั้งที่ {i // 20 + 1}/{2550 + i % 20} (ครั้งที่ {i + 1})",
+                f"วันที่ {rng.randint(1, 28)} มกราคม {2550 + i % 20}",
+                "ผู้มาประชุม",
+                "รัฐมนตรีว่าการกระทรวงพลังงาน    ประธานกรรมการ",
+                "(นายตัวอย่าง ทดสอบ)",
+                "ปลัดกระทรวงพลังงาน    กรรมการ",
+                "(นายสมมติ ชื่อสกุล)",
+            ]
+            for a in range(1, rng.randint(3, 8)):
+                lines += [f"เรื่องที่ {a} การกำหนดอัตราเงินส่งเข้ากองทุน", "สรุปสาระสำคัญ"]
+                lines += [" ".join(rng.choice(words) for _ in range(30)) for _ in range(rng.randint(2, 6))]
+                lines += ["มติของที่ประชุม", " ".join(rng.choice(words) for _ in range(15))]
+            previous = lines
+        if i % docx_every == docx_every - 1:
+            doc = Document()
+            for line in lines:
+                doc.add_paragraph(line)
+            doc.save(os.path.join(folder, f"minutes_{i:05d}.docx"))
+        else:
+            with open(os.path.join(folder, f"minutes_{i:05d}.txt"), "w", encoding="utf-8") as f:
+                f.write("\n".join(lines))
+
+
+def _legacy_ingest(root: str, db) -> int:
+    """แบบเดิม: อ่าน + parse + เขียน ทีละไฟล์ใน process เดียว"""
+    n = 0
+    with BatchWriter(db, batch_size=BATCH_SIZE, verbose=False) as batch_writer:
+        allocator = RefAllocator(db["counters"], block_size=REF_BLOCK_SIZE)
+        for path, _ in scan_files(root):
+            store_meeting(parse_meeting_file(path), ORGANIZATION, DOC_TYPE, db["meetings"], batch_writer, allocator)
+            n += 1
+    return n
+
+
+def benchmark(db, n_files: int = 2000, root: str = "ScrapingData/Data/ingest_benchmark", workers: int = None):
+    shutil.rmtree(root, ignore_errors=True)
+    make_synthetic_minutes(root, n_files)
+    checkpoint_path = os.path.join(root, "checkpoint.sqlite")
+
+    for name in ("meetings", "attendees", "agendas", "details", "counters"):
+        db[name].drop()
+    ensure_indexes(db)
+    t0 = time.perf_counter()
+    _legacy_ingest(root, db)
+    t_legacy = time.perf_counter() - t0
+    legacy_meetings = db["meetings"].count_documents({})
+
+    def run():
+        with BatchWriter(db, batch_size=BATCH_SIZE, verbose=False) as batch_writer:
+            allocator = RefAllocator(db["counters"], block_size=REF_BLOCK_SIZE)
+            return ingest_directory(root, checkpoint_path=checkpoint_path, workers=workers, meetings=db["meetings"],
+                                    batch_writer=batch_writer, allocator=allocator, verbose=False)
+
+    for name in ("meetings", "attendees", "agendas", "details", "counters"):
+        db[name].drop()
+    ensure_indexes(db)
+    first = run()
+    pool_meetings = db["meetings"].count_documents({})
+    rerun = run()
+    shutil.rmtree(root, ignore_errors=True)
+
+    print(f"📊 นำเข้า {n_files:,} ไฟล์ (workers={workers or os.cpu_count()})")
+    print(f"  ทีละไฟล์ (เดิม)       {t_legacy:7.2f} s  {n_files / t_legacy:8,.1f} ไฟล์/s  meetings {legacy_meetings:,}")
+    print(f"  process pool         {first['elapsed_s']:7.2f} s  {first['files_per_s']:8,.1f} ไฟล์/s  "
+          f"meetings {pool_meetings:,} (เนื้อซ้ำ {first[DUPLICATE]:,})")
+    print(f"  รันซ้ำ (checkpoint)   {rerun['elapsed_s']:7.2f} s  {rerun['files_per_s']:8,.1f} ไฟล์/s  "
+          f"ไม่เปลี่ยน {rerun['unchanged']:,}")
+    return t_legacy, first, rerun
+
+
+def check_resume_after_crash(db, n_files: int = 300, crash_after: int = 120,
+                             root: str = "ScrapingData/Data/ingest_check", workers: int = None) -> int:
+    """
+    จำลอง process ตายหลังเขียน meeting แต่ก่อน flush ลูก / commit checkpoint แล้วรัน ingest_directory ต่อ
+    ต้องได้ meetings / attendees / agendas / details ชุดเดียวกับการนำเข้ารอบเดียวใน DB ว่าง และไม่มี meeting ค้าง pending
+    คืนจำนวน collection ที่ไม่ตรง
+    """
+    shutil.rmtree(root, ignore_errors=True)
+    make_synthetic_minutes(root, n_files)
+    children = ("attendees", "agendas", "details")
+
+    def reset():
+        for name in ("meetings",) + children + ("counters",):
+            db[name].drop()
+        ensure_indexes(db)
+
+    def snapshot():
+        """{collection: [document ...]} เทียบด้วย meeting_no_full แทน meeting_ref (เลขต่างกันได้ระหว่างสองรอบ)"""
+        keys = {m["meeting_ref"]: m["meeting_no_full"] for m in db["meetings"].find()}
+        out = {"meetings": sorted(keys.values())}
+        for name in children:
+            out[name] = sorted(
+                repr(sorted({**{k: v for k, v in d.items() if k not in ("_id", "meeting_ref")},
+                             "meeting": keys.get(d["meeting_ref"])}.items()))
+                for d in db[name].find()
+            )
+        return out
+
+    def ingest(checkpoint_path):
+        with BatchWriter(db, batch_size=BATCH_SIZE, verbose=False) as batch_writer:
+            allocator = RefAllocator(db["counters"], block_size=REF_BLOCK_SIZE)
+            return ingest_directory(root, checkpoint_path=checkpoint_path, workers=workers, meetings=db["meetings"],
+                                    batch_writer=batch_writer, allocator=allocator, verbose=False)
+
+    reset()
+    ingest(os.path.join(root, "clean.sqlite"))
+    expected = snapshot()
+
+    reset()
+    # ตาย: meeting ลง DB แล้ว (พร้อม PENDING_FIELD) ลูกบางส่วน flush ไปแล้วเพราะ batch เต็ม ที่เหลือหายไปกับ buffer
+    dead = BatchWriter(db, batch_size=50, verbose=False)
+    allocator = RefAllocator(db["counters"], block_size=REF_BLOCK_SIZE)
+    for i, (path, _) in enumerate(scan_files(root)):
+        if i >= crash_after:
+            break
+        store_meeting(parse_meeting_file(path), ORGANIZATION, DOC_TYPE, db["meetings"], dead, allocator,
+                      pending="crashed-run")
+    dead._ops.clear()
+    dead.close()
+    resumed = ingest(os.path.join(root, "crash.sqlite"))
+    got = snapshot()
+    stuck = db["meetings"].count_documents({PENDING_FIELD: {"$exists": True}})
+    shutil.rmtree(root, ignore_errors=True)
+
+    mismatches = sum(expected[name] != got[name] for name in expected) + (stuck > 0)
+    print(f"🔎 ตายหลัง {crash_after} ไฟล์แล้วรันต่อ: {resumed[INGESTED]} ไฟล์เขียนใหม่ / เขียนลูกซ้ำ, "
+          f"meeting ค้าง pending {stuck}")
+    for name in expected:
+        print(f"  {name:<10} รอบเดียว {len(expected[name]):6,}  ตาย + รันต่อ {len(got[name]):6,}  "
+              f"ตรงกัน {expected[name] == got[name]}")
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="นำเข้ารายงานการประชุม .docx / .txt ทั้งโฟลเดอร์ลง MongoDB")
+    parser.add_argument("root", nargs="?", default=INPUT_DIR)
+    parser.add_argument("--organization", default=ORGANIZATION)
+    parser.add_argument("--doc-type", default=DOC_TYPE)
+    parser.add_argument("--checkpoint", default=CHECKPOINT_PATH)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--force", action="store_true", help="อ่านทุกไฟล์ใหม่ ไม่ข้ามตาม checkpoint")
+    parser.add_argument("--benchmark", type=int, metavar="N_FILES", default=None,
+                        help="benchmark บนไฟล์สังเคราะห์ N ไฟล์ (ใช้ DB ชื่อ <DB_NAME>_benchmark แล้วลบทิ้ง)")
+    parser.add_argument("--check", action="store_true",
+                        help="จำลอง process ตายก่อน flush แล้วรันต่อ (ใช้ DB ชื่อ <DB_NAME>_check แล้วลบทิ้ง)")
+    args = parser.parse_args(argv)
+
+    if args.benchmark or args.check:
+        client = get_db().client
+        scratch = client[DB_NAME + ("_benchmark" if args.benchmark else "_check")]
+        try:
+            if args.check:
+                return check_resume_after_crash(scratch, workers=args.workers)
+            return benchmark(scratch, args.benchmark, workers=args.workers)
+        finally:
+            client.drop_database(scratch.name)
+
+    if not os.path.isdir(args.root):
+        sys.exit(f"ไม่พบโฟลเดอร์ {args.root}")
+    ensure_indexes(get_db())
+    with get_writer():
+        return ingest_directory(args.root, args.organization, args.doc_type, args.checkpoint, args.workers, args.force)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import atexit
+import time
+from collections import defaultdict
+
+from pymongo import DeleteMany, InsertOne
+from pymongo.errors import BulkWriteError
+
+DEFAULT_BATCH_SIZE = 500
+
+
+class BatchWriter:
+    """
+    สะสม document ของ attendees / agendas / details ข้ามหลาย ๆ การประชุม
+    แล้วเขียนทีละก้อนด้วย bulk_write แทนการเรียก insert_one ทีละแถว
+      - collection ที่มีแต่ insert จะ flush แบบ unordered
+      - collection ที่มี DeleteMany ปน (replace_children) จะ flush แบบ ordered เพื่อให้ลบก่อน insert
+      - flush อัตโนมัติเมื่อครบ batch_size และตอนจบโปรแกรม (atexit / with-block)
+      - ส่งไม่ถึง server (เช่น connection หลุด): งานยังค้างใน buffer และ exception โยนให้ผู้เรียก
+    """
+
+    def __init__(self, db, batch_size: int = DEFAULT_BATCH_SIZE, batch_sizes: dict = None, verbose: bool = True):
+        self.db = db
+        self.batch_size = batch_size
+        self.batch_sizes = batch_sizes or {}
+        self.verbose = verbose
+        self._ops = defaultdict(list)
+        self._ordered = set()
+        self.inserted = defaultdict(int)
+        self.deleted = defaultdict(int)
+        self.errors = 0
+        self._started = time.perf_counter()
+        self._closed = False
+        atexit.register(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ---------- เพิ่มงาน ----------
+    def insert(self, name: str, doc: dict):
+        self._ops[name].append(InsertOne(doc))
+        self._maybe_flush(name)
+
+    def insert_many(self, name: str, docs):
+        self._ops[name].extend(InsertOne(d) for d in docs)
+        self._maybe_flush(name)
+
+    def replace_children(self, name: str, meeting_ref: int, docs):
+        """ลบของเดิมของ meeting_ref นี้แล้วใส่ชุดใหม่ (แทน delete_many + insert_many)"""
+        self._ops[name].append(DeleteMany({"meeting_ref": meeting_ref}))
+        self._ops[name].extend(InsertOne(d) for d in docs)
+        self._ordered.add(name)
+        self._maybe_flush(name)
+
+    # ---------- flush ----------
+    def _maybe_flush(self, name: str):
+        if len(self._ops[name]) >= self.batch_sizes.get(name, self.batch_size):
+            self.flush(name)
+
+    def flush(self, name: str = None):
+        """
+        ส่งงานที่ค้างลง Mongo งานถูกเอาออกจาก buffer หลัง bulk_write ตอบกลับแล้วเท่านั้น
+        BulkWriteError (server รับแล้ว error รายแถว) นับเป็น errors แล้วทิ้ง
+        error อื่น (AutoReconnect / NetworkTimeout / ServerSelectionTimeoutError ...) โยนต่อ งานยังอยู่ใน buffer
+        ผู้เรียกเลือกได้ว่าจะ flush ซ้ำหรือเลิก
+        """
+        names = [name] if name else list(self._ops)
+        for n in names:
+            ops = self._ops.get(n)
+            if not ops:
+                self._ops.pop(n, None)
+                continue
+            ordered = n in self._ordered
+            try:
+                result = self.db[n].bulk_write(ops, ordered=ordered)
+                self.inserted[n] += result.inserted_count
+                self.deleted[n] += result.deleted_count
+            except BulkWriteError as e:
+                details = e.details
+                self.inserted[n] += details.get("nInserted", 0)
+                self.deleted[n] += details.get("nRemoved", 0)
+                self.errors += len(details.get("writeErrors", []))
+                first = details.get("writeErrors", [{}])[0].get("errmsg", "")
+                print(f"❌ bulk_write {n}: {len(details.get('writeErrors', []))} error(s) เช่น {first}")
+            del self._ops[n]
+            self._ordered.discard(n)
+
+    def close(self):
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        atexit.unregister(self.close)
+        if self.verbose and (self.inserted or self.errors):
+            self.report()
+
+    # ---------- สถิติ ----------
+    def docs_per_second(self) -> float:
+        elapsed = time.perf_counter() - self._started
+        total = sum(self.inserted.values())
+        return total / elapsed if elapsed > 0 else 0.0
+
+    def report(self):
+        total = sum(self.inserted.values())
+        per_col = ", ".join(f"{n}={c}" for n, c in sorted(self.inserted.items()))
+        print(f"📊 เขียนแล้ว {total} docs ({per_col}) {self.docs_per_second():.1f} docs/s, error {self.errors}")
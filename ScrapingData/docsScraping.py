@@ -2,12 +2,8 @@ import re
 import os
 from typing import List, Tuple, Optional
 
-# ถ้าจะรองรับ .docx ให้ติดตั้งก่อน: pip install python-docx
-try:
-    from docx import Document
-    HAS_DOCX = True
-except Exception:
-    HAS_DOCX = False
+# .docx อ่านแบบ stream จาก word/document.xml (ไม่ต้องใช้ python-docx)
+from docxStream import read_text_from_file
 
 # -------------------------
 # Utils
@@ -17,19 +13,6 @@ THAI_DIGITS = str.maketrans("๐๑๒๓๔๕๖๗๘๙", "0123456789")
 def normalize_digits(s: str) -> str:
     return s.translate(THAI_DIGITS)
 
-def read_text_from_file(path: str) -> str:
-    ext = os.path.splitext(path)[1].lower()
-    if ext == ".txt":
-        with open(path, "r", encoding="utf-8") as f:
-            return f.read()
-    elif ext == ".docx":
-        if not HAS_DOCX:
-            raise RuntimeError("ต้องติดตั้ง python-docx ก่อน (pip install python-docx)")
-        doc = Document(path)
-        return "\n".join(p.text for p in doc.paragraphs)
-    else:
-        raise ValueError("รองรับเฉพาะ .txt และ .docx เท่านั้น")
-
 # -------------------------
 # Extraction with Regex
 # -------------------------
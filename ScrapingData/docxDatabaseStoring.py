@@ -1,10 +1,24 @@
-import re
-import os
-from pymongo import MongoClient, ReturnDocument
 from datetime import datetime
+from functools import lru_cache
+from typing import List, NamedTuple, Optional
+
+from pymongo import MongoClient
+from batchWriter import BatchWriter
+from docxStream import read_text_from_file
+from refAllocator import RefAllocator
+from mongoIndexes import (
+    PENDING_FIELD, PENDING_PROJECTION, ensure_indexes, meeting_exists, insert_meeting_if_absent,
+)
+from thaiDate import parse_thai_date
+from thaiPatterns import (
+    THAI_MONTHS, WHITESPACE_RE, COLUMN_GAP_RE, ROLE_WORDS_END_RE,
+    MEETING_SEQ_RE, AGENDA_HEAD_RE, AGENDA_PREFIX_RE, SUMMARY_RE, RESOLUTION_PREFIX_RE,
+)
 
 MONGO_URI = "mongodb://localhost:27017/"
 DB_NAME = "DocxResolutionScraping"
+BATCH_SIZE = 500
+REF_BLOCK_SIZE = 100
 
 INPUT_FILES = [
     r"ScrapingData/Data/InputData/ตัวอย่างมติกพช.docx",
@@ -14,116 +28,78 @@ org = "กพง"
 ORGANIZATION = org + "."
 DOC_TYPE = "มติ"
 
-client = MongoClient(MONGO_URI)
-db = client[DB_NAME]
-meetings_col  = db["meetings"]
-attendees_col = db["attendees"]
-agendas_col   = db["agendas"]
-details_col   = db["details"]
-
-try:
-    from docx import Document
-    HAS_DOCX = True
-except ImportError:
-    HAS_DOCX = False
-
-THAI2AR = str.maketrans("๐๑๒๓๔๕๖๗๘๙", "0123456789")
-THAI_MONTHS = {
-    "มกราคม": 1, "กุมภาพันธ์": 2, "มีนาคม": 3,
-    "เมษายน": 4, "พฤษภาคม": 5, "มิถุนายน": 6,
-    "กรกฎาคม": 7, "สิงหาคม": 8, "กันยายน": 9,
-    "ตุลาคม": 10, "พฤศจิกายน": 11, "ธันวาคม": 12,
-}
-MONTHS_ALT = r"(?:มกราคม|กุมภาพันธ์|มีนาคม|เมษายน|พฤษภาคม|มิถุนายน|กรกฎาคม|สิงหาคม|กันยายน|ตุลาคม|พฤศจิกายน|ธันวาคม)"
-
-def read_text_from_file(path: str) -> str:
-    ext = os.path.splitext(path)[1].lower()
-    if ext == ".txt":
-        with open(path, "r", encoding="utf-8") as f:
-            return f.read()
-    elif ext == ".docx":
-        if not HAS_DOCX:
-            raise RuntimeError("ต้องติดตั้ง python-docx ก่อน (pip install python-docx)")
-        doc = Document(path)
-        return "\n".join(p.text for p in doc.paragraphs)
-    else:
-        raise ValueError("รองรับเฉพาะ .txt และ .docx เท่านั้น")
+# connection / writer / allocator สร้างเมื่อใช้ครั้งแรก ไม่สร้างตอน import
+# (batchIngest parse ไฟล์ใน process pool: worker ที่ import module นี้จึงไม่เปิด Mongo / atexit ของตัวเอง)
+@lru_cache(maxsize=1)
+def get_db():
+    return MongoClient(MONGO_URI)[DB_NAME]
+
+@lru_cache(maxsize=1)
+def get_writer() -> BatchWriter:
+    return BatchWriter(get_db(), batch_size=BATCH_SIZE)
+
+@lru_cache(maxsize=1)
+def get_ref_allocator() -> RefAllocator:
+    return RefAllocator(get_db()["counters"], block_size=REF_BLOCK_SIZE)
 
 def norm(s: str) -> str:
     if not s:
         return ""
     s = s.replace("\xa0", " ")
-    return re.sub(r"\s+", " ", s.strip())
+    return WHITESPACE_RE.sub(" ", s.strip())
 
 def clean_person_name(line: str):
     line = norm(line)
     return line.strip("()[]{}").strip()
 
-def parse_thai_date(date_str: str):
-    s = norm(date_str).translate(THAI2AR)
-    pat = re.compile(
-        rf"(?:วัน[ก-๙]+(?:ที่)?)?\s*"
-        rf"(?P<day>\d{{1,2}})\s+"
-        rf"(?P<month>{MONTHS_ALT})\s+"
-        rf"(?:(?:พ\.?\s*ศ\.?|พศ)\s*)?"
-        rf"(?P<year>\d{{4}})"
-        rf"(?:\s*(?:เวลา)?\s*(?P<hour>\d{{1,2}})[.:](?P<minute>\d{{2}}))?",
-        re.IGNORECASE
-    )
-    m = pat.search(s)
-    if not m:
-        return None
-    day = int(m.group("day"))
-    month = THAI_MONTHS.get(m.group("month"))
-    year = int(m.group("year"))
-    if year >= 2400:  # พ.ศ. → ค.ศ.
-        year -= 543
-    hour = int(m.group("hour")) if m.group("hour") else 0
-    minute = int(m.group("minute")) if m.group("minute") else 0
-    return datetime(year, month, day, hour, minute)
-
 def split_position_role(line: str):
     """แยก 'ตำแหน่ง .... บทบาท' -> (position, role)"""
     line = norm(line)
-    parts = re.split(r"\s{4,}", line)
+    parts = COLUMN_GAP_RE.split(line)
     parts = [p for p in parts if p]
     if len(parts) >= 2:
         return parts[0], parts[-1]
-    ROLE_WORDS = r"(ประธานกรรมการ|รองประธานกรรมการ|กรรมการและเลขานุการ|กรรมการและผู้ช่วยเลขานุการ|กรรมการ|เลขานุการ|รองประธานกรรมการทำหน้าที่ประธาน)"
-    m = re.search(ROLE_WORDS + r"$", line)
+    m = ROLE_WORDS_END_RE.search(line)
     if m:
         role = m.group(1)
         position = norm(line[:m.start()].rstrip(" ."))
         return position, role
     return line, ""
 
-def scrape_from_file(file_path: str, organization: str, documentType: str = "มติ"):
-    text = read_text_from_file(file_path)
+class ParsedDocxMeeting(NamedTuple):
+    """ผลจากการอ่านรายงานการประชุม .docx / .txt หนึ่งไฟล์ (ยังไม่มี meeting_ref) ส่งข้าม process ได้"""
+    title: str
+    meeting_no_full: str
+    meeting_seq: Optional[int]
+    meeting_date: str
+    meeting_date_obj: Optional[datetime]
+    attendees: List[dict]
+    agendas: List[dict]
+
+
+def parse_meeting_text(text: str) -> ParsedDocxMeeting:
     lines = [norm(l) for l in text.splitlines() if norm(l)]
 
     title = lines[0] if lines else ""
     meeting_no_full = ""
     meeting_seq = None
     meeting_date = ""
-    location = ""
 
     for l in lines[:5]:
         if "ครั้งที่" in l:
             meeting_no_full = l
-            m_seq = re.search(r"\(ครั้งที่\s*([0-9]+)\)", l)
+            m_seq = MEETING_SEQ_RE.search(l)
             if m_seq:
                 meeting_seq = int(m_seq.group(1))
         if any(m in l for m in THAI_MONTHS.keys()):
             meeting_date = l
-        if "ณ" in l and "ห้อง" in l:
-            location = l
 
     meeting_date_obj = parse_thai_date(meeting_date)
 
     attendees = []
     try:
         start_idx = next(i for i,l in enumerate(lines) if "ผู้มาประชุม" in l)
-        end_idx = next(i for i,l in enumerate(lines) if re.match(r"^(เรื่องที่|วาระที่)", l))
+        end_idx = next(i for i,l in enumerate(lines) if AGENDA_PREFIX_RE.match(l))
         attendee_lines = lines[start_idx+1:end_idx]
         for i in range(0, len(attendee_lines), 2):
             pos = attendee_lines[i]
@@ -143,18 +119,18 @@ def scrape_from_file(file_path: str, organization: str, documentType: str = "ม
     current_section = None
 
     for l in lines:
-        if re.match(r"^(เรื่องที่|วาระที่)\s*\d+", l):
+        if AGENDA_HEAD_RE.match(l):
             if current_agenda:
                 agendas.append(current_agenda)
             current_agenda = {"agenda": l, "summaries": [], "resolutions": []}
             current_section = None
             continue
 
-        if re.search(r"สรุป\s*สาระ\s*สำคัญ", l):
+        if SUMMARY_RE.search(l):
             current_section = "summary"
             continue
 
-        if re.match(r"^(มติ|ที่ประชุมมีมติ)", l):
+        if RESOLUTION_PREFIX_RE.match(l):
             current_section = "resolution"
             continue
 
@@ -167,45 +143,89 @@ def scrape_from_file(file_path: str, organization: str, documentType: str = "ม
     if current_agenda:
         agendas.append(current_agenda)
 
+    return ParsedDocxMeeting(title, meeting_no_full, meeting_seq, meeting_date, meeting_date_obj, attendees, agendas)
 
-    if meetings_col.find_one({"meeting_no_full": meeting_no_full, "organization": organization}):
-        print(f"Already exists, skip: {file_path}")
-        return
-
-    meeting_ref = db["counters"].find_one_and_update(
-        {"_id": "meeting_ref"},
-        {"$inc": {"seq": 1}},
-        upsert=True,
-        return_document=ReturnDocument.AFTER
-    )["seq"]
 
-    meetings_col.insert_one({
-        "title": title,
-        "meeting_ref": meeting_ref,
-        "meeting_no_full": meeting_no_full,
-        "meeting_seq": meeting_seq,
-        "meeting_date": meeting_date,
-        "meeting_date_obj": meeting_date_obj,
-        "organization": organization,
-        "doc_type": documentType,
-    })
+def parse_meeting_file(file_path: str) -> ParsedDocxMeeting:
+    return parse_meeting_text(read_text_from_file(file_path))
 
-    for person in attendees:
-        attendees_col.insert_one({"meeting_ref": meeting_ref, **person})
 
-    for i, agenda in enumerate(agendas, start=1):
-        agendas_col.insert_one({
+def _queue_children(parsed: ParsedDocxMeeting, meeting_ref: int, batch_writer, replace: bool = False):
+    """ใส่ attendees / agendas / details ลง BatchWriter (replace: ลบของเดิมของ meeting_ref นี้ก่อน)"""
+    attendees = [{"meeting_ref": meeting_ref, **person} for person in parsed.attendees]
+    agendas, details = [], []
+    for i, agenda in enumerate(parsed.agendas, start=1):
+        agendas.append({
             "meeting_ref": meeting_ref,
             "agenda_no": i,
             "agenda_title": agenda["agenda"]
         })
-        details_col.insert_one({
+        details.append({
             "meeting_ref": meeting_ref,
             "agenda_no": i,
             "summary": " ".join(agenda["summaries"]),
             "resolution": " ".join(agenda["resolutions"])
         })
-    print(f"✅ Inserted from file: {file_path}")
+    for name, docs in (("attendees", attendees), ("agendas", agendas), ("details", details)):
+        if replace:
+            batch_writer.replace_children(name, meeting_ref, docs)
+        else:
+            batch_writer.insert_many(name, docs)
+
+
+def store_meeting(parsed: ParsedDocxMeeting, organization: str, documentType: str = "มติ",
+                  meetings=None, batch_writer=None, allocator=None, pending: Optional[str] = None) -> Optional[int]:
+    """
+    เขียนการประชุมที่ parse แล้วลง Mongo คืน meeting_ref ที่ใส่ใหม่ หรือ None ถ้ามีการประชุมนี้อยู่แล้ว
+    ค่าเริ่มต้นใช้ connection / writer / allocator ของ module นี้
+    pending=<run id> (batchIngest): meeting ถูกเขียนพร้อม PENDING_FIELD ผู้เรียกต้อง mark_complete หลัง flush writer
+    ถ้าเจอ meeting ที่ค้าง PENDING_FIELD ของรอบอื่น (รอบนั้นตายก่อน flush ลูก) จะเขียนลูกใหม่ทั้งชุดด้วย ref เดิม
+    แล้วคืน ref นั้น ส่วน meeting ที่ค้างของรอบนี้เองถือว่ามีอยู่แล้ว
+    """
+    meetings = meetings if meetings is not None else get_db()["meetings"]
+    batch_writer = batch_writer or get_writer()
+    allocator = allocator or get_ref_allocator()
+
+    key = {"organization": organization, "meeting_no_full": parsed.meeting_no_full}
+    if pending:
+        existing = meetings.find_one(key, PENDING_PROJECTION)
+        if existing is not None:
+            if existing.get(PENDING_FIELD) in (None, pending):
+                return None
+            _queue_children(parsed, existing["meeting_ref"], batch_writer, replace=True)
+            return existing["meeting_ref"]
+    elif meeting_exists(meetings, key):
+        return None
+
+    meeting_ref = allocator.next()
+
+    meeting_doc = {
+        "title": parsed.title,
+        "meeting_ref": meeting_ref,
+        "meeting_no_full": parsed.meeting_no_full,
+        "meeting_seq": parsed.meeting_seq,
+        "meeting_date": parsed.meeting_date,
+        "meeting_date_obj": parsed.meeting_date_obj,
+        "organization": organization,
+        "doc_type": documentType,
+    }
+    if pending:
+        meeting_doc[PENDING_FIELD] = pending
+    if not insert_meeting_if_absent(meetings, key, meeting_doc):
+        return None
+
+    _queue_children(parsed, meeting_ref, batch_writer)
+    return meeting_ref
+
+
+def scrape_from_file(file_path: str, organization: str, documentType: str = "มติ"):
+    if store_meeting(parse_meeting_file(file_path), organization, documentType) is None:
+        print(f"Already exists, skip: {file_path}")
+        return
+    print(f"✅ Queued from file: {file_path}")
 
-for file in INPUT_FILES:
-    scrape_from_file(file, ORGANIZATION, DOC_TYPE)
+if __name__ == "__main__":
+    ensure_indexes(get_db())
+    with get_writer():
+        for file in INPUT_FILES:
+            scrape_from_file(file, ORGANIZATION, DOC_TYPE)
@@ -0,0 +1,218 @@
+import os
+import random
+import subprocess
+import sys
+import time
+import zipfile
+from typing import Iterator, NamedTuple
+
+from lxml import etree
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+W = "{%s}" % W_NS
+W_BODY, W_P, W_R, W_HYPERLINK = W + "body", W + "p", W + "r", W + "hyperlink"
+W_TBL, W_TC = W + "tbl", W + "tc"
+W_T, W_TAB, W_PTAB, W_BR, W_CR, W_NO_BREAK_HYPHEN = W + "t", W + "tab", W + "ptab", W + "br", W + "cr", W + "noBreakHyphen"
+W_TYPE = W + "type"
+
+
+class DocxBlock(NamedTuple):
+    kind: str   # "paragraph" (ย่อหน้าระดับ body) หรือ "cell" (ช่องในตาราง)
+    text: str
+
+
+# -------------------------------
+#  ข้อความของย่อหน้า (กติกาเดียวกับ python-docx Paragraph.text / _Cell.text)
+# -------------------------------
+def _run_text(r) -> str:
+    parts = []
+    for child in r:
+        tag = child.tag
+        if tag == W_T:
+            parts.append(child.text or "")
+        elif tag == W_TAB or tag == W_PTAB:
+            parts.append("\t")
+        elif tag == W_BR:
+            parts.append("\n" if child.get(W_TYPE, "textWrapping") == "textWrapping" else "")
+        elif tag == W_CR:
+            parts.append("\n")
+        elif tag == W_NO_BREAK_HYPHEN:
+            parts.append("-")
+    return "".join(parts)
+
+
+def paragraph_text(p) -> str:
+    """เฉพาะ w:r และ w:hyperlink ที่เป็นลูกตรงของ w:p (run ใน w:ins / w:sdt ไม่นับ เหมือน python-docx)"""
+    parts = []
+    for child in p:
+        if child.tag == W_R:
+            parts.append(_run_text(child))
+        elif child.tag == W_HYPERLINK:
+            parts.extend(_run_text(r) for r in child if r.tag == W_R)
+    return "".join(parts)
+
+
+def _release(elem):
+    """ล้าง element ที่ใช้เสร็จและพี่น้องก่อนหน้า ไม่ให้ tree ค้างในหน่วยความจำ"""
+    elem.clear()
+    parent = elem.getparent()
+    while elem.getprevious() is not None:
+        del parent[0]
+
+
+def iter_docx_blocks(path: str, tables: bool = True) -> Iterator[DocxBlock]:
+    """
+    อ่าน word/document.xml จาก zip แบบ stream (iterparse) yield ตามลำดับในเอกสาร
+      - ย่อหน้าที่เป็นลูกตรงของ w:body (ชุดเดียวกับ python-docx Document.paragraphs)
+      - ถ้า tables=True: ข้อความของแต่ละช่องในตาราง (ย่อหน้าในช่องต่อด้วย \\n แบบ _Cell.text)
+        ตารางซ้อนได้ช่องของตารางในก่อนช่องของตารางนอก
+    """
+    with zipfile.ZipFile(path) as zf, zf.open("word/document.xml") as xml:
+        for _, elem in etree.iterparse(xml, events=("end",), tag=(W_P, W_TC, W_TBL)):
+            parent = elem.getparent()
+            if elem.tag == W_P:
+                if parent is not None and parent.tag == W_BODY:
+                    yield DocxBlock("paragraph", paragraph_text(elem))
+                    _release(elem)
+            elif elem.tag == W_TC:
+                if tables:
+                    yield DocxBlock("cell", "\n".join(paragraph_text(p) for p in elem if p.tag == W_P))
+                elem.clear()
+            elif parent is not None and parent.tag == W_BODY:
+                _release(elem)
+
+
+def iter_docx_text(path: str, tables: bool = True) -> Iterator[str]:
+    for block in iter_docx_blocks(path, tables):
+        yield block.text
+
+
+def read_text_from_file(path: str) -> str:
+    """
+    ข้อความทั้งไฟล์ .txt หรือ .docx (docx: เฉพาะย่อหน้าระดับ body บรรทัดละ 1 ย่อหน้า เหมือนของเดิมที่ใช้ python-docx)
+    parser ของรายงานการประชุมเขียนมาสำหรับย่อหน้าเท่านั้น ข้อความในตารางอ่านแยกด้วย iter_docx_blocks
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".txt":
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    elif ext == ".docx":
+        return "\n".join(iter_docx_text(path, tables=False))
+    else:
+        raise ValueError("รองรับเฉพาะ .txt และ .docx เท่านั้น")
+
+
+# -------------------------------
+#  ตรวจผลเทียบ python-docx และ benchmark บนไฟล์ docx ขนาดใหญ่
+# -------------------------------
+def make_large_docx(path: str, n_paragraphs: int = 20000, n_tables: int = 50, seed: int = 0):
+    """docx สังเคราะห์แบบรายงานการประชุม: ย่อหน้ายาว, tab, line break, hyperlink และตาราง"""
+    from docx import Document
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
+
+    rng = random.Random(seed)
+    words = ["ที่ประชุม", "ได้", "พิจารณา", "เรื่อง", "การ", "กำหนด", "อัตรา", "เงิน", "ส่งเข้า", "กองทุน",
+             "น้ำมัน", "เชื้อเพลิง", "มติ", "เห็นชอบ", "ตามที่", "สำนักงาน", "นโยบาย", "และ", "แผน", "พลังงาน"]
+    doc = Document()
+    table_every = max(n_paragraphs // max(n_tables, 1), 1)
+    for i in range(n_paragraphs):
+        p = doc.add_paragraph(" ".join(rng.choice(words) for _ in range(rng.randint(5, 40))))
+        x = rng.random()
+        if x < 0.05:
+            p.add_run("\tลงชื่อ\tประธาน")
+        elif x < 0.1:
+            p.add_run().add_break()
+            p.add_run("บรรทัดถัดไป")
+        elif x < 0.12:
+            link = OxmlElement("w:hyperlink")
+            r = OxmlElement("w:r")
+            t = OxmlElement("w:t")
+            t.text = f" ลิงก์ {i}"
+            r.append(t)
+            link.append(r)
+            link.set(qn("r:id"), "rId1")
+            p._p.append(link)
+        if i % table_every == table_every - 1:
+            table = doc.add_table(rows=4, cols=3)
+            for row in table.rows:
+                for cell in row.cells:
+                    cell.text = " ".join(rng.choice(words) for _ in range(rng.randint(1, 6)))
+            table.cell(0, 0).add_paragraph("ย่อหน้าที่สองในช่อง")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    doc.save(path)
+
+
+def check_against_python_docx(path: str) -> int:
+    """ย่อหน้า (tables=False), read_text_from_file และข้อความในช่องตารางต้องตรงกับ python-docx ทุกตัว"""
+    from docx import Document
+    doc = Document(path)
+    expected = [p.text for p in doc.paragraphs]
+    got = list(iter_docx_text(path, tables=False))
+    mismatches = sum(a != b for a, b in zip(expected, got)) + abs(len(expected) - len(got))
+    mismatches += read_text_from_file(path) != "\n".join(expected)
+
+    expected_cells = [tc_text for table in doc.tables for tc_text in
+                      ("\n".join(p.text for p in tc.paragraphs) for tc in
+                       (cell for row in table.rows for cell in row.cells))]
+    got_cells = [b.text for b in iter_docx_blocks(path) if b.kind == "cell"]
+    mismatches += sum(a != b for a, b in zip(expected_cells, got_cells)) + abs(len(expected_cells) - len(got_cells))
+    print(f"ย่อหน้า {len(expected):,}, ช่องตาราง {len(expected_cells):,} -> ไม่ตรงกัน {mismatches}")
+    return mismatches
+
+
+def _peak_rss_kb() -> int:
+    # ru_maxrss บน Linux ติดค่าสูงสุดของ process แม่มาหลัง fork/exec ใช้ VmHWM (เริ่มนับใหม่หลัง exec) แทนถ้ามี
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _measure(mode: str, path: str):
+    n = 0
+    if mode == "python_docx":
+        from docx import Document
+        n = len("\n".join(p.text for p in Document(path).paragraphs))
+    elif mode == "stream":
+        n = len("\n".join(iter_docx_text(path, tables=False)))
+    print(n)
+    print(_peak_rss_kb())
+
+
+def benchmark(path: str = "ScrapingData/Data/large_minutes.docx", n_paragraphs: int = 20000):
+    make_large_docx(path, n_paragraphs)
+    check_against_python_docx(path)
+    size_mb = os.path.getsize(path) / 1e6
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    results = {}
+    for mode in ("baseline", "python_docx", "stream"):
+        t0 = time.perf_counter()
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--measure", mode, path],
+            capture_output=True, text=True, check=True, cwd=os.getcwd(),
+            env={**os.environ, "PYTHONPATH": here},
+        )
+        results[mode] = (time.perf_counter() - t0, int(out.stdout.strip().splitlines()[-1]))
+    os.remove(path)
+
+    t_base, base = results["baseline"]
+    print(f"📊 docx {n_paragraphs:,} ย่อหน้า ({size_mb:.1f} MB) เวลารวมเริ่ม process")
+    for mode, label in (("python_docx", "python-docx Document"), ("stream", "iterparse (stream)")):
+        t, rss = results[mode]
+        print(f"  {label:<22} {t - t_base:6.2f} s   peak RSS +{(rss - base) / 1024:6.1f} MB")
+    return results
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--measure":
+        _measure(sys.argv[2], sys.argv[3])
+    else:
+        benchmark()
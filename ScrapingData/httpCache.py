@@ -0,0 +1,178 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import NamedTuple, Optional
+
+import requests
+
+# -------------------------------
+#  ค่าเริ่มต้นของ cache
+# -------------------------------
+CACHE_DIR = "ScrapingData/Data/http_cache"
+DEFAULT_TTL = 24 * 60 * 60              # ภายใน TTL ใช้ของใน cache เลยไม่ยิง request
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024   # เกินขนาดนี้จะลบรายการที่ใช้ล่าสุดนานที่สุดทิ้ง (LRU)
+
+
+class CachedResponse(NamedTuple):
+    text: str
+    status: int            # 200 = โหลดใหม่, 304 = revalidate แล้วไม่เปลี่ยน, 0 = ยังไม่หมด TTL ไม่ได้ยิง request
+    from_cache: bool
+    not_modified: bool
+
+
+class HttpCache:
+    """
+    Cache ของ HTML บนดิสก์ (index เป็น SQLite, body เก็บแบบ content-addressed ตาม sha256 ของเนื้อหา)
+    เก็บ ETag / Last-Modified / เวลาที่ดึงไว้ต่อ URL แล้วใช้ If-None-Match / If-Modified-Since
+    ตอน revalidate ใช้ร่วมกันหลาย thread ได้
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR, ttl: float = DEFAULT_TTL,
+                 max_bytes: int = DEFAULT_MAX_BYTES, session: Optional[requests.Session] = None):
+        self.cache_dir = cache_dir
+        self.body_dir = os.path.join(cache_dir, "bodies")
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.session = session or requests.Session()
+        os.makedirs(self.body_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(cache_dir, "index.sqlite"), check_same_thread=False)
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                body_hash TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries(last_access)")
+        self._db.commit()
+        with self._lock:
+            self._evict()
+
+    # ---------- index ----------
+    def lookup(self, url: str) -> Optional[dict]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT url, body_hash, size, etag, last_modified, fetched_at FROM entries WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if not row:
+            return None
+        keys = ("url", "body_hash", "size", "etag", "last_modified", "fetched_at")
+        return dict(zip(keys, row))
+
+    def is_fresh(self, entry: dict) -> bool:
+        return time.time() - entry["fetched_at"] < self.ttl
+
+    def conditional_headers(self, entry: Optional[dict]) -> dict:
+        headers = {}
+        if entry:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def _body_path(self, body_hash: str) -> str:
+        return os.path.join(self.body_dir, body_hash[:2], body_hash + ".html")
+
+    def read_body(self, entry: dict) -> Optional[str]:
+        """อ่าน body และขยับ last_access (LRU) คืน None ถ้าไฟล์หายไป"""
+        try:
+            with open(self._body_path(entry["body_hash"]), "r", encoding="utf-8") as f:
+                text = f.read()
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            self._db.execute("UPDATE entries SET last_access = ? WHERE url = ?", (time.time(), entry["url"]))
+            self._db.commit()
+        return text
+
+    def store(self, url: str, text: str, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        data = text.encode("utf-8")
+        body_hash = hashlib.sha256(data).hexdigest()
+        path = self._body_path(body_hash)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        now = time.time()
+        with self._lock:
+            old = self._db.execute("SELECT body_hash FROM entries WHERE url = ?", (url,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, body_hash, len(data), etag, last_modified, now, now),
+            )
+            self._db.commit()
+            if old and old[0] != body_hash:
+                self._drop_body_if_unused(old[0])
+            self._evict()
+
+    def mark_revalidated(self, url: str):
+        """ได้ 304 กลับมา -> นับ TTL ใหม่จากตอนนี้"""
+        now = time.time()
+        with self._lock:
+            self._db.execute("UPDATE entries SET fetched_at = ?, last_access = ? WHERE url = ?", (now, now, url))
+            self._db.commit()
+
+    # ---------- eviction ----------
+    def _drop_body_if_unused(self, body_hash: str):
+        used = self._db.execute("SELECT 1 FROM entries WHERE body_hash = ? LIMIT 1", (body_hash,)).fetchone()
+        if not used:
+            try:
+                os.remove(self._body_path(body_hash))
+            except FileNotFoundError:
+                pass
+
+    def _evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._db.execute("SELECT url, body_hash, size FROM entries ORDER BY last_access").fetchall()
+        for url, body_hash, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM entries WHERE url = ?", (url,))
+            self._drop_body_if_unused(body_hash)
+            total -= size
+        self._db.commit()
+
+    # ---------- fetch ----------
+    def fetch(self, url: str, timeout: float = 30) -> CachedResponse:
+        """
+        ดึง url โดยดู cache ก่อน:
+          - ยังไม่หมด TTL -> คืนจาก cache ไม่ยิง request
+          - หมด TTL -> ยิงแบบ conditional ถ้าได้ 304 คืน body เดิม
+          - ไม่มีใน cache / เนื้อหาเปลี่ยน -> โหลดใหม่แล้วเก็บลง cache
+        """
+        entry = self.lookup(url)
+        if entry and self.is_fresh(entry):
+            text = self.read_body(entry)
+            if text is not None:
+                return CachedResponse(text, 0, True, True)
+            entry = None
+
+        resp = self.session.get(url, headers=self.conditional_headers(entry), timeout=timeout)
+        if resp.status_code == 304 and entry:
+            text = self.read_body(entry)
+            if text is not None:
+                self.mark_revalidated(url)
+                return CachedResponse(text, 304, True, True)
+            resp = self.session.get(url, timeout=timeout)
+
+        resp.raise_for_status()
+        self.store(url, resp.text, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+        return CachedResponse(resp.text, resp.status_code, False, False)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+        self.session.close()
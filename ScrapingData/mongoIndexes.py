@@ -0,0 +1,76 @@
+from pymongo import ASCENDING
+from pymongo.errors import DuplicateKeyError, OperationFailure
+
+MEETING_KEY_INDEX = "organization_1_meeting_no_full_1"
+
+# run id ของรอบที่ลูก (attendees / agendas / details) ของ meeting ยังค้างใน BatchWriter ลบทิ้งเมื่อ flush ครบ
+PENDING_FIELD = "ingest_pending"
+PENDING_PROJECTION = {"_id": 0, "meeting_ref": 1, PENDING_FIELD: 1}
+
+# query กันซ้ำ: projection มีแค่ field ใน index และไม่เอา _id -> เป็น covered query ไม่ต้องอ่าน document
+MEETING_KEY_PROJECTION = {"_id": 0, "organization": 1, "meeting_no_full": 1}
+
+
+def ensure_indexes(db):
+    """
+    สร้าง index ที่ loader ทุกตัวใช้ เรียกซ้ำได้ทุกครั้งที่เริ่มรัน (create_index ไม่ทำอะไรถ้ามีอยู่แล้ว)
+      - meetings: unique (organization, meeting_no_full) สำหรับ upsert กันซ้ำ
+        (partial เฉพาะที่มี meeting_no_full เพราะ OCR loader ยอมให้ว่างได้หลายรายการ)
+      - meetings: meeting_ref, meeting_date_obj
+      - attendees: meeting_ref
+      - agendas / details: (meeting_ref, agenda_no) ใช้กับ query ที่มีแค่ meeting_ref ได้ด้วย (prefix)
+    """
+    meetings = db["meetings"]
+    try:
+        meetings.create_index(
+            [("organization", ASCENDING), ("meeting_no_full", ASCENDING)],
+            name=MEETING_KEY_INDEX,
+            unique=True,
+            partialFilterExpression={"meeting_no_full": {"$gt": ""}},
+        )
+    except OperationFailure as e:
+        # มักเกิดเพราะใน collection มี meeting ซ้ำอยู่แล้ว ต้องลบซ้ำก่อน ระหว่างนี้ upsert ยังกันซ้ำได้แต่ไม่กัน race
+        print(f"⚠️  สร้าง unique index ของ meetings ไม่ได้: {e}")
+    meetings.create_index([("meeting_ref", ASCENDING)])
+    meetings.create_index([("meeting_date_obj", ASCENDING)])
+
+    db["attendees"].create_index([("meeting_ref", ASCENDING)])
+    for name in ("agendas", "details"):
+        db[name].create_index([("meeting_ref", ASCENDING), ("agenda_no", ASCENDING)])
+
+
+def meeting_exists(meetings_col, key: dict) -> bool:
+    """เช็คซ้ำแบบเร็ว (covered query) ก่อนเสียเลข meeting_ref"""
+    return meetings_col.find_one(key, MEETING_KEY_PROJECTION) is not None
+
+
+def insert_meeting_if_absent(meetings_col, key: dict, meeting_doc: dict) -> bool:
+    """
+    upsert ด้วย $setOnInsert บน unique index แทน find แล้วค่อย insert
+    คืน True ถ้าใส่ใหม่, False ถ้ามี meeting นี้อยู่แล้ว (รวมกรณี worker อื่นใส่ตัดหน้า)
+    """
+    fields = {k: v for k, v in meeting_doc.items() if k not in key}
+    try:
+        res = meetings_col.update_one(key, {"$setOnInsert": fields}, upsert=True)
+    except DuplicateKeyError:
+        return False
+    return res.upserted_id is not None
+
+
+def mark_complete(meetings_col, meeting_refs):
+    """ลบ PENDING_FIELD ของ meeting ที่ลูกถูก flush ลง Mongo ครบแล้ว"""
+    if meeting_refs:
+        meetings_col.update_many({"meeting_ref": {"$in": list(meeting_refs)}}, {"$unset": {PENDING_FIELD: ""}})
+
+
+def flush_and_mark_complete(meetings_col, batch_writer, meeting_refs) -> bool:
+    """
+    flush BatchWriter แล้วค่อย mark_complete คืน False (ไม่ mark) ถ้า flush มี error รายแถว
+    meeting ที่ยังค้าง PENDING_FIELD จะถูกเขียนลูกใหม่ทั้งชุดในรอบถัดไป
+    """
+    errors = batch_writer.errors
+    batch_writer.flush()
+    if batch_writer.errors != errors:
+        return False
+    mark_complete(meetings_col, meeting_refs)
+    return True
@@ -0,0 +1,260 @@
+import json
+import os
+import random
+import subprocess
+import sys
+from typing import Iterable, Iterator
+
+CHUNK_SIZE = 1 << 20
+_WS = " \t\n\r"
+_LINE_BREAKS = "\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+
+
+class _JsonStream:
+    """
+    อ่าน JSON จากไฟล์ทีละ chunk แล้ว decode ทีละค่า (raw_decode) แทนการ json.load ทั้งไฟล์
+    เก็บใน buffer แค่ส่วนที่ยังไม่ได้ใช้ จึงใช้หน่วยความจำประมาณขนาดของค่าที่ใหญ่ที่สุดค่าเดียว (เช่น 1 page)
+    """
+
+    def __init__(self, f, chunk_size: int = CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """คืนอักขระถัดไปที่ไม่ใช่ช่องว่าง ('' ถ้าจบไฟล์)"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WS:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, ch: str):
+        if self.peek() != ch:
+            raise ValueError(f"JSON ไม่ถูกต้อง: ต้องการ {ch!r} ที่ตำแหน่ง {self.pos}")
+        self.pos += 1
+
+    def read_value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # ค่าที่ไปจบที่ท้าย buffer อาจถูกตัดกลาง (เช่นตัวเลข) -> อ่านต่อแล้ว decode ใหม่
+            if end == len(self.buf) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def iter_array(self) -> Iterator:
+        """วนค่าใน array ทีละตัว (cursor ต้องอยู่ที่ '[')"""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.read_value()
+            ch = self.peek()
+            self.pos += 1
+            if ch == "]":
+                return
+            if ch != ",":
+                raise ValueError(f"JSON ไม่ถูกต้อง: ต้องการ ',' หรือ ']' แต่เจอ {ch!r}")
+
+    def iter_pages_of_object(self) -> Iterator[dict]:
+        """เดิน object หนึ่งตัว: ค่า 'pages' อ่านทีละ page ส่วน key อื่นอ่านแล้วทิ้ง"""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.read_value()
+            self.expect(":")
+            if key == "pages" and self.peek() == "[":
+                yield from self.iter_array()
+            else:
+                self.read_value()
+            ch = self.peek()
+            self.pos += 1
+            if ch == "}":
+                return
+            if ch != ",":
+                raise ValueError(f"JSON ไม่ถูกต้อง: ต้องการ ',' หรือ '}}' แต่เจอ {ch!r}")
+
+
+def iter_ocr_pages(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """
+    yield markdown ของแต่ละ page ทีละหน้า (ข้ามหน้าที่ว่าง) โดยไม่โหลด JSON ทั้งไฟล์
+    รองรับรูปแบบเดียวกับ load_markdown_from_ocr_json:
+      - [ {"pages": [...]}, ... ]  (list ของผล OCR)
+      - {"pages": [...]}
+      - "ข้อความล้วน"
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        stream = _JsonStream(f, chunk_size)
+        first = stream.peek()
+        if first == "[":
+            yield from _iter_list_items(stream)
+            return
+        if first == "{":
+            for page in stream.iter_pages_of_object():
+                md = page.get("markdown", "") if isinstance(page, dict) else ""
+                if md:
+                    yield md
+            return
+        if first == '"':
+            text = stream.read_value()
+            if text:
+                yield text
+
+
+def _iter_list_items(stream: _JsonStream) -> Iterator[str]:
+    """element ที่เป็น object เดินหา pages ได้เลยโดยไม่ต้อง decode ทั้งก้อน"""
+    stream.expect("[")
+    if stream.peek() == "]":
+        return
+    while True:
+        if stream.peek() == "{":
+            for page in stream.iter_pages_of_object():
+                md = page.get("markdown", "") if isinstance(page, dict) else ""
+                if md:
+                    yield md
+        else:
+            stream.read_value()
+        ch = stream.peek()
+        stream.pos += 1
+        if ch == "]":
+            return
+        if ch != ",":
+            raise ValueError(f"JSON ไม่ถูกต้อง: ต้องการ ',' หรือ ']' แต่เจอ {ch!r}")
+
+
+def _lines_of_pages(pages: Iterable[str]) -> Iterator[str]:
+    prev_end = ""
+    for md in pages:
+        # join ใส่ "\n" คั่นหน้า: ถ้าหน้าก่อนจบด้วยตัวขึ้นบรรทัด จะได้บรรทัดว่างเพิ่ม 1 บรรทัด
+        # ยกเว้นจบด้วย "\r" เดี่ยว ๆ ซึ่งรวมกับ "\n" ที่ใส่เป็น "\r\n" (ขึ้นบรรทัดครั้งเดียว)
+        if prev_end and prev_end in _LINE_BREAKS and prev_end != "\r":
+            yield ""
+        yield from md.splitlines()
+        if md:
+            prev_end = md[-1]
+
+
+def iter_ocr_lines(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """
+    yield บรรทัดทีละบรรทัด ให้ผลเหมือน "\\n".join(pages).splitlines()
+    แต่ถือ markdown ไว้ในหน่วยความจำทีละหน้าเท่านั้น
+    """
+    return _lines_of_pages(iter_ocr_pages(path, chunk_size))
+
+
+def check_against_join(n: int = 20000, seed: int = 0) -> int:
+    """สุ่มหน้าที่ขึ้นต้น / ลงท้ายด้วยตัวขึ้นบรรทัดแบบต่าง ๆ เทียบกับ "\\n".join(pages).splitlines()"""
+    rng = random.Random(seed)
+    pieces = ["ก", "ข ค", "\n", "\r", "\r\n", "\x0c", "\u2028", ""]
+    cases = [["a\r", "b"], ["a\r\n", "b"], ["a\r", "\nb"], ["a\n", "b"]]
+    cases += [["".join(rng.choice(pieces) for _ in range(rng.randint(1, 4))) or "x"
+               for _ in range(rng.randint(2, 5))] for _ in range(n)]
+    mismatches = [pages for pages in cases if list(_lines_of_pages(pages)) != "\n".join(pages).splitlines()]
+    print(f"🔎 เทียบกับ join + splitlines {len(cases)} กรณี: ไม่ตรง {len(mismatches)}")
+    for pages in mismatches[:5]:
+        print(f"  {pages!r}")
+    return len(mismatches)
+
+
+# -------------------------------
+#  Benchmark: peak RSS ของ json.load ทั้งไฟล์ vs อ่านแบบ stream
+# -------------------------------
+def make_synthetic_ocr_json(path: str, n_pages: int = 500, lines_per_page: int = 60, as_list: bool = True):
+    """สร้างไฟล์ผล OCR ปลอม (โครงสร้างเหมือน output จริง: pages[*].markdown + ข้อมูลประกอบ)"""
+    line = "ที่ประชุมได้พิจารณาเรื่องการกำหนดอัตราเงินส่งเข้ากองทุนน้ำมันเชื้อเพลิง " * 3
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('[{"model": "ocr", "pages": [' if as_list else '{"model": "ocr", "pages": [')
+        for i in range(n_pages):
+            if i:
+                f.write(",")
+            md = "\n".join(f"{line} ({i}-{j})" for j in range(lines_per_page))
+            page = {
+                "index": i,
+                "markdown": md,
+                "images": [],
+                "dimensions": {"dpi": 200, "height": 2339, "width": 1654},
+            }
+            f.write(json.dumps(page, ensure_ascii=False))
+        f.write('], "usage_info": {"pages_processed": %d}}' % n_pages)
+        f.write("]" if as_list else "")
+
+
+def _peak_rss_kb() -> int:
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _measure(mode: str, path: str):
+    n = 0
+    if mode == "baseline":
+        pass
+    elif mode == "json_load":
+        # เหมือน load_markdown_from_ocr_json เดิม + การแตกบรรทัดใน parser
+        def norm(s):
+            return " ".join(s.split())
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        pages = [p.get("markdown", "") for item in data for p in item.get("pages", [])]
+        combined = "\n".join(p for p in pages if p)
+        n = len([norm(l) for l in combined.splitlines() if norm(l)])
+    elif mode == "stream_lines":
+        n = sum(1 for l in iter_ocr_lines(path) if l.strip())
+    print(n)
+    print(_peak_rss_kb())
+
+
+def benchmark(n_pages: int = 500, path: str = "ScrapingData/Data/synthetic_ocr.json"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    make_synthetic_ocr_json(path, n_pages)
+    size_mb = os.path.getsize(path) / 1e6
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    results = {}
+    for mode in ("baseline", "json_load", "stream_lines"):
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--measure", mode, path],
+            capture_output=True, text=True, check=True, cwd=os.getcwd(),
+            env={**os.environ, "PYTHONPATH": here},
+        )
+        results[mode] = int(out.stdout.strip().splitlines()[-1])
+
+    base = results["baseline"]
+    print(f"📊 ไฟล์ OCR สังเคราะห์ {n_pages} หน้า ({size_mb:.1f} MB)")
+    print(f"  json.load + join ทั้งไฟล์: peak RSS {results['json_load'] / 1024:7.1f} MB (+{(results['json_load'] - base) / 1024:.1f})")
+    print(f"  iter_ocr_lines (stream):  peak RSS {results['stream_lines'] / 1024:7.1f} MB (+{(results['stream_lines'] - base) / 1024:.1f})")
+    return results
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--measure":
+        _measure(sys.argv[2], sys.argv[3])
+    else:
+        check_against_join()
+        benchmark()
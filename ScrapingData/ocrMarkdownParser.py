@@ -0,0 +1,369 @@
+import random
+import time
+from datetime import datetime
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from thaiDate import parse_thai_date
+from thaiPatterns import (
+    THAI2AR, MONTH_RE, SPACES_TABS_RE, COLUMN_GAP_RE, ROLE_WORDS_END_RE,
+    INLINE_MATH_RE, MEETING_SEQ_RE, AGENDA_HEAD_RE, AGENDA_HEAD_NO_RE, ATTENDEES_HEAD_RE,
+    ATTENDEE_NAME_RE, NUMBERED_ITEM_RE, SUMMARY_BLOCK_RE, RESOLUTION_BLOCK_RE, DETAIL_MARK_RE,
+)
+
+HEADER_NO_LINES = 10    # หา 'ครั้งที่' ใน 10 บรรทัดแรก
+HEADER_DATE_LINES = 15  # หาวันที่ใน 15 บรรทัดแรก
+
+
+def norm(s: str) -> str:
+    if not s:
+        return ""
+    s = s.replace("\xa0", " ")
+    s = s.replace("\u200b", "")
+    return SPACES_TABS_RE.sub(" ", s.strip())
+
+
+def split_position_role(line: str) -> Tuple[str, str]:
+    """แยก 'ตำแหน่ง .... บทบาท' -> (position, role)"""
+    line = norm(line)
+    parts = COLUMN_GAP_RE.split(line)
+    parts = [p for p in parts if p]
+    if len(parts) >= 2:
+        return parts[0], parts[-1]
+    m = ROLE_WORDS_END_RE.search(line)
+    if m:
+        role = m.group(1)
+        position = norm(line[:m.start()].rstrip(" ."))
+        return position, role
+    return line, ""
+
+
+def strip_inline_math(s: str) -> str:
+    return INLINE_MATH_RE.sub(r"\1", s)
+
+
+class ParsedOcrDocument(NamedTuple):
+    """ผลจากการอ่าน markdown หนึ่งเอกสาร (agendas/details/attendees ยังไม่มี meeting_ref)"""
+    title: str
+    meeting_no_full: str
+    meeting_seq: Optional[int]
+    meeting_date: str
+    meeting_date_obj: Optional[datetime]
+    agendas: List[dict]
+    details: List[dict]
+    attendees: List[dict]
+
+
+class OcrMarkdownParser:
+    """
+    อ่าน markdown จาก OCR ทีละบรรทัดรอบเดียว แล้วได้ทั้งส่วนหัว / agendas / details / attendees
+    แทนการให้ parser แต่ละตัว splitlines + regex ทั้งเอกสารเอง
+      - ทุก regex ทำงานในบรรทัดเดียว ไม่มี [\\s\\S]*? วิ่งข้ามทั้งเอกสาร เวลาจึงโตเป็นเส้นตรงตามความยาว
+      - details ใช้ state machine แยก 2 ตัว (สรุปสาระสำคัญ / มติ) ให้ผลเหมือน findall ของ
+        SUMMARY_BLOCK_RE / RESOLUTION_BLOCK_RE เดิม
+    """
+
+    def __init__(self):
+        # ส่วนหัว
+        self.n_lines = 0
+        self.title = ""
+        self.meeting_no_full = ""
+        self.meeting_seq = None
+        self.meeting_date = ""
+        self._no_found = False
+        # agendas
+        self.agendas: List[dict] = []
+        # details: None = กำลังหาหัว, list = กำลังเก็บเนื้อหา (ทีละบรรทัด)
+        self.summaries: List[str] = []
+        self.resolutions: List[str] = []
+        self._summary = None
+        self._resolution = None
+        # attendees: 0 = ยังไม่เจอ 'ผู้มาประชุม', 1 = อยู่ในช่วงรายชื่อ, 2 = จบช่วงแล้ว
+        self.attendees: List[dict] = []
+        self._att_state = 0
+        self._att_pending = None
+
+    def feed(self, line: str):
+        stripped = line.strip()
+        n = norm(stripped)
+        if n:
+            self._feed_header(n)
+            self._feed_agenda(n)
+        self._feed_details(line)
+        self._feed_attendee(stripped, n)
+
+    def _feed_header(self, n: str):
+        idx = self.n_lines
+        self.n_lines += 1
+        if idx == 0:
+            self.title = n
+        if idx < HEADER_NO_LINES and not self._no_found and "ครั้งที่" in n:
+            self._no_found = True
+            self.meeting_no_full = strip_inline_math(n)
+            m_seq = MEETING_SEQ_RE.search(n)
+            if m_seq:
+                self.meeting_seq = int(m_seq.group(1))
+        if idx < HEADER_DATE_LINES and not self.meeting_date and MONTH_RE.search(n):
+            self.meeting_date = n
+
+    def _feed_agenda(self, n: str):
+        matching = AGENDA_HEAD_NO_RE.match(n)
+        if matching:
+            no = int(norm(matching.group(1)).translate(THAI2AR))
+            title = norm(matching.group(2))
+            self.agendas.append({
+                "agenda_no": no,
+                "agenda_title": f"เรื่องที่ {no} {title}".strip()
+            })
+
+    def _feed_details(self, line: str):
+        marks = [(m.start(), m.lastgroup, m.end(m.lastgroup)) for m in DETAIL_MARK_RE.finditer(line)]
+
+        # สรุปสาระสำคัญ: เก็บจนเจอ 'มติ' (ที่ไหนก็ได้) หรือหัววาระถัดไป
+        start = 0
+        for pos, kind, end in marks:
+            if self._summary is None:
+                if kind == "s":
+                    self._summary = []
+                    start = end
+            elif pos >= start and (kind == "a" or (kind == "r" and line.startswith("มติ", pos))):
+                self._summary.append(line[start:pos])
+                self.summaries.append("\n".join(self._summary).strip())
+                self._summary = None
+        if self._summary is not None:
+            self._summary.append(line[start:])
+
+        # มติ: เก็บจนเจอหัววาระถัดไป
+        start = 0
+        for pos, kind, end in marks:
+            if self._resolution is None:
+                if kind == "r":
+                    self._resolution = []
+                    start = end
+            elif pos >= start and kind == "a":
+                self._resolution.append(line[start:pos])
+                self.resolutions.append("\n".join(self._resolution).strip())
+                self._resolution = None
+        if self._resolution is not None:
+            self._resolution.append(line[start:])
+
+    def _feed_attendee(self, stripped: str, n: str):
+        if self._att_state == 0:
+            if ATTENDEES_HEAD_RE.search(stripped):
+                self._att_state = 1
+            return
+        if self._att_state == 2:
+            return
+
+        if NUMBERED_ITEM_RE.match(stripped) or AGENDA_HEAD_RE.match(stripped):
+            self._flush_attendee("")
+            self._att_state = 2
+            return
+        if self._att_pending is not None:
+            nm = ATTENDEE_NAME_RE.match(stripped)
+            if nm:
+                # บรรทัดนี้เป็นชื่อของตำแหน่งก่อนหน้า
+                self._flush_attendee(norm(nm.group(1)))
+                return
+            self._flush_attendee("")
+        if n:
+            self._att_pending = n
+
+    def _flush_attendee(self, name: str):
+        if self._att_pending is None:
+            return
+        position, role = split_position_role(self._att_pending)
+        self.attendees.append({
+            "position": position,
+            "role": role,
+            "name": name
+        })
+        self._att_pending = None
+
+    def finish(self) -> ParsedOcrDocument:
+        if self._summary is not None:
+            self.summaries.append("\n".join(self._summary).strip())
+            self._summary = None
+        if self._resolution is not None:
+            self.resolutions.append("\n".join(self._resolution).strip())
+            self._resolution = None
+        self._flush_attendee("")
+
+        details = []
+        for i in range(max(len(self.summaries), len(self.resolutions))):
+            details.append({
+                "agenda_no": i + 1,
+                "summary": self.summaries[i] if i < len(self.summaries) else "",
+                "resolution": self.resolutions[i] if i < len(self.resolutions) else "",
+            })
+
+        return ParsedOcrDocument(
+            self.title, self.meeting_no_full, self.meeting_seq,
+            self.meeting_date, parse_thai_date(self.meeting_date),
+            self.agendas, details, self.attendees,
+        )
+
+
+def parse_ocr_lines(lines: Iterable[str]) -> ParsedOcrDocument:
+    """parse จาก iterator ของบรรทัด (เช่น ocrJsonStream.iter_ocr_lines) โดยไม่ต้องมีทั้งเอกสารใน memory"""
+    parser = OcrMarkdownParser()
+    for line in lines:
+        parser.feed(line)
+    return parser.finish()
+
+
+def parse_ocr_markdown(text: str) -> ParsedOcrDocument:
+    return parse_ocr_lines(text.splitlines())
+
+
+# -------------------------------
+#  parser เดิม (4 ตัว อ่านทั้งเอกสารคนละรอบ) ไว้เทียบผล + benchmark
+# -------------------------------
+def _legacy_parse_header_fields(text: str):
+    lines = [norm(l) for l in text.splitlines() if norm(l)]
+    title = lines[0] if lines else ""
+    meeting_no_full = ""
+    meeting_seq = None
+    meeting_date = ""
+    for l in lines[:10]:
+        if "ครั้งที่" in l:
+            meeting_no_full = strip_inline_math(l)
+            m_seq = MEETING_SEQ_RE.search(l)
+            if m_seq:
+                meeting_seq = int(m_seq.group(1))
+            break
+    for l in lines[:15]:
+        if MONTH_RE.search(l):
+            meeting_date = l
+            break
+    return title, meeting_no_full, meeting_seq, meeting_date, parse_thai_date(meeting_date)
+
+
+def _legacy_parse_agendas(text: str) -> List[dict]:
+    agendas = []
+    for l in [norm(l) for l in text.splitlines() if norm(l)]:
+        matching = AGENDA_HEAD_NO_RE.match(l)
+        if matching:
+            no = int(norm(matching.group(1)).translate(THAI2AR))
+            title = norm(matching.group(2))
+            agendas.append({"agenda_no": no, "agenda_title": f"เรื่องที่ {no} {title}".strip()})
+    return agendas
+
+
+def _legacy_parse_details(text: str) -> List[dict]:
+    summaries = [s.strip() for s in SUMMARY_BLOCK_RE.findall(text)]
+    resolutions = [r.strip() for r in RESOLUTION_BLOCK_RE.findall(text)]
+    return [{
+        "agenda_no": i + 1,
+        "summary": summaries[i] if i < len(summaries) else "",
+        "resolution": resolutions[i] if i < len(resolutions) else "",
+    } for i in range(max(len(summaries), len(resolutions)))]
+
+
+def _legacy_parse_attendees(text: str) -> List[dict]:
+    lines = [l.strip() for l in text.splitlines()]
+    attendees = []
+    try:
+        start = next(i for i, l in enumerate(lines) if ATTENDEES_HEAD_RE.search(l))
+    except StopIteration:
+        return attendees
+    end = len(lines)
+    for i in range(start + 1, len(lines)):
+        if NUMBERED_ITEM_RE.match(lines[i]) or AGENDA_HEAD_RE.match(lines[i]):
+            end = i
+            break
+    i = start + 1
+    while i < end:
+        line = norm(lines[i])
+        if not line:
+            i += 1
+            continue
+        name = ""
+        jump = 1
+        if i + 1 < end:
+            nm = ATTENDEE_NAME_RE.match(lines[i + 1].strip())
+            if nm:
+                name = norm(nm.group(1))
+                jump = 2
+        position, role = split_position_role(line)
+        attendees.append({"position": position, "role": role, "name": name})
+        i += jump
+    return attendees
+
+
+def _legacy_parse(text: str) -> ParsedOcrDocument:
+    return ParsedOcrDocument(
+        *_legacy_parse_header_fields(text),
+        _legacy_parse_agendas(text), _legacy_parse_details(text), _legacy_parse_attendees(text),
+    )
+
+
+_SAMPLE_LINES = [
+    "รายงานการประชุมคณะกรรมการกำกับกิจการพลังงาน",
+    "ครั้งที่ 4/2567 (ครั้งที่ 170)",
+    "ครั้งที่ $4 / 2567$",
+    "วันพุธที่ 25 ธันวาคม 2567 เวลา 13.30 น.",
+    "ณ ห้องประชุม ชั้น 4",
+    "ผู้มาประชุม",
+    "รัฐมนตรีว่าการกระทรวงพลังงาน      ประธานกรรมการ",
+    "(นายตัวอย่าง ทดสอบ)",
+    "ปลัดกระทรวงพลังงาน กรรมการ",
+    "ผู้อำนวยการสำนักงานนโยบายและแผนพลังงาน กรรมการและเลขานุการ",
+    "  (นางสาวตัวอย่าง  ทดสอบ)  ",
+    "1. ให้ดำเนินการต่อไป",
+    "เรื่องที่ 1 การกำหนดอัตราเงินส่งเข้ากองทุนน้ำมันเชื้อเพลิง",
+    "วาระที่ ๒ รายงานสถานการณ์ราคาน้ำมัน",
+    "เรื่องที่3",
+    "สรุปสาระสำคัญ",
+    "สรุป สาระ สำคัญ : ฝ่ายเลขานุการรายงานว่า",
+    "มติของที่ประชุม",
+    "มติ : รับทราบ",
+    "ที่ประชุมมีมติ เห็นชอบตามที่เสนอ",
+    "ที่ประชุมพิจารณาแล้วมีมติให้ดำเนินการ ดูเรื่องที่ 2 ประกอบ",
+    "กระทรวงพลังงานได้รายงานสถานการณ์ราคาน้ำมันเชื้อเพลิงในตลาดโลก",
+    "ข้อความ\xa0ที่มี\u200bอักขระพิเศษ\t\tและแท็บ",
+    "",
+    "   ",
+]
+
+
+def _random_document(rng: random.Random, n_lines: int) -> str:
+    return "\n".join(rng.choice(_SAMPLE_LINES) for _ in range(n_lines))
+
+
+def check_against_legacy(n_docs: int = 2000, seed: int = 0) -> int:
+    rng = random.Random(seed)
+    mismatches = 0
+    for _ in range(n_docs):
+        text = _random_document(rng, rng.randint(0, 80))
+        if rng.random() < 0.2:
+            text += "\n"
+        if parse_ocr_markdown(text) != _legacy_parse(text):
+            mismatches += 1
+            if mismatches <= 3:
+                print(f"  ไม่ตรง: {text[:200]!r}")
+    print(f"🔎 เทียบกับ parser เดิม {n_docs} เอกสาร: ไม่ตรง {mismatches}")
+    return mismatches
+
+
+def benchmark(base_docs: int = 20, doublings: int = 6, seed: int = 1):
+    """ต่อเอกสารซ้ำให้ยาวขึ้นทีละ 2 เท่า แล้ววัดเวลา/บรรทัด ถ้าโตเป็นเส้นตรงค่านี้ต้องคงที่"""
+    rng = random.Random(seed)
+    doc = "\n".join(_random_document(rng, 120) for _ in range(base_docs))
+
+    print("📊 เวลา parse ต่อบรรทัด (µs) เมื่อเอกสารยาวขึ้น")
+    print(f"  {'บรรทัด':>8} {'เดิม 4 รอบ':>12} {'รอบเดียว':>10}")
+    for k in range(doublings):
+        text = "\n".join([doc] * (2 ** k))
+        n_lines = text.count("\n") + 1
+        t0 = time.perf_counter()
+        _legacy_parse(text)
+        t_old = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        parse_ocr_markdown(text)
+        t_new = time.perf_counter() - t0
+        print(f"  {n_lines:>8} {t_old / n_lines * 1e6:>12.2f} {t_new / n_lines * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    check_against_legacy()
+    benchmark()
@@ -0,0 +1,85 @@
+import json
+import os
+import sqlite3
+import time
+from typing import Optional, Tuple
+
+import xxhash
+
+MANIFEST_NAME = "pdf_manifest.sqlite"
+RENDER_VERSION = 1  # เพิ่มเมื่อหน้าตา PDF (save_pdf / style) เปลี่ยน ให้สร้างใหม่ทุกไฟล์
+
+
+def meeting_hash(data) -> str:
+    """hash ของข้อมูลการประชุมที่ parse แล้ว (ทุก field ที่ลง PDF) + RENDER_VERSION"""
+    payload = json.dumps([RENDER_VERSION, *data], ensure_ascii=False, separators=(",", ":"))
+    return xxhash.xxh3_128_hexdigest(payload.encode("utf-8"))
+
+
+def _with_suffix(path: str, url: str) -> str:
+    """ชื่อไฟล์สำรองเมื่อชื่อชน: ต่อท้ายด้วย hash ของ url (รันซ้ำได้ชื่อเดิม)"""
+    root, ext = os.path.splitext(path)
+    return f"{root}_{xxhash.xxh32_hexdigest(url.encode('utf-8'))}{ext}"
+
+
+class PdfManifest:
+    """
+    บันทึกว่าไฟล์ PDF แต่ละไฟล์สร้างจาก url ไหน ด้วยข้อมูล hash อะไร (SQLite ในโฟลเดอร์ output)
+      - ข้อมูลเหมือนเดิม + ไฟล์ยังอยู่ -> ข้ามการสร้าง PDF
+      - ชื่อไฟล์ (จาก safe_title + meeting_seq) ตรงกับของ url อื่น -> ใช้ชื่อที่ต่อท้าย hash ของ url แทน
+    ใช้จาก thread เดียว (thread หลักของ build_pdfs)
+    """
+
+    def __init__(self, output_dir: str):
+        os.makedirs(output_dir, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(output_dir, MANIFEST_NAME))
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS pdfs (
+                path TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                built_at REAL NOT NULL
+            )"""
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS pdfs_url ON pdfs(url)")
+        self._db.commit()
+        self._claimed = {}  # path -> url ที่จองไว้ในรอบนี้ (ชนกันเองในรอบเดียวกัน)
+        self.built = self.skipped = self.collisions = 0
+
+    def _owner(self, path: str) -> Optional[Tuple[str, str]]:
+        """(url, content_hash) ที่บันทึกไว้ของ path นี้"""
+        return self._db.execute("SELECT url, content_hash FROM pdfs WHERE path = ?", (path,)).fetchone()
+
+    def plan(self, url: str, data, path: str, force: bool = False) -> Tuple[str, str, bool]:
+        """ตัดสินใจก่อนสร้าง PDF คืน (path ที่จะใช้, content_hash, ต้องสร้างหรือไม่)"""
+        content_hash = meeting_hash(data)
+        owner = self._owner(path)
+        claimed = self._claimed.get(path)
+        other = claimed if claimed not in (None, url) else (owner[0] if owner and owner[0] != url else None)
+        if other is not None:
+            print(f"⚠️  ชื่อไฟล์ชนกัน: {os.path.basename(path)} เป็นของ {other} -> ใช้ชื่อที่ต่อท้าย hash ของ {url}")
+            self.collisions += 1
+            path = _with_suffix(path, url)
+            owner = self._owner(path)
+        self._claimed[path] = url
+
+        if not force and owner is not None and owner[1] == content_hash and os.path.exists(path):
+            self.skipped += 1
+            return path, content_hash, False
+        return path, content_hash, True
+
+    def record(self, url: str, path: str, content_hash: str):
+        """บันทึกหลังสร้าง PDF สำเร็จ (ถ้าสร้างไม่สำเร็จไม่บันทึก รอบหน้าจะสร้างใหม่)"""
+        self._db.execute(
+            "INSERT OR REPLACE INTO pdfs (path, url, content_hash, size, built_at) VALUES (?, ?, ?, ?, ?)",
+            (path, url, content_hash, os.path.getsize(path), time.time()),
+        )
+        self._db.commit()
+        self.built += 1
+
+    def stats(self) -> str:
+        return f"สร้าง {self.built}, ข้าม (ไม่เปลี่ยน) {self.skipped}, ชื่อชน {self.collisions}"
+
+    def close(self):
+        self._db.close()
@@ -0,0 +1,80 @@
+import threading
+from multiprocessing import Pool
+
+from pymongo import MongoClient, ReturnDocument
+
+DEFAULT_BLOCK_SIZE = 100
+
+
+class RefAllocator:
+    """
+    แจก meeting_ref แบบ hi/lo: จองเลขทีละช่วง (block_size ตัว) ด้วย $inc ครั้งเดียวบน counters
+    แล้วแจกต่อในเครื่องโดยไม่ต้องกลับไปที่ DB ทุก meeting
+      - $inc เป็น atomic จึงได้ช่วงที่ไม่ซ้อนกันแม้รันหลาย process / หลายเครื่องพร้อมกัน
+      - seq ใน counters ยังเป็น "เลขสูงสุดที่ถูกจองแล้ว" เข้ากับข้อมูลเดิมที่ใช้ $inc ทีละ 1
+      - เลขที่จองแล้วไม่ได้ใช้ (ตอนจบ process) จะหายไป ช่องว่างไม่เกิน block_size ต่อ process
+    """
+
+    def __init__(self, counters_col, key: str = "meeting_ref", block_size: int = DEFAULT_BLOCK_SIZE):
+        self.counters_col = counters_col
+        self.key = key
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._next = 1
+        self._hi = 0  # ยังไม่ได้จองช่วงไหน
+
+    def _reserve(self):
+        ret = self.counters_col.find_one_and_update(
+            {"_id": self.key},
+            {"$inc": {"seq": self.block_size}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        self._hi = ret["seq"]
+        self._next = self._hi - self.block_size + 1
+
+    def next(self) -> int:
+        with self._lock:
+            if self._next > self._hi:
+                self._reserve()
+            ref = self._next
+            self._next += 1
+            return ref
+
+
+# -------------------------------
+#  ตรวจสอบกับ MongoDB จริง: หลาย worker แย่งกันขอ ref พร้อมกัน
+# -------------------------------
+def _worker(args):
+    uri, db_name, key, n, block_size = args
+    client = MongoClient(uri)
+    allocator = RefAllocator(client[db_name]["counters"], key, block_size)
+    refs = [allocator.next() for _ in range(n)]
+    client.close()
+    return refs
+
+
+def verify_concurrent(uri: str, db_name: str, workers: int = 8, per_worker: int = 250,
+                      block_size: int = DEFAULT_BLOCK_SIZE):
+    """รัน worker หลาย process ขอ ref พร้อมกัน แล้วเช็คว่าไม่ซ้ำ และช่องว่างรวมไม่เกิน workers * block_size"""
+    key = "meeting_ref:verify"
+    client = MongoClient(uri)
+    client[db_name]["counters"].delete_one({"_id": key})
+    with Pool(workers) as pool:
+        results = pool.map(_worker, [(uri, db_name, key, per_worker, block_size)] * workers)
+    client[db_name]["counters"].delete_one({"_id": key})
+    client.close()
+
+    refs = sorted(r for rs in results for r in rs)
+    unique = len(refs) == len(set(refs))
+    gaps = (refs[-1] - refs[0] + 1) - len(refs)
+    max_gaps = workers * block_size
+    print(f"📊 {workers} workers x {per_worker} refs, block_size={block_size}")
+    print(f"  ไม่ซ้ำ: {unique}, ช่องว่าง: {gaps} (ยอมได้ไม่เกิน {max_gaps})")
+    assert unique, "meeting_ref ซ้ำกัน"
+    assert gaps <= max_gaps, "ช่องว่างของ meeting_ref เกินกำหนด"
+    return refs
+
+
+if __name__ == "__main__":
+    verify_concurrent("mongodb://localhost:27017/", "ResolutionScraping")
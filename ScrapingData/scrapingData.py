@@ -1,10 +1,9 @@
-import requests
 from bs4 import BeautifulSoup
 import re
+from httpCache import HttpCache
 
 url = "https://www.eppo.go.th/index.php/th/component/k2/item/21751-cepa-settha71"
-resp = requests.get(url)
-resp.raise_for_status()
+resp = HttpCache().fetch(url)
 soup = BeautifulSoup(resp.text, "html.parser")
 
 content_tag = soup.find("div", class_="itemFullText")
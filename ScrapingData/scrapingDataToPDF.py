@@ -1,68 +1,106 @@
-import requests
 from bs4 import BeautifulSoup
 import re
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import queue
+import threading
+import time
+from functools import lru_cache
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import List, NamedTuple
 from reportlab.lib.pagesizes import A4
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from reportlab.lib.styles import ParagraphStyle
 from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfbase import pdfmetrics
 from reportlab.lib import colors
+from httpCache import HttpCache
+from pdfManifest import PdfManifest
 
 
 # -------------------------------
-#  ตั้งค่าฟอนต์ไทย
+#  ตั้งค่าฟอนต์ไทย + style (สร้างครั้งเดียวใช้ร่วมกันทุก PDF)
 # -------------------------------
 FONT_PATH = "ScrapingData/fonts/Sarabun-Regular.ttf"
-pdfmetrics.registerFont(TTFont('THSarabun', FONT_PATH))
+FONT_NAME = "THSarabun"
+OUTPUT_DIR = "ScrapingData/Data"
+FETCH_WORKERS = 4    # thread ดึง + parse html (งาน I/O)
+QUEUE_SIZE = 32      # หน้าที่ parse แล้วรอสร้าง PDF ได้สูงสุดเท่านี้ (กันหน่วยความจำบวมถ้าดึงเร็วกว่าสร้าง)
+
+TITLE_STYLE = ParagraphStyle('Title', fontName=FONT_NAME, fontSize=20, textColor=colors.darkblue)
+SECTION_STYLE = ParagraphStyle('Section', fontName=FONT_NAME, fontSize=16, textColor=colors.darkred)
+NORMAL_STYLE = ParagraphStyle('Normal', fontName=FONT_NAME, fontSize=14, leading=18)
+
+
+def register_fonts():
+    """ลงทะเบียน TTFont ครั้งเดียวต่อ process (เป็น initializer ของ process pool ที่สร้าง PDF)"""
+    if FONT_NAME not in pdfmetrics.getRegisteredFontNames():
+        pdfmetrics.registerFont(TTFont(FONT_NAME, FONT_PATH))
+
+
+# หน้ามติแทบไม่เปลี่ยนหลังเผยแพร่ -> เก็บ HTML ไว้แล้ว revalidate แทนการโหลดใหม่ทุกรอบ
+# สร้างเมื่อดึงหน้าแรก (ไม่ใช่ตอน import) worker ที่สร้าง PDF จึงไม่เปิด SQLite ของ cache เอง
+@lru_cache(maxsize=1)
+def get_http_cache() -> HttpCache:
+    return HttpCache()
+
+
+class MeetingPdfData(NamedTuple):
+    title: str
+    meeting_no: str
+    meeting_seq: str
+    meeting_date: str
+    agendas: List[str]
+    resolutions: List[str]
+    summaries: List[str]
+
 
 # -------------------------------
 #  ฟังก์ชันสร้าง PDF
 # -------------------------------
 def save_pdf(title, meeting_no, meeting_seq, meeting_date, agendas, resolutions, summaries, output_path):
+    register_fonts()
     doc = SimpleDocTemplate(output_path, pagesize=A4)
 
-    title_style = ParagraphStyle('Title', fontName='THSarabun', fontSize=20, textColor=colors.darkblue)
-    section_style = ParagraphStyle('Section', fontName='THSarabun', fontSize=16, textColor=colors.darkred)
-    normal_style = ParagraphStyle('Normal', fontName='THSarabun', fontSize=14, leading=18)
-
     story = []
-    story.append(Paragraph(f"สรุปข้อมูลการประชุม", title_style))
+    story.append(Paragraph(f"สรุปข้อมูลการประชุม", TITLE_STYLE))
     story.append(Spacer(1, 10))
-    story.append(Paragraph(f"หัวข้อ: {title}", normal_style))
-    story.append(Paragraph(f"การประชุม: {meeting_no}", normal_style))
-    story.append(Paragraph(f"ครั้งที่: {meeting_seq}", normal_style))
-    story.append(Paragraph(f"วันที่ประชุม: {meeting_date}", normal_style))
+    story.append(Paragraph(f"หัวข้อ: {title}", NORMAL_STYLE))
+    story.append(Paragraph(f"การประชุม: {meeting_no}", NORMAL_STYLE))
+    story.append(Paragraph(f"ครั้งที่: {meeting_seq}", NORMAL_STYLE))
+    story.append(Paragraph(f"วันที่ประชุม: {meeting_date}", NORMAL_STYLE))
     story.append(Spacer(1, 10))
 
-    story.append(Paragraph("หัวข้อการประชุม / Agendas", section_style))
+    story.append(Paragraph("หัวข้อการประชุม / Agendas", SECTION_STYLE))
     for a in agendas:
-        story.append(Paragraph(f"- {a}", normal_style))
+        story.append(Paragraph(f"- {a}", NORMAL_STYLE))
     story.append(Spacer(1, 10))
 
-    story.append(Paragraph("มติการประชุม / Resolutions", section_style))
+    story.append(Paragraph("มติการประชุม / Resolutions", SECTION_STYLE))
     for r in resolutions:
-        story.append(Paragraph(r.replace("\n", "<br/>"), normal_style))
+        story.append(Paragraph(r.replace("\n", "<br/>"), NORMAL_STYLE))
         story.append(Spacer(1, 5))
 
-    story.append(Paragraph("สรุปสาระสำคัญ / Summary", section_style))
+    story.append(Paragraph("สรุปสาระสำคัญ / Summary", SECTION_STYLE))
     for s in summaries:
-        story.append(Paragraph(s, normal_style))
+        story.append(Paragraph(s, NORMAL_STYLE))
         story.append(Spacer(1, 5))
 
     doc.build(story)
     print(f"✅ PDF saved: {output_path}")
 
 
+def render_pdf(task):
+    """งานใน process pool: task = (MeetingPdfData, output_path) คืน output_path"""
+    data, output_path = task
+    save_pdf(*data, output_path)
+    return output_path
+
+
 # -------------------------------
-#  ฟังก์ชันหลัก: ดึงข้อมูลจาก 1 ลิงก์
+#  แยกข้อมูลการประชุมจาก html ของหน้ามติ
 # -------------------------------
-def scrape_eppo_page(url):
-    print(f"🔍 กำลังดึงข้อมูลจาก: {url}")
-    resp = requests.get(url)
-    resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
+def parse_eppo_html(html) -> MeetingPdfData:
+    soup = BeautifulSoup(html, "html.parser")
 
     content_tag = soup.find("div", class_="itemFullText")
     title = meeting_no = meeting_seq = meeting_date = ""
@@ -120,20 +158,162 @@ def scrape_eppo_page(url):
         if temp_text and current_section == "resolution":
             resolutions.append(temp_text.strip())
 
-    # -------------------------------
-    #  สร้าง PDF
-    # -------------------------------
-    safe_title = re.sub(r'[^\w\d-]', '_', title[:50]) or "meeting"
-    filename = f"{safe_title}_ครั้งที่{meeting_seq or 'X'}"
-    output_path = os.path.join("ScrapingData/Data", f"{filename}.pdf")
-    save_pdf(title, meeting_no, meeting_seq, meeting_date, agendas, resolutions, summaries, output_path)
-    return output_path
+    return MeetingPdfData(title, meeting_no, meeting_seq, meeting_date, agendas, resolutions, summaries)
+
+
+def output_path_for(data: MeetingPdfData, output_dir: str = OUTPUT_DIR) -> str:
+    safe_title = re.sub(r'[^\w\d-]', '_', data.title[:50]) or "meeting"
+    filename = f"{safe_title}_ครั้งที่{data.meeting_seq or 'X'}"
+    return os.path.join(output_dir, f"{filename}.pdf")
+
+
+def fetch_html(url):
+    return get_http_cache().fetch(url).text
+
+
+def scrape_eppo_page(url, fetch=fetch_html) -> MeetingPdfData:
+    print(f"🔍 กำลังดึงข้อมูลจาก: {url}")
+    return parse_eppo_html(fetch(url))
+
+
+# -------------------------------
+#  Pipeline: thread ดึง + parse -> queue (จำกัดขนาด) -> process pool สร้าง PDF
+# -------------------------------
+_DONE = object()
+
+
+def _produce(urls, fetch, pages: queue.Queue, fetch_workers: int):
+    """ดึงทุก url ด้วย thread pool แล้วใส่ (url, data, error) ลง queue (put รอเมื่อ queue เต็ม)"""
+    def work(url):
+        try:
+            pages.put((url, scrape_eppo_page(url, fetch), None))
+        except Exception as e:
+            pages.put((url, None, e))
+
+    with ThreadPoolExecutor(max_workers=fetch_workers) as executor:
+        list(executor.map(work, urls))
+    pages.put(_DONE)
+
+
+def build_pdfs(urls, output_dir: str = OUTPUT_DIR, fetch=fetch_html, fetch_workers: int = FETCH_WORKERS,
+               render_workers: int = None, queue_size: int = QUEUE_SIZE, force: bool = False):
+    """
+    แยกงาน I/O ออกจากงาน CPU:
+      - thread ดึง + parse html แล้วส่งเข้า queue ขนาด queue_size
+      - process pool (ลงทะเบียนฟอนต์ครั้งเดียวต่อ worker) สร้าง PDF ไม่ติด GIL
+    งานที่ส่งเข้า pool ค้างได้ไม่เกิน 2 เท่าของจำนวน worker ที่เหลือรออยู่ใน queue
+    การประชุมที่ข้อมูลไม่เปลี่ยนตั้งแต่รอบก่อน (ดู pdfManifest) ไม่สร้าง PDF ใหม่ เว้นแต่ force=True
+    yield (url, output_path, skipped, error) ตามลำดับที่เสร็จ
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    render_workers = render_workers or os.cpu_count() or 1
+    manifest = PdfManifest(output_dir)
+    pages = queue.Queue(maxsize=queue_size)
+    producer = threading.Thread(target=_produce, args=(urls, fetch, pages, fetch_workers), daemon=True)
+    producer.start()
+
+    # worker ของ pool เริ่มเมื่อมีงานแรก รอบที่ไม่มีอะไรเปลี่ยนจึงไม่มีการโหลดฟอนต์ / สร้าง PDF เลย
+    with ProcessPoolExecutor(max_workers=render_workers, initializer=register_fonts) as pool:
+        in_flight = {}
+        finished = False
+        while not finished or in_flight:
+            # เติมงานจนเต็มโควตา แล้วค่อยรอผล
+            while not finished and len(in_flight) < 2 * render_workers:
+                item = pages.get()
+                if item is _DONE:
+                    finished = True
+                    break
+                url, data, error = item
+                if error is not None:
+                    yield url, None, False, error
+                    continue
+                path, content_hash, needed = manifest.plan(url, data, output_path_for(data, output_dir), force)
+                if not needed:
+                    yield url, path, True, None
+                    continue
+                in_flight[pool.submit(render_pdf, (data, path))] = (url, path, content_hash)
+            if not in_flight:
+                continue
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                url, path, content_hash = in_flight.pop(future)
+                try:
+                    future.result()
+                except Exception as e:
+                    yield url, None, False, e
+                    continue
+                manifest.record(url, path, content_hash)
+                yield url, path, False, None
+    producer.join()
+    print(f"📒 manifest: {manifest.stats()}")
+    manifest.close()
+
+
+# -------------------------------
+#  Benchmark: แบบเดิม (thread 3 ตัวทำทุกอย่าง) vs pipeline บน stub server
+# -------------------------------
+def _legacy_build(urls, output_dir, fetch):
+    os.makedirs(output_dir, exist_ok=True)
+
+    def work(url):
+        data = scrape_eppo_page(url, fetch)
+        path = output_path_for(data, output_dir)
+        save_pdf(*data, path)
+        return path
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        return list(executor.map(work, urls))
+
+
+def benchmark(n_meetings: int = 300, delay: float = 0.05, output_dir: str = "ScrapingData/Data/pdf_benchmark"):
+    import contextlib
+    import io
+    import shutil
+    import requests
+    from asyncScraping import make_stub_page, start_stub_server
+
+    pages = {f"/item/{i}": make_stub_page(i) for i in range(n_meetings)}
+    base_url, stop = start_stub_server(pages, delay=delay)
+    urls = [base_url + path for path in pages]
+    session = requests.Session()
+
+    def fetch(url):
+        resp = session.get(url, timeout=30)
+        resp.raise_for_status()
+        return resp.text
+
+    def run(label, build):
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = build()
+        elapsed = time.perf_counter() - t0
+        if isinstance(results[0], str):
+            note = ""
+        else:
+            built = sum(1 for _, _, skipped, e in results if not skipped and e is None)
+            errors = sum(1 for *_, e in results if e is not None)
+            note = f"สร้าง {built}, ข้าม {len(results) - built - errors}, error {errors}"
+        print(f"  {label:<30} {len(results) / elapsed * 60:8.0f} การประชุม/นาที ({elapsed:5.1f} s)  {note}")
+
+    register_fonts()
+    print(f"📊 {n_meetings} การประชุม, latency จำลอง {delay * 1000:.0f} ms (cores: {os.cpu_count()})")
+    try:
+        run("แบบเดิม (ThreadPool 3)", lambda: _legacy_build(urls, output_dir + "_legacy", fetch))
+        run("pipeline (thread + process)", lambda: list(build_pdfs(urls, output_dir, fetch)))
+        run("รันซ้ำ (ไม่มีอะไรเปลี่ยน)", lambda: list(build_pdfs(urls, output_dir, fetch)))
+        pages["/item/0"] = make_stub_page(0, n_agendas=6)
+        pages["/item/dup"] = make_stub_page(1)  # ชื่อไฟล์ชนกับ /item/1
+        urls.append(base_url + "/item/dup")
+        run("แก้ 1 หน้า + หน้าชื่อชน 1 หน้า", lambda: list(build_pdfs(urls, output_dir, fetch)))
+    finally:
+        stop()
+        shutil.rmtree(output_dir + "_legacy", ignore_errors=True)
+        shutil.rmtree(output_dir, ignore_errors=True)
 
 
 # -------------------------------
 #  ดึงหลายลิงก์พร้อมกัน
 # -------------------------------
-urls = [
+URLS = [
     "https://www.eppo.go.th/index.php/th/component/k2/item/21751-cepa-settha71",
     "https://www.eppo.go.th/index.php/th/component/k2/item/21609-cepa-settha70", 
     "https://www.eppo.go.th/index.php/th/component/k2/item/21264-cepa-settha69",       
@@ -155,12 +335,16 @@ urls = [
     "https://www.eppo.go.th/index.php/th/component/k2/item/18561-cepa-prayut53",       
     "https://www.eppo.go.th/index.php/th/component/k2/item/18520-cepa-prayut52",             
 ]
-os.makedirs("ScrapingData/Data", exist_ok=True)
 
-with ThreadPoolExecutor(max_workers=3) as executor:
-    futures = [executor.submit(scrape_eppo_page, url) for url in urls]
-    for future in as_completed(futures):
-        try:
-            print(f"🎯 เสร็จแล้ว -> {future.result()}")
-        except Exception as e:
-            print(f"❌ Error: {e}")
+if __name__ == "__main__":
+    import sys
+    if sys.argv[1:] == ["--benchmark"]:
+        benchmark()
+    else:
+        for url, path, skipped, error in build_pdfs(URLS, force="--force" in sys.argv):
+            if error is not None:
+                print(f"❌ Error: {error}")
+            elif skipped:
+                print(f"⏭️  ไม่เปลี่ยน -> {path}")
+            else:
+                print(f"🎯 เสร็จแล้ว -> {path}")
@@ -0,0 +1,281 @@
+import random
+import re
+import time
+from bisect import bisect_right
+from datetime import datetime
+from functools import lru_cache
+from typing import Iterable, List, Optional
+
+from pymongo import UpdateOne
+
+from thaiPatterns import THAI2AR, THAI_MONTHS, THAI_DATE_RE, WHITESPACE_RE
+
+CACHE_SIZE = 4096
+_SEP = "\x00"  # ตัวคั่นตอน parse ทั้งคอลัมน์ (pattern ไม่มีส่วนไหน match \x00 จึงไม่ข้ามรายการ)
+
+
+def _normalize(s: str) -> str:
+    s = s.replace("\xa0", " ").replace("\u200b", "").replace(_SEP, " ")
+    return WHITESPACE_RE.sub(" ", s.strip()).translate(THAI2AR)
+
+
+def _to_datetime(day: int, month: int, year: int, hour: int = 0, minute: int = 0) -> Optional[datetime]:
+    if year >= 2400:  # พ.ศ. → ค.ศ.
+        year -= 543
+    try:
+        return datetime(year, month, day, hour, minute)
+    except ValueError:
+        return None
+
+
+def _from_match(m) -> Optional[datetime]:
+    month = THAI_MONTHS.get(m.group("month"))
+    if not month:
+        return None
+    hour = int(m.group("hour")) if m.group("hour") else 0
+    minute = int(m.group("minute")) if m.group("minute") else 0
+    return _to_datetime(int(m.group("day")), month, int(m.group("year")), hour, minute)
+
+
+def _fast_path(s: str):
+    """
+    รูปแบบที่เจอบ่อยสุด '25 ธันวาคม 2567' แยกด้วย split ได้เลยไม่ต้องใช้ regex
+    คืน False ถ้าไม่ใช่รูปแบบนี้ (ให้ไปใช้ regex ต่อ)
+    """
+    parts = s.split(" ")
+    if len(parts) != 3:
+        return False
+    day, month_name, year = parts
+    month = THAI_MONTHS.get(month_name)
+    if not month or not (day.isdecimal() and len(day) <= 2 and year.isdecimal() and len(year) == 4):
+        return False
+    return _to_datetime(int(day), month, int(year))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_cached(date_str: str) -> Optional[datetime]:
+    s = _normalize(date_str)
+    fast = _fast_path(s)
+    if fast is not False:
+        return fast
+    m = THAI_DATE_RE.search(s)
+    return _from_match(m) if m else None
+
+
+def parse_thai_date(date_str: str) -> Optional[datetime]:
+    """
+    แปลงวันที่ภาษาไทย -> datetime (คืน None ถ้าอ่านไม่ได้หรือวันที่ไม่มีจริง)
+    รองรับ:
+      - 'วันพุธที่ 5 กันยายน พ.ศ. 2561 เวลา 13.30 น.'
+      - '5 กันยายน 2561' / '๕ กันยายน ๒๕๖๑'
+      - '5 กันยายน พ.ศ.2561 09:05'
+    ผลลัพธ์ถูก memoize (LRU) เพราะวันที่ซ้ำกันบ่อยมาก
+    """
+    if not date_str:
+        return None
+    return _parse_cached(date_str)
+
+
+def parse_many(date_strs: Iterable[str]) -> List[Optional[datetime]]:
+    """
+    parse ทั้งคอลัมน์ทีเดียว: ตัดค่าซ้ำ, ค่าที่เข้า fast path แยกด้วย split,
+    ที่เหลือต่อกันเป็นข้อความเดียวแล้ว finditer รอบเดียว (ไม่เรียก regex ทีละค่า)
+    คืน list ตามลำดับ input
+    """
+    date_strs = list(date_strs)
+    results = {}
+    pending = []
+    for raw in dict.fromkeys(s for s in date_strs if s):
+        s = _normalize(raw)
+        fast = _fast_path(s)
+        if fast is False:
+            pending.append((raw, s))
+        else:
+            results[raw] = fast
+
+    if pending:
+        starts = []
+        pos = 0
+        for _, s in pending:
+            starts.append(pos)
+            pos += len(s) + 1
+        text = _SEP.join(s for _, s in pending)
+        for m in THAI_DATE_RE.finditer(text):
+            idx = bisect_right(starts, m.start()) - 1
+            raw = pending[idx][0]
+            if raw not in results:  # เอา match แรกของแต่ละรายการ เหมือน search
+                results[raw] = _from_match(m)
+
+    return [results.get(s) if s else None for s in date_strs]
+
+
+def reparse_meeting_dates(meetings_col, batch_size: int = 1000) -> int:
+    """คำนวณ meeting_date_obj ใหม่จาก meeting_date ของทุก meeting ใน collection"""
+    docs = list(meetings_col.find({}, {"meeting_date": 1}))
+    dates = parse_many(d.get("meeting_date") or "" for d in docs)
+    ops = [UpdateOne({"_id": d["_id"]}, {"$set": {"meeting_date_obj": dt}}) for d, dt in zip(docs, dates)]
+    for i in range(0, len(ops), batch_size):
+        meetings_col.bulk_write(ops[i:i + batch_size], ordered=False)
+    return len(ops)
+
+
+# -------------------------------
+#  เทียบกับของเดิม (สุ่ม input) + benchmark
+# -------------------------------
+# ของเดิมทั้งสามตัว (คัดลอกจาก loader ก่อนย้ายมาใช้ thaiDate) ใช้เป็นตัวเทียบเท่านั้น
+_LEGACY_MONTHS_ALT = r"(?:มกราคม|กุมภาพันธ์|มีนาคม|เมษายน|พฤษภาคม|มิถุนายน|กรกฎาคม|สิงหาคม|กันยายน|ตุลาคม|พฤศจิกายน|ธันวาคม)"
+_LEGACY_PATTERN = (
+    rf"(?:วัน[ก-๙]+(?:ที่)?)?\s*"
+    rf"(?P<day>\d{{1,2}})\s+"
+    rf"(?P<month>{_LEGACY_MONTHS_ALT})\s+"
+    rf"(?:(?:พ\.?\s*ศ\.?|พศ)\s*)?"
+    rf"(?P<year>\d{{4}})"
+    rf"(?:\s*(?:เวลา)?\s*(?P<hour>\d{{1,2}})[.:](?P<minute>\d{{2}})"
+)
+
+
+def _legacy_parse_thai_date(date_str: str):
+    """parse_thai_date เดิมใน urlDatabaseStoring (ประกอบ pattern ใหม่ทุกครั้ง)"""
+    if not date_str:
+        return None
+    s = re.sub(r"\s+", " ", date_str.replace("\xa0", " ").strip()).translate(THAI2AR)
+    pat = re.compile(_LEGACY_PATTERN + r"\s*(?:น\.?)?)?", re.IGNORECASE)
+    m = pat.search(s)
+    if not m:
+        return None
+    month = THAI_MONTHS.get(m.group("month"))
+    if not month:
+        return None
+    year = int(m.group("year"))
+    if year >= 2400:
+        year -= 543
+    hour = int(m.group("hour")) if m.group("hour") else 0
+    minute = int(m.group("minute")) if m.group("minute") else 0
+    try:
+        return datetime(year, month, int(m.group("day")), hour, minute)
+    except ValueError:
+        return None
+
+
+def _legacy_ocr_parse_thai_date(date_str: str):
+    """parse_thai_date เดิมใน ocrDatabaseStoring (norm ลบ zero-width space และยุบแค่ space / tab)"""
+    s = date_str.replace("\xa0", " ").replace("\u200b", "") if date_str else ""
+    s = re.sub(r"[ \t]+", " ", s.strip()).translate(THAI2AR)
+    m = re.compile(_LEGACY_PATTERN + ")?", re.IGNORECASE).search(s)
+    if not m:
+        return None
+    year = int(m.group("year"))
+    if year >= 2400:
+        year -= 543
+    hour = int(m.group("hour")) if m.group("hour") else 0
+    minute = int(m.group("minute")) if m.group("minute") else 0
+    try:
+        return datetime(year, THAI_MONTHS.get(m.group("month")), int(m.group("day")), hour, minute)
+    except Exception:
+        return None
+
+
+def _legacy_docx_parse_thai_date(date_str: str):
+    """parse_thai_date เดิมใน docxDatabaseStoring (วันที่ที่ไม่มีจริงโยน ValueError แทนคืน None)"""
+    s = re.sub(r"\s+", " ", date_str.replace("\xa0", " ").strip()).translate(THAI2AR) if date_str else ""
+    m = re.compile(_LEGACY_PATTERN + ")?", re.IGNORECASE).search(s)
+    if not m:
+        return None
+    year = int(m.group("year"))
+    if year >= 2400:
+        year -= 543
+    hour = int(m.group("hour")) if m.group("hour") else 0
+    minute = int(m.group("minute")) if m.group("minute") else 0
+    return datetime(year, THAI_MONTHS.get(m.group("month")), int(m.group("day")), hour, minute)
+
+
+def _or_none(parse, s: str):
+    """ของเดิมบางตัวโยน exception กับวันที่ที่ไม่มีจริง ตัวใหม่คืน None แทน ถือว่าตรงกัน"""
+    try:
+        return parse(s)
+    except ValueError:
+        return None
+
+
+LEGACY_PARSERS = {
+    "url": _legacy_parse_thai_date,
+    "ocr": _legacy_ocr_parse_thai_date,
+    "docx": _legacy_docx_parse_thai_date,
+}
+
+
+def _random_date_string(rng: random.Random) -> str:
+    day = str(rng.randint(0, 35))
+    year = str(rng.choice([rng.randint(2500, 2570), rng.randint(1990, 2030), rng.randint(0, 99999)]))
+    if rng.random() < 0.3:
+        day, year = day.translate(str.maketrans("0123456789", "๐๑๒๓๔๕๖๗๘๙")), year
+    month = rng.choice(list(THAI_MONTHS) + ["มกรา", "Jan"])
+    parts = [
+        rng.choice(["", "วันพุธที่ ", "วันอังคารที่", "วันจันทร์ "]),
+        day, rng.choice([" ", "  ", "\xa0"]), month, " ",
+        rng.choice(["", "พ.ศ. ", "พ.ศ.", "พศ "]), year,
+        rng.choice(["", " เวลา 13.30 น.", " 09:05", " เวลา 9.00 น.", " 25:99"]),
+    ]
+    s = "".join(parts)
+    if rng.random() < 0.1:
+        s = "ประชุม " + s + " ณ ห้องประชุม"
+    if rng.random() < 0.1:  # ข้อความจาก OCR / เว็บมี tab และ zero-width space ปน
+        s = s.replace(" ", rng.choice(["\t", "\u200b ", " \u200b"]), 1)
+    return s
+
+
+def check_against_legacy(n: int = 20000, seed: int = 0) -> int:
+    """เทียบ parse_thai_date / parse_many กับ parse_thai_date เดิมของทั้งสาม loader (url, ocr, docx)"""
+    rng = random.Random(seed)
+    samples = [_random_date_string(rng) for _ in range(n)] + ["", "ไม่มีวันที่", "31 กุมภาพันธ์ 2567"]
+    single = [parse_thai_date(s) for s in samples]
+    batch = parse_many(samples)
+    total = 0
+    for name, legacy in LEGACY_PARSERS.items():
+        expected = [_or_none(legacy, s) for s in samples]
+        mismatches, zero_width = [], 0
+        for s, e, a, b in zip(samples, expected, single, batch):
+            if e == a == b:
+                continue
+            # ตัวใหม่ลบ \u200b ก่อน parse (แบบ ocr) url / docx เดิมไม่ลบจึงหาวันที่ไม่เจอ: ต่างโดยตั้งใจ
+            if e is None and a == b == _or_none(legacy, s.replace("\u200b", "")):
+                zero_width += 1
+                continue
+            mismatches.append(s)
+        total += len(mismatches)
+        print(f"🔎 เทียบกับของเดิม ({name}) {len(samples)} ค่า: ไม่ตรง {len(mismatches)}"
+              f" (อ่านได้เพิ่มเพราะลบ zero-width space {zero_width})")
+        for s in mismatches[:5]:
+            print(f"  {s!r}")
+    return total
+
+
+def benchmark(n: int = 100000, distinct: int = 2000, seed: int = 1):
+    rng = random.Random(seed)
+    pool = [_random_date_string(rng) for _ in range(distinct)]
+    column = [rng.choice(pool) for _ in range(n)]
+
+    t0 = time.perf_counter()
+    for s in column:
+        _legacy_parse_thai_date(s)
+    t_legacy = time.perf_counter() - t0
+
+    _parse_cached.cache_clear()
+    t0 = time.perf_counter()
+    for s in column:
+        parse_thai_date(s)
+    t_single = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    parse_many(column)
+    t_batch = time.perf_counter() - t0
+
+    print(f"📊 {n} ค่า ({distinct} ค่าไม่ซ้ำ)")
+    print(f"  เดิม (compile ทุกครั้ง): {n / t_legacy:12,.0f} ค่า/s")
+    print(f"  parse_thai_date (LRU):  {n / t_single:12,.0f} ค่า/s")
+    print(f"  parse_many:             {n / t_batch:12,.0f} ค่า/s")
+
+
+if __name__ == "__main__":
+    check_against_legacy()
+    benchmark()
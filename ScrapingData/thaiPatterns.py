@@ -0,0 +1,155 @@
+import re
+import time
+
+# -------------------------------
+#  ตัวเลขไทย / เดือนไทย
+# -------------------------------
+THAI2AR = str.maketrans("๐๑๒๓๔๕๖๗๘๙", "0123456789")
+THAI_MONTHS = {
+    "มกราคม": 1, "กุมภาพันธ์": 2, "มีนาคม": 3,
+    "เมษายน": 4, "พฤษภาคม": 5, "มิถุนายน": 6,
+    "กรกฎาคม": 7, "สิงหาคม": 8, "กันยายน": 9,
+    "ตุลาคม": 10, "พฤศจิกายน": 11, "ธันวาคม": 12,
+}
+MONTHS_ALT = r"(?:มกราคม|กุมภาพันธ์|มีนาคม|เมษายน|พฤษภาคม|มิถุนายน|กรกฎาคม|สิงหาคม|กันยายน|ตุลาคม|พฤศจิกายน|ธันวาคม)"
+MONTH_RE = re.compile(MONTHS_ALT)
+
+# 'วันพุธที่ 5 กันยายน พ.ศ. 2561 เวลา 13.30 น.' / '5 กันยายน 2561' / '5 กันยายน พ.ศ.2561 09:05'
+THAI_DATE_RE = re.compile(
+    rf"(?:วัน[ก-๙]+(?:ที่)?)?\s*"
+    rf"(?P<day>\d{{1,2}})\s+"
+    rf"(?P<month>{MONTHS_ALT})\s+"
+    rf"(?:(?:พ\.?\s*ศ\.?|พศ)\s*)?"
+    rf"(?P<year>\d{{4}})"
+    rf"(?:\s*(?:เวลา)?\s*(?P<hour>\d{{1,2}})[.:](?P<minute>\d{{2}})\s*(?:น\.?)?)?",
+    re.IGNORECASE
+)
+
+# -------------------------------
+#  ช่องว่าง
+# -------------------------------
+WHITESPACE_RE = re.compile(r"\s+")
+SPACES_TABS_RE = re.compile(r"[ \t]+")
+COLUMN_GAP_RE = re.compile(r"\s{4,}")      # ช่องว่างยาวที่คั่นคอลัมน์ ตำแหน่ง | บทบาท
+INLINE_MATH_RE = re.compile(r"\$(.*?)\$")  # $...$ ที่ OCR ใส่มาใน markdown
+
+# -------------------------------
+#  ครั้งที่ประชุม
+# -------------------------------
+MEETING_NO_RE = re.compile(r"ครั้งที่\s*([0-9]{1,3})\s*/\s*([0-9]{4})")  # ครั้งที่ 4/2567
+MEETING_SEQ_RE = re.compile(r"\(ครั้งที่\s*([0-9]+)\)")                  # (ครั้งที่ 170)
+
+# -------------------------------
+#  หัวข้อวาระ / หัว section
+# -------------------------------
+AGENDA_HEAD_RE = re.compile(r"^(เรื่องที่|วาระที่)\s*\d+")
+AGENDA_HEAD_NO_RE = re.compile(r"^(?:เรื่องที่|วาระที่)\s*([0-9๐-๙]+)\s*(.*)$")
+AGENDA_PREFIX_RE = re.compile(r"^(เรื่องที่|วาระที่)")
+SUMMARY_RE = re.compile(r"สรุป\s*สาระ\s*สำคัญ")
+SUMMARY_HEAD_RE = re.compile(r"^\s*สรุป\s*สาระ\s*สำคัญ\s*[:：]?\s*$")
+RESOLUTION_WORD_RE = re.compile(r"มติ")
+RESOLUTION_PREFIX_RE = re.compile(r"^(มติ|ที่ประชุมมีมติ)")
+RESOLUTION_HEAD_RE = re.compile(r"^\s*(?:มติ(?:ของที่ประชุม)?|ที่ประชุมมีมติ)\s*[:：]?\s*$")
+RESOLUTION_INLINE_RE = re.compile(r"^\s*(?:มติ(?:ของที่ประชุม)?|ที่ประชุมมีมติ)\s*[:：]?\s*(.+)$")
+
+# เนื้อหาหลังหัว section ทั้งก้อน (ใช้กับ markdown จาก OCR ทั้งเอกสาร)
+SUMMARY_BLOCK_RE = re.compile(
+    r"(?:สรุป\s*สาระ\s*สำคัญ)([\s\S]*?)(?=(?:มติของที่ประชุม|มติ|เรื่องที่\s*\d+|วาระที่\s*\d+|$))"
+)
+RESOLUTION_BLOCK_RE = re.compile(
+    r"(?:มติของที่ประชุม|มติ|ที่ประชุมมีมติ)([\s\S]*?)(?=(?:เรื่องที่\s*\d+|วาระที่\s*\d+|$))"
+)
+
+# จุดเริ่ม/จบของ section ในบรรทัดเดียว (zero-width จึงเจอจุดที่ซ้อนกันได้ เช่น 'มติ' ใน 'ที่ประชุมมีมติ')
+#   s = หัวสรุปสาระสำคัญ, r = หัวมติ (ตามลำดับ alternative เดียวกับ RESOLUTION_BLOCK_RE), a = หัววาระ
+DETAIL_MARK_RE = re.compile(
+    r"(?=(?P<s>สรุป\s*สาระ\s*สำคัญ)|(?P<r>มติของที่ประชุม|มติ|ที่ประชุมมีมติ)|(?P<a>(?:เรื่องที่|วาระที่)\s*\d))"
+)
+
+# -------------------------------
+#  ผู้มาประชุม
+# -------------------------------
+ATTENDEES_HEAD_RE = re.compile(r"ผู้มาประชุม")
+ATTENDEE_NAME_RE = re.compile(r"^\((.+?)\)\s*$")   # (นาย ก ข)
+NUMBERED_ITEM_RE = re.compile(r"^\d+\s*[.)]\s+")    # 1. / 1) ข้อย่อยที่ตามหลังรายชื่อ
+ROLE_WORDS = r"(ประธานกรรมการ|รองประธานกรรมการ|กรรมการและเลขานุการ|กรรมการและผู้ช่วยเลขานุการ|กรรมการ|เลขานุการ|รองประธานกรรมการทำหน้าที่ประธาน)"
+ROLE_WORDS_END_RE = re.compile(ROLE_WORDS + r"$")
+
+
+# -------------------------------
+#  Micro-benchmark: pattern string ใน loop (แบบเดิม) vs precompiled
+# -------------------------------
+def _sample_paragraphs(n: int):
+    samples = [
+        "วันพุธที่ 25 ธันวาคม 2567 เวลา 13.30 น.",
+        "ครั้งที่ 4/2567 (ครั้งที่ 170)",
+        "เรื่องที่ 3 การกำหนดอัตราเงินส่งเข้ากองทุนน้ำมันเชื้อเพลิง",
+        "สรุปสาระสำคัญ",
+        "มติของที่ประชุม",
+        "ที่ประชุมมีมติ : รับทราบ",
+        "ผู้อำนวยการสำนักงานนโยบายและแผนพลังงาน     กรรมการและเลขานุการ",
+        "รัฐมนตรีว่าการกระทรวงพลังงาน ประธานกรรมการ",
+        "(นายตัวอย่าง ทดสอบ)",
+        "1. ให้สำนักงานนโยบายและแผนพลังงานรับไปดำเนินการต่อไป " + "ข้อความ " * 30,
+        "กระทรวงพลังงานได้รายงานสถานการณ์ราคาน้ำมันเชื้อเพลิงในตลาดโลก " + "ข้อความ " * 60,
+    ]
+    return [samples[i % len(samples)] for i in range(n)]
+
+
+def _classify_old(t: str, date_pat_src: str):
+    re.compile(date_pat_src, re.IGNORECASE).search(t)
+    re.sub(r"\s+", " ", t.strip())
+    re.search(r"ครั้งที่\s*([0-9]{1,3})\s*/\s*([0-9]{4})", t)
+    re.search(r"\(ครั้งที่\s*([0-9]+)\)", t)
+    re.match(r"^(เรื่องที่|วาระที่)\s*\d+", t)
+    re.match(r"^\s*สรุป\s*สาระ\s*สำคัญ\s*[:：]?\s*$", t)
+    re.match(r"^\s*(?:มติ(?:ของที่ประชุม)?|ที่ประชุมมีมติ)\s*[:：]?\s*$", t)
+    re.match(r"^\s*(?:มติ(?:ของที่ประชุม)?|ที่ประชุมมีมติ)\s*[:：]?\s*(.+)$", t)
+    re.split(r"\s{4,}", t)
+    re.search(ROLE_WORDS + r"$", t)
+
+
+def _classify_new(t: str):
+    THAI_DATE_RE.search(t)
+    WHITESPACE_RE.sub(" ", t.strip())
+    MEETING_NO_RE.search(t)
+    MEETING_SEQ_RE.search(t)
+    AGENDA_HEAD_RE.match(t)
+    SUMMARY_HEAD_RE.match(t)
+    RESOLUTION_HEAD_RE.match(t)
+    RESOLUTION_INLINE_RE.match(t)
+    COLUMN_GAP_RE.split(t)
+    ROLE_WORDS_END_RE.search(t)
+
+
+def benchmark(n_paragraphs: int = 5000, repeat: int = 5):
+    paragraphs = _sample_paragraphs(n_paragraphs)
+
+    def run(fn):
+        best = float("inf")
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            for p in paragraphs:
+                fn(p)
+            best = min(best, time.perf_counter() - t0)
+        return best / n_paragraphs * 1e6
+
+    def old(p):
+        # parse_thai_date เดิมประกอบ pattern ใหม่ทุกครั้งที่เรียก
+        src = (
+            rf"(?:วัน[ก-๙]+(?:ที่)?)?\s*(?P<day>\d{{1,2}})\s+(?P<month>{MONTHS_ALT})\s+"
+            rf"(?:(?:พ\.?\s*ศ\.?|พศ)\s*)?(?P<year>\d{{4}})"
+            rf"(?:\s*(?:เวลา)?\s*(?P<hour>\d{{1,2}})[.:](?P<minute>\d{{2}})\s*(?:น\.?)?)?"
+        )
+        _classify_old(p, src)
+
+    us_old = run(old)
+    us_new = run(_classify_new)
+    print(f"📊 {n_paragraphs} ย่อหน้า (best of {repeat})")
+    print(f"  pattern string ใน loop: {us_old:6.2f} µs/ย่อหน้า")
+    print(f"  precompiled (thaiPatterns): {us_new:6.2f} µs/ย่อหน้า  ({us_old / us_new:.2f}x)")
+    return us_old, us_new
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -1,14 +1,30 @@
-import requests
+import uuid
+from functools import lru_cache
+from typing import List, Optional
+
 from bs4 import BeautifulSoup
-import re
 from pymongo import MongoClient, ReturnDocument
-from datetime import datetime
+from httpCache import HttpCache
+from batchWriter import BatchWriter
+from refAllocator import RefAllocator
+from mongoIndexes import (
+    PENDING_FIELD, PENDING_PROJECTION, ensure_indexes, flush_and_mark_complete, insert_meeting_if_absent,
+    meeting_exists,
+)
+from thaiDate import parse_thai_date
+from thaiPatterns import (
+    WHITESPACE_RE, COLUMN_GAP_RE, ROLE_WORDS_END_RE,
+    MEETING_NO_RE, MEETING_SEQ_RE, AGENDA_HEAD_RE, SUMMARY_RE, SUMMARY_HEAD_RE,
+    RESOLUTION_WORD_RE, RESOLUTION_HEAD_RE, RESOLUTION_INLINE_RE,
+)
 
 # --------------------------
 # CONFIG
 # --------------------------
 MONGO_URI = "mongodb://localhost:27017/"
 DB_NAME = "ResolutionScraping"
+BATCH_SIZE = 500
+REF_BLOCK_SIZE = 100
 # กพช
 urls_NEPC = [
     "https://www.eppo.go.th/index.php/th/component/k2/item/21607-nepc-prayut-25-12-67",
@@ -60,73 +76,34 @@ org = "กบง"
 ORGANIZATION = org + "."
 DOC_TYPE = "มติ"
 
-client = MongoClient(MONGO_URI)
-db = client[DB_NAME]
-meetings_col  = db["meetings"]
-attendees_col = db["attendees"]
-agendas_col   = db["agendas"]
-details_col   = db["details"]
-
-THAI2AR = str.maketrans("๐๑๒๓๔๕๖๗๘๙", "0123456789")
-THAI_MONTHS = {
-    "มกราคม": 1, "กุมภาพันธ์": 2, "มีนาคม": 3,
-    "เมษายน": 4, "พฤษภาคม": 5, "มิถุนายน": 6,
-    "กรกฎาคม": 7, "สิงหาคม": 8, "กันยายน": 9,
-    "ตุลาคม": 10, "พฤศจิกายน": 11, "ธันวาคม": 12,
-}
-MONTHS_ALT = r"(?:มกราคม|กุมภาพันธ์|มีนาคม|เมษายน|พฤษภาคม|มิถุนายน|กรกฎาคม|สิงหาคม|กันยายน|ตุลาคม|พฤศจิกายน|ธันวาคม)"
+# connection / writer / cache สร้างเมื่อใช้ครั้งแรก ไม่สร้างตอน import
+# (parse_meeting_html รันใน process pool: worker ที่ import module นี้จึงไม่เปิด Mongo / SQLite / atexit ของตัวเอง)
+@lru_cache(maxsize=1)
+def get_db():
+    return MongoClient(MONGO_URI)[DB_NAME]
+
+@lru_cache(maxsize=1)
+def get_writer() -> BatchWriter:
+    return BatchWriter(get_db(), batch_size=BATCH_SIZE)
+
+@lru_cache(maxsize=1)
+def get_ref_allocator() -> RefAllocator:
+    return RefAllocator(get_db()["counters"], block_size=REF_BLOCK_SIZE)
+
+@lru_cache(maxsize=1)
+def get_http_cache() -> HttpCache:
+    return HttpCache()
 
 def norm(s: str) -> str:
     if not s:
         return ""
     s = s.replace("\xa0", " ")
-    s = re.sub(r"\s+", " ", s.strip())
+    s = WHITESPACE_RE.sub(" ", s.strip())
     return s
 
-def _norm_and_translate_digits(s: str) -> str:
-    return norm(s).translate(THAI2AR)
-
-def parse_thai_date(date_str: str):
-    """
-    รองรับ:
-      - 'วันพุธที่ 5 กันยายน พ.ศ. 2561 เวลา 13.30 น.'
-      - '5 กันยายน 2561'
-      - '5 กันยายน พ.ศ.2561 09:05'
-      - 'วันอังคารที่ 1 ตุลาคม 2562 เวลา 9.00 น.'
-    """
-    if not date_str:
-        return None
-    s = _norm_and_translate_digits(date_str)
-    pat = re.compile(
-        rf"(?:วัน[ก-๙]+(?:ที่)?)?\s*"
-        rf"(?P<day>\d{{1,2}})\s+"
-        rf"(?P<month>{MONTHS_ALT})\s+"
-        rf"(?:(?:พ\.?\s*ศ\.?|พศ)\s*)?"
-        rf"(?P<year>\d{{4}})"
-        rf"(?:\s*(?:เวลา)?\s*(?P<hour>\d{{1,2}})[.:](?P<minute>\d{{2}})\s*(?:น\.?)?)?",
-        re.IGNORECASE
-    )
-    m = pat.search(s)
-    if not m:
-        return None
-    day = int(m.group("day"))
-    month_name = m.group("month")
-    year = int(m.group("year"))
-    hour = int(m.group("hour")) if m.group("hour") else 0
-    minute = int(m.group("minute")) if m.group("minute") else 0
-    month = THAI_MONTHS.get(month_name)
-    if not month:
-        return None
-    if year >= 2400:
-        year -= 543
-    try:
-        return datetime(year, month, day, hour, minute)
-    except ValueError:
-        return None
-
 def get_next_ref_for_org(org: str) -> int:
     key = f"meeting_ref:{org}"
-    ret = db["counters"].find_one_and_update(
+    ret = get_db()["counters"].find_one_and_update(
         {"_id": key},
         {"$inc": {"seq": 1}},
         upsert=True,
@@ -135,23 +112,16 @@ def get_next_ref_for_org(org: str) -> int:
     return ret["seq"]
 
 def get_next_ref() -> int:
-    ret = db["counters"].find_one_and_update(
-        {"_id": "meeting_ref"},
-        {"$inc": {"seq": 1}},  
-        upsert=True,       
-        return_document=ReturnDocument.AFTER
-    )
-    return ret["seq"]
+    return get_ref_allocator().next()
 
 def split_position_role(line: str):
     """แยก 'ตำแหน่ง .... บทบาท' -> (position, role)"""
     line = norm(line)
-    parts = re.split(r"\s{4,}", line)
+    parts = COLUMN_GAP_RE.split(line)
     parts = [p for p in parts if p]
     if len(parts) >= 2:
         return parts[0], parts[-1]
-    ROLE_WORDS = r"(ประธานกรรมการ|รองประธานกรรมการ|กรรมการและเลขานุการ|กรรมการและผู้ช่วยเลขานุการ|กรรมการ|เลขานุการ|รองประธานกรรมการทำหน้าที่ประธาน)"
-    m = re.search(ROLE_WORDS + r"$", line)
+    m = ROLE_WORDS_END_RE.search(line)
     if m:
         role = m.group(1)
         position = norm(line[:m.start()].rstrip(" ."))
@@ -162,14 +132,15 @@ def clean_person_name(line: str):
     line = norm(line)
     return line.strip("()[]{}").strip()
 
-def scrape_and_insert(url: str, organization: str, documentType: str = "มติ"):
-    resp = requests.get(url, timeout=30)
-    resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
+def parse_meeting_html(html: str):
+    """
+    พาร์สหน้า HTML ของมติ (div.itemFullText) -> dict ของข้อมูลการประชุม
+    คืน None ถ้าไม่พบเนื้อหา (ไม่แตะ DB จึงส่งไปรันใน process pool ได้)
+    """
+    soup = BeautifulSoup(html, "html.parser")
     content_tag = soup.find("div", class_="itemFullText")
     if not content_tag:
-        print(f"⚠️  Skip (no content): {url}")
-        return
+        return None
 
     # ---------- พาร์สส่วนหัวก่อน <hr> ----------
     title = ""
@@ -193,10 +164,10 @@ def scrape_and_insert(url: str, organization: str, documentType: str = "มต
     if len(pre_hr_paras) >= 2:
         line = pre_hr_paras[1]
         meeting_no_full = line  # เช่น "ครั้งที่ 4/2567 (ครั้งที่ 170)"
-        m_no = re.search(r"ครั้งที่\s*([0-9]{1,3})\s*/\s*([0-9]{4})", line)
+        m_no = MEETING_NO_RE.search(line)
         if m_no:
             meeting_no = f"{m_no.group(1)}/{m_no.group(2)}"
-        m_seq = re.search(r"\(ครั้งที่\s*([0-9]+)\)", line)
+        m_seq = MEETING_SEQ_RE.search(line)
         if m_seq:
             meeting_seq = int(m_seq.group(1))
     if len(pre_hr_paras) >= 3:
@@ -220,7 +191,7 @@ def scrape_and_insert(url: str, organization: str, documentType: str = "มต
                 in_section = True
             continue
         else:
-            if re.match(r"^(เรื่องที่|วาระที่)\s*\d+", t) or re.fullmatch(r"มติ", t) or re.search(r"สรุป\s*สาระ\s*สำคัญ", t):
+            if AGENDA_HEAD_RE.match(t) or RESOLUTION_WORD_RE.fullmatch(t) or SUMMARY_RE.search(t):
                 break
             buffer_lines.append(t)
 
@@ -255,22 +226,22 @@ def scrape_and_insert(url: str, organization: str, documentType: str = "มต
             current_section = None
             continue
 
-        if re.match(r"^(เรื่องที่|วาระที่)\s*\d+", text):
+        if AGENDA_HEAD_RE.match(text):
             if current_agenda:
                 agendas.append(current_agenda)
             current_agenda = {"agenda": text, "summaries": [], "resolutions": []}
             current_section = None
             continue
 
-        if re.match(r"^\s*สรุป\s*สาระ\s*สำคัญ\s*[:：]?\s*$", text):
+        if SUMMARY_HEAD_RE.match(text):
             current_section = "summary"
             continue
 
-        if re.match(r"^\s*(?:มติ(?:ของที่ประชุม)?|ที่ประชุมมีมติ)\s*[:：]?\s*$", text):
+        if RESOLUTION_HEAD_RE.match(text):
             current_section = "resolution"
             continue
 
-        m_res_inline = re.match(r"^\s*(?:มติ(?:ของที่ประชุม)?|ที่ประชุมมีมติ)\s*[:：]?\s*(.+)$", text)
+        m_res_inline = RESOLUTION_INLINE_RE.match(text)
         if m_res_inline:
             if current_agenda:
                 current_section = "resolution"
@@ -288,57 +259,140 @@ def scrape_and_insert(url: str, organization: str, documentType: str = "มต
     if current_agenda:
         agendas.append(current_agenda)
 
-    # ---------- สร้าง doc และบันทึก ----------
-    # ป้องกันซ้ำ: ถ้า meeting_no_full นี้เคยเก็บแล้ว ข้าม (idempotent)
-    if meetings_col.find_one({"meeting_no_full": meeting_no_full, "organization": organization}):
-        print(f"Already exists, skip: {url}")
-        return
-
-    # meeting_ref = get_next_ref_for_org(organization)
-    meeting_ref = get_next_ref()
-    agenda_titles = [a.get("agenda", "").strip() for a in agendas if a.get("agenda")]
-
-    agenda_string = ','.join(agenda_titles)
-
-    meeting_doc = {
+    return {
         "title": title,
-        "meeting_ref": meeting_ref,
         "meeting_no_full": meeting_no_full,
         "meeting_no": meeting_no,
         "meeting_seq": meeting_seq,
         "meeting_date": meeting_date,
         "meeting_date_obj": meeting_date_obj,
-        "organization": organization,
-        "doc_type": documentType,
-        "total_title": agenda_string
+        "location": location,
+        "attendees": attendees,
+        "agendas": agendas,
     }
-    meetings_col.insert_one(meeting_doc)
 
-    for person in attendees:
-        attendees_col.insert_one({
-            "meeting_ref": meeting_ref,
-            "meeting_seq": meeting_seq,
-            "position": person["position"],
-            "role": person["role"],
-            "name": person["name"]
-        })
-
-    for i, agenda in enumerate(agendas, start=1):
-        agendas_col.insert_one({
+def _queue_children(meeting: dict, meeting_ref: int, writer: BatchWriter, replace: bool = False):
+    """ใส่ attendees / agendas / details ลง BatchWriter (replace: ลบของเดิมของ meeting_ref นี้ก่อน)"""
+    meeting_seq = meeting["meeting_seq"]
+    attendees = [{
+        "meeting_ref": meeting_ref,
+        "meeting_seq": meeting_seq,
+        "position": person["position"],
+        "role": person["role"],
+        "name": person["name"]
+    } for person in meeting["attendees"]]
+    agendas, details = [], []
+    for i, agenda in enumerate(meeting["agendas"], start=1):
+        agendas.append({
             "meeting_ref": meeting_ref,
             "meeting_seq": meeting_seq,
             "agenda_no": i,
             "agenda_title": agenda["agenda"]
         })
-        details_col.insert_one({
+        details.append({
             "meeting_ref": meeting_ref,
             "meeting_seq": meeting_seq,
             "agenda_no": i,
             "summary": " ".join(agenda["summaries"]) if agenda["summaries"] else "",
             "resolution": " ".join(agenda["resolutions"]) if agenda["resolutions"] else ""
         })
+    for name, docs in (("attendees", attendees), ("agendas", agendas), ("details", details)):
+        if replace:
+            writer.replace_children(name, meeting_ref, docs)
+        else:
+            writer.insert_many(name, docs)
+
+def insert_meeting(meeting: dict, organization: str, documentType: str = "มติ", source: str = "",
+                   run_id: str = None) -> Optional[int]:
+    """
+    บันทึกผลจาก parse_meeting_html ลง meetings/attendees/agendas/details คืน meeting_ref หรือ None ถ้าข้าม
+    run_id: meeting ใหม่ถูกเขียนพร้อม PENDING_FIELD = run_id ผู้เรียกต้อง flush_and_mark_complete หลังจบรอบ
+    meeting ที่ค้าง PENDING_FIELD ของรอบอื่น (รอบนั้นตาย / flush ไม่สำเร็จ) จะถูกเขียนลูกใหม่ทั้งชุดด้วย ref เดิม
+    """
+    meeting_no_full = meeting["meeting_no_full"]
+    meeting_seq = meeting["meeting_seq"]
+    agendas = meeting["agendas"]
+    meetings_col = get_db()["meetings"]
+    writer = get_writer()
+
+    # ---------- สร้าง doc และบันทึก ----------
+    # ป้องกันซ้ำ: ถ้า meeting_no_full นี้เคยเก็บแล้ว ข้าม (idempotent)
+    key = {"organization": organization, "meeting_no_full": meeting_no_full}
+    if run_id is not None:
+        existing = meetings_col.find_one(key, PENDING_PROJECTION)
+        if existing is not None:
+            if existing.get(PENDING_FIELD) in (None, run_id):
+                print(f"Already exists, skip: {source}")
+                return None
+            _queue_children(meeting, existing["meeting_ref"], writer, replace=True)
+            print(f"♻️  Re-queued children: {source}")
+            return existing["meeting_ref"]
+    elif meeting_exists(meetings_col, key):
+        print(f"Already exists, skip: {source}")
+        return None
+
+    # meeting_ref = get_next_ref_for_org(organization)
+    meeting_ref = get_next_ref()
+    agenda_titles = [a.get("agenda", "").strip() for a in agendas if a.get("agenda")]
 
-    print(f"✅ Inserted: {url}")
+    agenda_string = ','.join(agenda_titles)
+
+    meeting_doc = {
+        "title": meeting["title"],
+        "meeting_ref": meeting_ref,
+        "meeting_no_full": meeting_no_full,
+        "meeting_no": meeting["meeting_no"],
+        "meeting_seq": meeting_seq,
+        "meeting_date": meeting["meeting_date"],
+        "meeting_date_obj": meeting["meeting_date_obj"],
+        "organization": organization,
+        "doc_type": documentType,
+        "total_title": agenda_string
+    }
+    if run_id is not None:
+        meeting_doc[PENDING_FIELD] = run_id
+    if not insert_meeting_if_absent(meetings_col, key, meeting_doc):
+        print(f"Already exists, skip: {source}")
+        return None
+
+    _queue_children(meeting, meeting_ref, writer)
+    print(f"✅ Queued: {source}")
+    return meeting_ref
 
-for url in urls_CEPA:
-    scrape_and_insert(url, ORGANIZATION, DOC_TYPE)
+def _finish_run(meeting_refs: List[int]):
+    """flush ลูกของทุก meeting ในรอบนี้แล้วค่อยลบ PENDING_FIELD (flush ไม่ครบ: รอบหน้าเขียนลูกใหม่)"""
+    if not flush_and_mark_complete(get_db()["meetings"], get_writer(), meeting_refs):
+        print(f"⚠️  flush มี error: {len(meeting_refs)} meeting ยังค้าง {PENDING_FIELD} รันใหม่จะเขียนลูกซ้ำให้")
+
+def scrape_and_insert(url: str, organization: str, documentType: str = "มติ"):
+    resp = get_http_cache().fetch(url, timeout=30)
+    meeting = parse_meeting_html(resp.text)
+    if meeting is None:
+        print(f"⚠️  Skip (no content): {url}")
+        return
+    meeting_ref = insert_meeting(meeting, organization, documentType, url, run_id=uuid.uuid4().hex)
+    if meeting_ref is not None:
+        _finish_run([meeting_ref])
+
+def crawl_and_insert(urls, organization: str, documentType: str = "มติ"):
+    """ดึงทุก url พร้อมกันผ่าน asyncScraping.crawl แล้วบันทึกตามลำดับเดิม"""
+    from asyncScraping import crawl
+
+    run_id = uuid.uuid4().hex
+    meeting_refs = []
+    for url, meeting, error in crawl(urls, parse_meeting_html, cache=get_http_cache()):
+        if error is not None:
+            print(f"❌ Error: {url} -> {error}")
+            continue
+        if meeting is None:
+            print(f"⚠️  Skip (no content): {url}")
+            continue
+        meeting_ref = insert_meeting(meeting, organization, documentType, url, run_id)
+        if meeting_ref is not None:
+            meeting_refs.append(meeting_ref)
+    _finish_run(meeting_refs)
+
+if __name__ == "__main__":
+    ensure_indexes(get_db())
+    with get_writer():
+        crawl_and_insert(urls_CEPA, ORGANIZATION, DOC_TYPE)
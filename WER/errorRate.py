@@ -0,0 +1,281 @@
+import random
+import time
+from functools import lru_cache
+from typing import Iterable, List, NamedTuple, Sequence
+
+import numpy as np
+
+ENGINE = "newmm"  # engine เดียวกับที่ LineManagements ใช้ตัดคำ (thaiTagger.ThaiTagger)
+UNITS = ("word", "space", "char")
+BATCH_SIZE = 256
+
+
+class ErrorCounts(NamedTuple):
+    hits: int
+    substitutions: int
+    deletions: int
+    insertions: int
+
+    @property
+    def errors(self) -> int:
+        return self.substitutions + self.deletions + self.insertions
+
+    @property
+    def reference_length(self) -> int:
+        return self.hits + self.substitutions + self.deletions
+
+    @property
+    def rate(self) -> float:
+        """(S + D + I) / N ; reference ว่างได้ 0 ถ้าไม่มี error ไม่งั้น inf"""
+        n = self.reference_length
+        if n == 0:
+            return 0.0 if self.errors == 0 else float("inf")
+        return self.errors / n
+
+    def __add__(self, other):
+        return ErrorCounts(*(a + b for a, b in zip(self, other)))
+
+
+NO_ERRORS = ErrorCounts(0, 0, 0, 0)
+
+
+@lru_cache(maxsize=100_000)
+def _thai_words(text: str) -> tuple:
+    from pythainlp.tokenize import word_tokenize
+    return tuple(word_tokenize(text, engine=ENGINE, keep_whitespace=False))
+
+
+def tokenize(text: str, unit: str = "word") -> Sequence[str]:
+    """
+    word:  ตัดคำด้วย pythainlp (ข้อความไทยไม่มีช่องว่างระหว่างคำ)
+    space: แยกด้วยช่องว่างแบบ evaluate / jiwer (ภาษาอังกฤษ)
+    char:  ตัวอักษร หลังยุบช่องว่างซ้ำเหลือช่องเดียว (CER แบบ jiwer)
+    """
+    if unit == "word":
+        return _thai_words(" ".join(text.split()))
+    if unit == "space":
+        return text.split()
+    if unit == "char":
+        return " ".join(text.split())
+    raise ValueError(f"unit ต้องเป็นหนึ่งใน {UNITS}: {unit!r}")
+
+
+# -------------------------------
+#  Levenshtein แบบ vectorized: ทีละแถวของ reference, ทุกคู่ใน batch พร้อมกัน
+# -------------------------------
+def _distance_tables(ref_ids: List[np.ndarray], hyp_ids: List[np.ndarray]) -> np.ndarray:
+    """
+    ตาราง edit distance (B, n+1, m+1) ของทุกคู่ใน batch (pad ด้วยค่าที่ไม่มีวันตรงกัน)
+    ช่อง (i, j) ที่ i <= len(ref), j <= len(hyp) ของแต่ละคู่ถูกต้อง ส่วนที่เลยออกไปไม่ได้ใช้
+    insertion ในแถวเดียวกันขึ้นกับช่องซ้าย ใช้ min สะสม: D[j] = min_k (T[k] + j - k)
+    """
+    b = len(ref_ids)
+    n = max((len(r) for r in ref_ids), default=0)
+    m = max((len(h) for h in hyp_ids), default=0)
+    refs = np.full((b, n), -1, dtype=np.int64)
+    hyps = np.full((b, m), -2, dtype=np.int64)
+    for k, (r, h) in enumerate(zip(ref_ids, hyp_ids)):
+        refs[k, :len(r)] = r
+        hyps[k, :len(h)] = h
+
+    ar = np.arange(m + 1, dtype=np.int32)
+    table = np.empty((b, n + 1, m + 1), dtype=np.int32)
+    table[:, 0, :] = ar
+    row = np.empty((b, m + 1), dtype=np.int32)
+    for i in range(1, n + 1):
+        prev = table[:, i - 1]
+        cost = (refs[:, i - 1, None] != hyps).astype(np.int32)
+        row[:, 0] = i
+        np.minimum(prev[:, 1:] + 1, prev[:, :-1] + cost, out=row[:, 1:])
+        table[:, i] = np.minimum.accumulate(row - ar, axis=1) + ar
+    return table
+
+
+def _backtrace(table, ref, hyp) -> ErrorCounts:
+    """นับ hit / S / D / I ตามเส้นทางหนึ่งที่ได้ระยะต่ำสุด (ทแยง > ลบ > แทรก เมื่อเสมอกัน)"""
+    i, j = len(ref), len(hyp)
+    d = table[:i + 1, :j + 1].tolist()
+    hits = subs = dels = ins = 0
+    while i or j:
+        if i and j and d[i][j] == d[i - 1][j - 1] + (ref[i - 1] != hyp[j - 1]):
+            if ref[i - 1] == hyp[j - 1]:
+                hits += 1
+            else:
+                subs += 1
+            i, j = i - 1, j - 1
+        elif i and d[i][j] == d[i - 1][j] + 1:
+            dels += 1
+            i -= 1
+        else:
+            ins += 1
+            j -= 1
+    return ErrorCounts(hits, subs, dels, ins)
+
+
+def _batched_tables(pairs: Sequence[tuple], batch_size: int):
+    """
+    แปลง token เป็น id แล้วคำนวณตารางทีละ batch (เรียงคู่ตามความยาวก่อนแบ่ง ให้ pad น้อย)
+    yield (index ของคู่, ref ids, hyp ids, ตาราง)
+    """
+    vocab = {}
+    ids = [
+        (np.fromiter((vocab.setdefault(t, len(vocab)) for t in ref), dtype=np.int64, count=len(ref)),
+         np.fromiter((vocab.setdefault(t, len(vocab)) for t in hyp), dtype=np.int64, count=len(hyp)))
+        for ref, hyp in pairs
+    ]
+    order = sorted(range(len(ids)), key=lambda k: (len(ids[k][0]), len(ids[k][1])))
+    for start in range(0, len(order), batch_size):
+        chunk = order[start:start + batch_size]
+        tables = _distance_tables([ids[k][0] for k in chunk], [ids[k][1] for k in chunk])
+        for table, k in zip(tables, chunk):
+            yield k, ids[k][0], ids[k][1], table
+
+
+def align_tokens(pairs: Sequence[tuple], batch_size: int = BATCH_SIZE) -> List[ErrorCounts]:
+    """pairs = [(reference_tokens, hypothesis_tokens), ...] คืน ErrorCounts ตามลำดับเดิม"""
+    out: List[ErrorCounts] = [NO_ERRORS] * len(pairs)
+    for k, ref, hyp, table in _batched_tables(pairs, batch_size):
+        out[k] = _backtrace(table, ref.tolist(), hyp.tolist())
+    return out
+
+
+def edit_distances(pairs: Sequence[tuple], batch_size: int = BATCH_SIZE) -> np.ndarray:
+    """เฉพาะ edit distance ของแต่ละคู่ (ไม่ backtrace) ใช้จับคู่บรรทัดก่อนนับ error"""
+    out = np.zeros(len(pairs), dtype=np.int64)
+    for k, ref, hyp, table in _batched_tables(pairs, batch_size):
+        out[k] = table[len(ref), len(hyp)]
+    return out
+
+
+def error_counts(predictions: Iterable[str], references: Iterable[str], unit: str = "word",
+                 batch_size: int = BATCH_SIZE) -> List[ErrorCounts]:
+    """ErrorCounts ของแต่ละคู่ (prediction, reference)"""
+    predictions, references = list(predictions), list(references)
+    if len(predictions) != len(references):
+        raise ValueError(f"จำนวน predictions ({len(predictions)}) ไม่เท่ากับ references ({len(references)})")
+    pairs = [(tokenize(r, unit), tokenize(p, unit)) for p, r in zip(predictions, references)]
+    return align_tokens(pairs, batch_size)
+
+
+def total(counts: Iterable[ErrorCounts]) -> ErrorCounts:
+    return sum(counts, NO_ERRORS)
+
+
+def wer(predictions: Iterable[str], references: Iterable[str], unit: str = "word") -> float:
+    """WER ทั้ง corpus = ผลรวม (S + D + I) / ผลรวมจำนวนคำใน reference (แบบเดียวกับ evaluate "wer")"""
+    return total(error_counts(predictions, references, unit)).rate
+
+
+def cer(predictions: Iterable[str], references: Iterable[str]) -> float:
+    return total(error_counts(predictions, references, "char")).rate
+
+
+# -------------------------------
+#  ตรวจผลเทียบ evaluate / jiwer และ benchmark บนคู่บรรทัด OCR สังเคราะห์
+# -------------------------------
+def _python_distance(ref, hyp) -> int:
+    """edit distance แบบ DP ธรรมดา (ไว้ตรวจ vectorized)"""
+    prev = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        cur = [i]
+        for j, h in enumerate(hyp, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (r != h)))
+        prev = cur
+    return prev[-1]
+
+
+ENGLISH_PAIRS = [
+    ("this is the prediction", "this is the reference"),
+    ("there is an other sample", "there is another one"),
+    ("hello world", "hello duck"),
+    ("the cat sat on the mat", "the cat sat on mat"),
+    ("a b c d", "e f"),
+    ("completely different words here", "nothing alike"),
+    ("same sentence", "same sentence"),
+    ("one two three four five six", "one three four six seven"),
+]
+
+_OCR_WORDS = [
+    "ที่ประชุม", "ได้", "พิจารณา", "เรื่อง", "การ", "กำหนด", "อัตรา", "เงิน", "ส่งเข้า", "กองทุน",
+    "น้ำมัน", "เชื้อเพลิง", "มติ", "เห็นชอบ", "ตามที่", "สำนักงาน", "นโยบาย", "และ", "แผน", "พลังงาน",
+]
+
+
+def make_ocr_pairs(n: int = 5000, seed: int = 0):
+    """(prediction, reference) จำลอง OCR: ตัวอักษรหาย / ผิด / เกิน ราว 5%"""
+    rng = random.Random(seed)
+    chars = sorted(set("".join(_OCR_WORDS)))
+    pairs = []
+    for _ in range(n):
+        ref = "".join(rng.choice(_OCR_WORDS) for _ in range(rng.randint(3, 15)))
+        hyp = []
+        for c in ref:
+            x = rng.random()
+            if x < 0.02:
+                continue
+            hyp.append(rng.choice(chars) if x < 0.04 else c)
+            if x > 0.99:
+                hyp.append(rng.choice(chars))
+        pairs.append(("".join(hyp), ref))
+    return pairs
+
+
+def check_against_reference(n: int = 2000) -> int:
+    """เทียบกับ evaluate "wer" (ถ้าติดตั้ง) / jiwer บนคู่ภาษาอังกฤษ และ DP ธรรมดาบนคู่ OCR ไทย"""
+    preds, refs = zip(*ENGLISH_PAIRS)
+    ours = wer(preds, refs, unit="space")
+    print(f"WER อังกฤษ: {ours:.6f}")
+    mismatches = 0
+    try:
+        import evaluate
+        theirs = evaluate.load("wer").compute(predictions=list(preds), references=list(refs))
+        print(f"  evaluate: {theirs:.6f}")
+        mismatches += abs(ours - theirs) > 1e-12
+    except Exception as e:  # ไม่ได้ติดตั้ง / โหลด metric จาก hub ไม่ได้
+        print(f"  ข้าม evaluate ({type(e).__name__})")
+    try:
+        import jiwer
+        theirs = jiwer.wer(list(refs), list(preds))
+        print(f"  jiwer:    {theirs:.6f}")
+        mismatches += abs(ours - theirs) > 1e-12
+    except ImportError:
+        print("  ข้าม jiwer (ไม่ได้ติดตั้ง)")
+
+    for unit in ("word", "char"):
+        pairs = [(tokenize(r, unit), tokenize(p, unit)) for p, r in make_ocr_pairs(n, seed=1)]
+        for (ref, hyp), counts in zip(pairs, align_tokens(pairs)):
+            if counts.errors != _python_distance(ref, hyp) or counts.reference_length != len(ref):
+                mismatches += 1
+    print(f"ไม่ตรงกัน: {mismatches}")
+    return mismatches
+
+
+def benchmark(n: int = 5000):
+    pairs = make_ocr_pairs(n)
+    preds, refs = zip(*pairs)
+    for unit in ("word", "char"):
+        tokenized = [(tokenize(r, unit), tokenize(p, unit)) for p, r in pairs]  # ตัดคำ (และเติม cache) ก่อนจับเวลา
+
+        t0 = time.perf_counter()
+        slow = sum(_python_distance(r, h) for r, h in tokenized)
+        t_python = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        counts = total(align_tokens(tokenized))
+        t_numpy = time.perf_counter() - t0
+        assert counts.errors == slow
+
+        t0 = time.perf_counter()
+        rate = wer(preds, refs, unit) if unit == "word" else cer(preds, refs)
+        t_end = time.perf_counter() - t0
+
+        print(f"📊 {unit}: {n:,} คู่, reference {counts.reference_length:,} หน่วย -> "
+              f"{'WER' if unit == 'word' else 'CER'} {rate:.4f} (S {counts.substitutions:,} / D {counts.deletions:,} / I {counts.insertions:,})")
+        print(f"  DP Python ทีละคู่:  {t_python:7.3f} s")
+        print(f"  NumPy ทีละ batch:   {t_numpy:7.3f} s  ({t_python / t_numpy:4.1f}x, รวม backtrace)")
+        print(f"  ทั้ง corpus (cache ตัดคำแล้ว): {t_end:7.3f} s")
+
+
+if __name__ == "__main__":
+    check_against_reference()
+    benchmark()
@@ -0,0 +1,322 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import time
+from multiprocessing import Pool
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from errorRate import ErrorCounts, edit_distances, error_counts, tokenize, total
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "LineManagements"))
+from pageParallel import LINE_ALGORITHM_VERSION, reconstruct_lines
+from wordBoxes import PageWords
+
+# -------------------------------
+#  ค่าเริ่มต้น
+# -------------------------------
+CACHE_PATH = "WER/Data/ocr_eval_cache.sqlite"
+REPORT_PATH = "WER/Data/ocr_eval_report.json"
+PAGE_BREAK = "\f"   # ground truth: หนึ่งไฟล์ .txt ต่อเอกสาร คั่นหน้าด้วย form feed (แบบ pdftotext) หนึ่งบรรทัดต่อบรรทัด
+EVAL_VERSION = 1    # เพิ่มเมื่อวิธีจับคู่บรรทัด / นับ error เปลี่ยน
+
+
+def algorithm_version(method: str, line_threshold: float) -> str:
+    return f"lines-v{LINE_ALGORITHM_VERSION}/{method}/{line_threshold}/eval-v{EVAL_VERSION}"
+
+
+# -------------------------------
+#  จับคู่บรรทัดที่จัดได้กับบรรทัดของ ground truth
+# -------------------------------
+def align_lines(ref_lines: List[str], hyp_lines: List[str]) -> List[Tuple[str, str]]:
+    """
+    จับคู่บรรทัดแบบรักษาลำดับ (DP เดียวกับ edit distance แต่หน่วยเป็นบรรทัด)
+      - จับคู่กัน: cost = ระยะตัวอักษร / ความยาวบรรทัดที่ยาวกว่า (0-1)
+      - บรรทัดเกิน / ขาด: cost 1 จับคู่กับ "" (นับเป็น insertion / deletion ทั้งบรรทัด)
+    คืน [(reference, hypothesis), ...]
+    """
+    n, m = len(ref_lines), len(hyp_lines)
+    if not n or not m:
+        return [(r, "") for r in ref_lines] + [("", h) for h in hyp_lines]
+
+    ref_chars = [tokenize(r, "char") for r in ref_lines]
+    hyp_chars = [tokenize(h, "char") for h in hyp_lines]
+    pairs = [(r, h) for r in ref_chars for h in hyp_chars]
+    longest = np.array([max(len(r), len(h), 1) for r, h in pairs], dtype=np.float64)
+    sub = (edit_distances(pairs) / longest).reshape(n, m).tolist()
+
+    cost = [[0.0] * (m + 1) for _ in range(n + 1)]
+    for i in range(1, n + 1):
+        cost[i][0] = float(i)
+    for j in range(1, m + 1):
+        cost[0][j] = float(j)
+    for i in range(1, n + 1):
+        for j in range(1, m + 1):
+            cost[i][j] = min(cost[i - 1][j - 1] + sub[i - 1][j - 1], cost[i - 1][j] + 1, cost[i][j - 1] + 1)
+
+    aligned = []
+    i, j = n, m
+    while i or j:
+        if i and j and cost[i][j] == cost[i - 1][j - 1] + sub[i - 1][j - 1]:
+            aligned.append((ref_lines[i - 1], hyp_lines[j - 1]))
+            i, j = i - 1, j - 1
+        elif i and cost[i][j] == cost[i - 1][j] + 1:
+            aligned.append((ref_lines[i - 1], ""))
+            i -= 1
+        else:
+            aligned.append(("", hyp_lines[j - 1]))
+            j -= 1
+    aligned.reverse()
+    return aligned
+
+
+def evaluate_page(ref_lines: List[str], hyp_lines: List[str]) -> dict:
+    aligned = align_lines(ref_lines, hyp_lines)
+    refs = [r for r, _ in aligned]
+    hyps = [h for _, h in aligned]
+    word = total(error_counts(hyps, refs, "word"))
+    char = total(error_counts(hyps, refs, "char"))
+    return {
+        "ref_lines": len(ref_lines), "hyp_lines": len(hyp_lines),
+        "word": list(word), "char": list(char), "wer": word.rate, "cer": char.rate,
+    }
+
+
+# -------------------------------
+#  ประเมินทั้งเอกสาร (รันใน worker)
+# -------------------------------
+def read_truth(path: str) -> List[List[str]]:
+    """บรรทัดที่ไม่ว่างของแต่ละหน้า"""
+    with open(path, "r", encoding="utf-8") as f:
+        pages = f.read().split(PAGE_BREAK)
+    return [[" ".join(line.split()) for line in page.splitlines() if line.strip()] for page in pages]
+
+
+def evaluate_document(task) -> dict:
+    """task = (doc, json_path, truth_path, method, line_threshold)"""
+    doc, json_path, truth_path, method, line_threshold = task
+    with open(json_path, "r", encoding="utf-8") as f:
+        result = json.load(f)["analyzeResult"]
+    hyp_pages = [
+        reconstruct_lines(PageWords.from_page(page, split_newlines=False), method, line_threshold)
+        for page in result.get("pages", [])
+    ]
+    ref_pages = read_truth(truth_path)
+    # จำนวนหน้าไม่เท่ากัน: หน้าที่ขาดถือเป็นหน้าว่าง (ทั้งหน้าเป็น insertion / deletion)
+    n_pages = max(len(hyp_pages), len(ref_pages))
+    hyp_pages += [[]] * (n_pages - len(hyp_pages))
+    ref_pages += [[]] * (n_pages - len(ref_pages))
+
+    pages = []
+    for page_idx, (ref_lines, hyp_lines) in enumerate(zip(ref_pages, hyp_pages)):
+        pages.append({"page": page_idx + 1, **evaluate_page(ref_lines, hyp_lines)})
+    word = total(ErrorCounts(*p["word"]) for p in pages)
+    char = total(ErrorCounts(*p["char"]) for p in pages)
+    return {"doc": doc, "pages": pages, "word": list(word), "char": list(char), "wer": word.rate, "cer": char.rate}
+
+
+# -------------------------------
+#  cache ผลต่อ (hash ของไฟล์ input + ground truth, เวอร์ชันอัลกอริทึม)
+# -------------------------------
+def file_hash(*paths: str) -> str:
+    h = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class ResultCache:
+    """ผลประเมินต่อเอกสารใน SQLite key = (input_hash, algorithm) ไฟล์หรืออัลกอริทึมเปลี่ยนจะไม่เจอ key เดิม"""
+
+    def __init__(self, path: str = CACHE_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path)
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS results (
+                input_hash TEXT NOT NULL,
+                algorithm TEXT NOT NULL,
+                doc TEXT NOT NULL,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (input_hash, algorithm)
+            )"""
+        )
+        self._db.commit()
+
+    def get(self, input_hash: str, algorithm: str) -> Optional[dict]:
+        row = self._db.execute(
+            "SELECT result FROM results WHERE input_hash = ? AND algorithm = ?", (input_hash, algorithm)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, input_hash: str, algorithm: str, result: dict):
+        self._db.execute(
+            "INSERT OR REPLACE INTO results (input_hash, algorithm, doc, result, created_at) VALUES (?, ?, ?, ?, ?)",
+            (input_hash, algorithm, result["doc"], json.dumps(result, ensure_ascii=False), time.time()),
+        )
+        self._db.commit()
+
+    def close(self):
+        self._db.close()
+
+
+def find_documents(json_dir: str, truth_dir: str) -> List[Tuple[str, str, str]]:
+    """จับคู่ <ชื่อ>.json กับ <ชื่อ>.txt (ไฟล์ที่ไม่มี ground truth ข้ามพร้อมแจ้งเตือน)"""
+    docs = []
+    for json_path in sorted(glob.glob(os.path.join(json_dir, "*.json"))):
+        doc = os.path.basename(json_path)[:-len(".json")]
+        truth_path = os.path.join(truth_dir, doc + ".txt")
+        if os.path.exists(truth_path):
+            docs.append((doc, json_path, truth_path))
+        else:
+            print(f"⚠️  ไม่มี ground truth ของ {doc} ข้าม")
+    return docs
+
+
+def evaluate_corpus(docs: Iterable[Tuple[str, str, str]], method: str = "threshold", line_threshold: float = 0.01,
+                    workers: int = None, cache: Optional[ResultCache] = None) -> Iterator[Tuple[dict, bool]]:
+    """
+    ประเมินทุกเอกสาร yield (ผล, มาจาก cache หรือไม่) เอกสารที่อยู่ใน cache แล้วไม่ต้องจัดบรรทัดใหม่
+    ที่เหลือกระจายไปหลาย process (ทีละเอกสาร ผลกลับมาตามลำดับที่เสร็จ)
+    """
+    algorithm = algorithm_version(method, line_threshold)
+    pending, hashes = [], {}
+    for doc, json_path, truth_path in docs:
+        input_hash = file_hash(json_path, truth_path)
+        cached = cache.get(input_hash, algorithm) if cache else None
+        if cached is not None:
+            yield cached, True
+        else:
+            hashes[doc] = input_hash
+            pending.append((doc, json_path, truth_path, method, line_threshold))
+
+    workers = min(workers or os.cpu_count() or 1, max(len(pending), 1))
+    if workers == 1:
+        results = map(evaluate_document, pending)
+    else:
+        pool = Pool(workers)
+        results = pool.imap_unordered(evaluate_document, pending)
+    try:
+        for result in results:
+            if cache:
+                cache.put(hashes[result["doc"]], algorithm, result)
+            yield result, False
+    finally:
+        if workers != 1:
+            pool.close()
+            pool.join()
+
+
+def summarize(results: List[dict]) -> dict:
+    word = total(ErrorCounts(*r["word"]) for r in results)
+    char = total(ErrorCounts(*r["char"]) for r in results)
+    return {"documents": len(results), "word": list(word), "char": list(char), "wer": word.rate, "cer": char.rate}
+
+
+def print_report(results: List[dict], summary: dict, show_pages: bool = True):
+    for r in results:
+        print(f"📄 {r['doc']}: WER {r['wer']:.4f}  CER {r['cer']:.4f}  ({len(r['pages'])} หน้า)")
+        if show_pages:
+            for p in r["pages"]:
+                print(f"    หน้า {p['page']:>3}: WER {p['wer']:.4f}  CER {p['cer']:.4f}  "
+                      f"บรรทัด {p['hyp_lines']}/{p['ref_lines']}")
+    print(f"\n📊 รวม {summary['documents']} เอกสาร: WER {summary['wer']:.4f}  CER {summary['cer']:.4f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ประเมิน WER / CER ของการจัดบรรทัดเทียบ ground truth")
+    parser.add_argument("json_dir", help="โฟลเดอร์ไฟล์ analyzeResult (*.json)")
+    parser.add_argument("truth_dir", help="โฟลเดอร์ ground truth <ชื่อไฟล์ json ไม่รวม .json>.txt คั่นหน้าด้วย \\f")
+    parser.add_argument("--method", choices=("threshold", "clustered"), default="threshold")
+    parser.add_argument("--line-threshold", type=float, default=0.01)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cache", default=CACHE_PATH)
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--report", default=REPORT_PATH)
+    parser.add_argument("--quiet", action="store_true", help="ไม่แสดงผลรายหน้า")
+    args = parser.parse_args(argv)
+
+    cache = None if args.no_cache else ResultCache(args.cache)
+    docs = find_documents(args.json_dir, args.truth_dir)
+    results, n_cached = [], 0
+    for result, from_cache in evaluate_corpus(docs, args.method, args.line_threshold, args.workers, cache):
+        results.append(result)
+        n_cached += from_cache
+    if cache:
+        cache.close()
+    results.sort(key=lambda r: r["doc"])
+
+    summary = summarize(results)
+    print_report(results, summary, show_pages=not args.quiet)
+    print(f"   ใช้ผลจาก cache {n_cached}/{len(results)} เอกสาร")
+
+    os.makedirs(os.path.dirname(args.report) or ".", exist_ok=True)
+    with open(args.report, "w", encoding="utf-8") as f:
+        json.dump({"algorithm": algorithm_version(args.method, args.line_threshold),
+                   "summary": summary, "documents": results}, f, ensure_ascii=False, indent=2)
+    print(f"✅ บันทึกรายงาน: {args.report}")
+    return summary
+
+
+# -------------------------------
+#  Benchmark: corpus สังเคราะห์ รอบแรก (ไม่มี cache) vs รันซ้ำ vs แก้ไขไฟล์เดียว
+# -------------------------------
+def make_synthetic_corpus(root: str, n_docs: int = 8, n_pages: int = 5, noise: float = 0.03, seed: int = 0):
+    """
+    analyzeResult สังเคราะห์ + ground truth ที่ได้จากคำจริงของแต่ละบรรทัด (20 คำต่อบรรทัด)
+    แล้วแก้คำใน ground truth แบบสุ่มราว noise ให้มี error ให้วัด
+    """
+    from pageParallel import make_synthetic_report
+    json_dir, truth_dir = os.path.join(root, "json"), os.path.join(root, "truth")
+    os.makedirs(json_dir, exist_ok=True)
+    os.makedirs(truth_dir, exist_ok=True)
+    rng = random.Random(seed)
+    for d in range(n_docs):
+        data = make_synthetic_report(n_pages, 400, seed=seed + d)
+        pages = []
+        for page in data["analyzeResult"]["pages"]:
+            words = [w["content"] for w in page["words"]]
+            words = [w if rng.random() > noise else rng.choice(words) for w in words]
+            pages.append("\n".join("".join(words[k:k + 20]) for k in range(0, len(words), 20)))
+        with open(os.path.join(json_dir, f"report_{d}.pdf.json"), "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        with open(os.path.join(truth_dir, f"report_{d}.pdf.txt"), "w", encoding="utf-8") as f:
+            f.write(PAGE_BREAK.join(pages))
+    return json_dir, truth_dir
+
+
+def benchmark(root: str = "WER/Data/synthetic_eval", n_docs: int = 8):
+    json_dir, truth_dir = make_synthetic_corpus(root, n_docs)
+    cache_path = os.path.join(root, "cache.sqlite")
+    common = [json_dir, truth_dir, "--cache", cache_path, "--report", os.path.join(root, "report.json"), "--quiet"]
+
+    timings = []
+    for label in ("รอบแรก (cache ว่าง)", "รันซ้ำ", "แก้ ground truth 1 ไฟล์"):
+        if label.startswith("แก้"):
+            with open(os.path.join(truth_dir, "report_0.pdf.txt"), "a", encoding="utf-8") as f:
+                f.write("\nบรรทัดเพิ่ม")
+        t0 = time.perf_counter()
+        main(common)
+        timings.append((label, time.perf_counter() - t0))
+    shutil.rmtree(root)
+
+    print(f"\n📊 {n_docs} เอกสาร (cores: {os.cpu_count()})")
+    for label, t in timings:
+        print(f"  {label:<24} {t:7.2f} s")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        main()
+    else:
+        benchmark()
@@ -1,6 +1,5 @@
-from evaluate import load
-wer = load("wer")
+from errorRate import wer
 predictions = ["this is the prediction", "there is an other sample"]
 references = ["this is the reference", "there is another one"]
-wer_score = wer.compute(predictions=predictions, references=references)
-print(wer_score)
\ No newline at end of file
+wer_score = wer(predictions=predictions, references=references, unit="space")
+print(wer_score)